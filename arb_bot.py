@@ -2,9 +2,12 @@
 Complete arbitrage bot with paper trading
 """
 import asyncio
+import concurrent.futures
+import heapq
 import json
-from typing import Dict
-from modules.price_monitor import PriceMonitor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from modules.price_monitor import Pair, PriceMonitor
 from modules.arbitrage import ArbitrageDetector
 from modules.paper_trader import PaperTrader
 from core.logger import logger
@@ -19,42 +22,117 @@ class ArbitrageBotComplete:
         self.paper_trader = PaperTrader(config)
         self.running = True
         self.auto_trade = config.get('auto_trade', True)
+        self.auto_close_delay = config.get('auto_close_delay', 30)
+        
+        # Per-tick constants (fees are 0.15% round trip)
+        self._min_required = config['min_spread_percent'] + 0.15
+        self._auto_close = config.get('auto_close', True)
+        
+        # Pending auto-closes as (deadline, trade_id), drained by a single worker task
+        self._close_heap: List[Tuple[float, int]] = []
+        self._close_event = asyncio.Event()
+        self._close_task: Optional[asyncio.Task] = None
+        
+        # Tick buffer: spot and perp price columns, spreads evaluated per batch
+        batch_size = config.get('tick_batch_size', 64)
+        self._tick_spot = np.empty(batch_size, dtype=np.float64)
+        self._tick_perp = np.empty(batch_size, dtype=np.float64)
+        self._tick_symbols: List[Tuple[str, str]] = []
+        self._tick_n = 0
+        self._flush_interval = config.get('tick_flush_interval', 0.005)  # 5ms
+        self._last_flush = 0.0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        
+        # Compute-bound reporting runs here so the event loop stays free for IO
+        self._cpu_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         
     async def price_callback(self, spot_symbol: str, perp_symbol: str, 
                            spot_price: float, perp_price: float):
-        """Handle new prices and check for arbitrage"""
+        """Buffer new prices and check the batch for arbitrage"""
+        n = self._tick_n
+        self._tick_spot[n] = spot_price
+        self._tick_perp[n] = perp_price
+        self._tick_symbols.append((spot_symbol, perp_symbol))
+        self._tick_n = n + 1
         
-        # Calculate spread for logging
-        spread = ((perp_price - spot_price) / spot_price) * 100
+        # Flush when the buffer is full or the batch window has elapsed,
+        # otherwise make sure the buffered ticks are flushed at the end of the window
+        loop = asyncio.get_running_loop()
+        elapsed = loop.time() - self._last_flush
+        if self._tick_n == len(self._tick_spot) or elapsed >= self._flush_interval:
+            self.flush_ticks()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._flush_interval - elapsed, self.flush_ticks)
+            
+    def flush_ticks(self):
+        """Evaluate all buffered ticks in one vectorized pass"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._last_flush = asyncio.get_running_loop().time()
         
-        # Check for arbitrage opportunity
-        opportunity = self.arb_detector.check_opportunity(
-            spot_symbol, perp_symbol, spot_price, perp_price
-        )
+        n = self._tick_n
+        if n == 0:
+            return
+        spot, perp = self._tick_spot[:n], self._tick_perp[:n]
+        symbols = self._tick_symbols
+        self._tick_n = 0
+        self._tick_symbols = []
         
-        if opportunity:
+        # Spread, threshold and profit for every tick in one compiled pass;
+        # opportunities are only built for hits
+        opportunities = self.arb_detector.check_opportunities_batch(spot, perp, symbols)
+        
+        for opportunity in opportunities:
             # Execute paper trade if auto-trading is enabled
             if self.auto_trade:
-                trade = self.paper_trader.execute_trade(opportunity.to_dict())
+                trade = self.paper_trader.execute_trade(opportunity)
                 
                 # Simulate closing the trade after a delay (in real trading, you'd monitor for exit conditions)
-                if trade and self.config.get('auto_close', True):
-                    asyncio.create_task(self.auto_close_trade(trade.id, 30))  # Close after 30 seconds
-        else:
-            # Regular price update (no opportunity)
-            status = f"Spread: {spread:.3f}% | Min required: {self.config['min_spread_percent'] + 0.15:.3f}%"
-            logger.debug(f"{spot_symbol}: ${spot_price:.2f} | {status}")
+                if trade and self._auto_close:
+                    self.schedule_close(trade.id, self.auto_close_delay)
+                    
+        if not opportunities:
+            # Regular price update (no opportunity) - formatted only if debug is enabled
+            logger.debug(
+                "{}: ${:.2f} | Spread: {:.3f}% | Min required: {:.3f}%",
+                symbols[-1][0], spot[-1],
+                self.arb_detector.calculate_spread(spot[-1], perp[-1]), self._min_required
+            )
             
-    async def auto_close_trade(self, trade_id: int, delay_seconds: int):
-        """Automatically close a trade after delay (for simulation)"""
-        await asyncio.sleep(delay_seconds)
+    def schedule_close(self, trade_id: int, delay_seconds: float):
+        """Queue a trade to be closed after delay (for simulation)"""
+        deadline = asyncio.get_running_loop().time() + delay_seconds
+        heapq.heappush(self._close_heap, (deadline, trade_id))
+        self._close_event.set()
         
-        # Get current prices for closing
+    async def _close_worker(self):
+        """Close queued trades as their deadlines expire"""
+        loop = asyncio.get_running_loop()
+        while self.running:
+            timeout = None
+            if self._close_heap:
+                timeout = max(0.0, self._close_heap[0][0] - loop.time())
+                
+            try:
+                await asyncio.wait_for(self._close_event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._close_event.clear()
+            
+            # Close everything that is due
+            now = loop.time()
+            while self._close_heap and self._close_heap[0][0] <= now:
+                _, trade_id = heapq.heappop(self._close_heap)
+                self.close_trade_at_market(trade_id)
+                
+    def close_trade_at_market(self, trade_id: int):
+        """Close a trade using the latest cached prices"""
         trade = self.paper_trader.open_trades.get(trade_id)
         if trade:
             # Get latest prices
-            spot_price = self.price_monitor.last_prices.get('binance', {}).get(trade.spot_symbol, {}).get('price')
-            perp_price = self.price_monitor.last_prices.get('drift', {}).get(trade.perp_symbol, {}).get('price')
+            spot_price = self.price_monitor.last_spot.get(trade.spot_symbol)
+            perp_price = self.price_monitor.last_perp.get(trade.perp_symbol)
             
             if spot_price and perp_price:
                 self.paper_trader.close_trade(trade_id, spot_price, perp_price)
@@ -64,30 +142,37 @@ class ArbitrageBotComplete:
         try:
             # Initialize price monitor
             await self.price_monitor.initialize()
+            self.arb_detector.warm_up()
             
-            # Log configuration
-            logger.info("=" * 60)
-            logger.info("🚀 DRIFT-BINANCE ARBITRAGE BOT STARTED")
-            logger.info("=" * 60)
-            logger.info(f"Mode: {self.config['mode']}")
-            logger.info(f"Auto Trade: {self.auto_trade}")
-            logger.info(f"Min Spread: {self.config['min_spread_percent']}%")
-            logger.info(f"Trade Size: ${self.config['trade_size_usdt']}")
-            logger.info(f"Initial Balance: ${self.paper_trader.initial_balance}")
-            logger.info(f"Current Balance: ${self.paper_trader.balance:.2f}")
+            # Single timer task for all auto-closes
+            self._close_task = asyncio.create_task(self._close_worker())
+            
+            # Log configuration (one record for the whole banner)
+            banner = [
+                "=" * 60,
+                "🚀 DRIFT-BINANCE ARBITRAGE BOT STARTED",
+                "=" * 60,
+                f"Mode: {self.config['mode']}",
+                f"Auto Trade: {self.auto_trade}",
+                f"Min Spread: {self.config['min_spread_percent']}%",
+                f"Trade Size: ${self.config['trade_size_usdt']}",
+                f"Initial Balance: ${self.paper_trader.initial_balance}",
+                f"Current Balance: ${self.paper_trader.balance:.2f}",
+            ]
             
             # Show performance if we have previous trades
             perf = self.paper_trader.get_performance_summary()
             if perf['total_trades'] > 0:
-                logger.info(f"Previous Trades: {perf['total_trades']} (P&L: ${perf['total_profit']:.2f})")
+                banner.append(f"Previous Trades: {perf['total_trades']} (P&L: ${perf['total_profit']:.2f})")
             
-            logger.info("=" * 60)
+            banner.append("=" * 60)
+            logger.info("\n".join(banner))
             
             # Define pairs to monitor
             pairs = [
-                {"spot_symbol": "SOLUSDT", "perp_symbol": "SOLPERP"},
-                # {"spot_symbol": "BTCUSDT", "perp_symbol": "BTCPERP"},
-                # {"spot_symbol": "ETHUSDT", "perp_symbol": "ETHPERP"},
+                Pair("SOLUSDT", "SOLPERP"),
+                # Pair("BTCUSDT", "BTCPERP"),
+                # Pair("ETHUSDT", "ETHPERP"),
             ]
             
             # Start monitoring
@@ -103,26 +188,38 @@ class ArbitrageBotComplete:
         self.running = False
         await self.price_monitor.stop()
         
-        # Print final summary
-        logger.info("=" * 60)
-        logger.info("📊 FINAL SESSION SUMMARY")
-        logger.info("=" * 60)
+        if self._close_task:
+            self._close_task.cancel()
+            try:
+                await self._close_task
+            except asyncio.CancelledError:
+                pass
+        await self.paper_trader.flush()
         
-        # Arbitrage summary
+        # Print final summary
         arb_summary = self.arb_detector.get_summary()
-        logger.info(f"Opportunities Found: {arb_summary['total_opportunities']}")
-        logger.info(f"Total Potential Profits: ${arb_summary['potential_profits']:.2f}")
-        
-        # Trading summary
-        trade_summary = self.paper_trader.get_performance_summary()
-        logger.info(f"Trades Executed: {trade_summary['total_trades']}")
-        logger.info(f"Closed Trades: {trade_summary['closed_trades']}")
-        logger.info(f"Open Trades: {trade_summary['open_trades']}")
-        logger.info(f"Total P&L: ${trade_summary['total_profit']:.2f}")
-        logger.info(f"Win Rate: {trade_summary['win_rate']:.1f}%")
-        logger.info(f"ROI: {trade_summary['roi']:.2f}%")
-        logger.info(f"Final Balance: ${trade_summary['current_balance']:.2f}")
-        logger.info("=" * 60)
+        loop = asyncio.get_running_loop()
+        trade_summary = await loop.run_in_executor(self._cpu_pool, self.paper_trader.get_performance_summary)
+        self._cpu_pool.shutdown(wait=False)
+        logger.info("\n".join([
+            "=" * 60,
+            "📊 FINAL SESSION SUMMARY",
+            "=" * 60,
+            
+            # Arbitrage summary
+            f"Opportunities Found: {arb_summary['total_opportunities']}",
+            f"Total Potential Profits: ${arb_summary['potential_profits']:.2f}",
+            
+            # Trading summary
+            f"Trades Executed: {trade_summary['total_trades']}",
+            f"Closed Trades: {trade_summary['closed_trades']}",
+            f"Open Trades: {trade_summary['open_trades']}",
+            f"Total P&L: ${trade_summary['total_profit']:.2f}",
+            f"Win Rate: {trade_summary['win_rate']:.1f}%",
+            f"ROI: {trade_summary['roi']:.2f}%",
+            f"Final Balance: ${trade_summary['current_balance']:.2f}",
+            "=" * 60,
+        ]))
 
 async def main():
     """Entry point"""
@@ -134,12 +231,21 @@ async def main():
         'initial_balance': 10000,       # $10k starting balance
         'auto_trade': True,             # Automatically execute trades
         'auto_close': True,             # Auto-close trades after delay
+        'http_pool_size': 32,           # Price feed connection pool
+        'http_pool_size_per_host': 8,   # Keep-alive connections per exchange host
     }
     
     bot = ArbitrageBotComplete(config)
     await bot.run()
 
 if __name__ == "__main__":
+    # Use libuv-based event loop when available (not supported on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+        
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
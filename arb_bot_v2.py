@@ -2,12 +2,16 @@
 Improved arbitrage bot with better trade management
 """
 import asyncio
+import concurrent.futures
 import json
 import random
-from typing import Dict
-from modules.price_monitor import PriceMonitor
+from collections import defaultdict
+from datetime import datetime
+from time import monotonic
+from typing import Dict, Optional, Tuple
+from modules.price_monitor import Pair, PriceMonitor
 from modules.arbitrage import ArbitrageDetector
-from modules.paper_trader import PaperTrader
+from modules.paper_trader import PaperTrader, PaperTrade
 from core.logger import logger
 
 class ImprovedArbitrageBot:
@@ -23,18 +27,53 @@ class ImprovedArbitrageBot:
         self.max_open_trades = config.get('max_open_trades', 3)
         self.exit_strategy = config.get('exit_strategy', 'spread_target')
         
+        # Per-tick constants
+        self._min_profit = config.get('min_profit_usdt', 1.0)
+        self._quality_threshold = config['min_spread_percent'] + 0.2
+        
+        # Open trades indexed by spot symbol, kept in sync with the paper trader
+        self._trades_by_symbol: Dict[str, Dict[int, PaperTrade]] = defaultdict(dict)
+        
+        # Monotonic time each open trade was entered
+        self._opened_at: Dict[int, float] = {}
+        
+        # Index trades restored from disk so exits still apply to them
+        for trade in self.paper_trader.open_trades.values():
+            self._index_trade(trade)
+        
+        # Latest (perp_symbol, spot, perp) per spot symbol, coalesced over a short window
+        self._pending: Dict[str, Tuple[str, float, float]] = {}
+        self._debounce = config.get('tick_debounce', 0.001)  # 1ms
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        
+        # Compute-bound reporting runs here so the event loop stays free for IO
+        self._cpu_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        
     async def price_callback(self, spot_symbol: str, perp_symbol: str, 
                            spot_price: float, perp_price: float):
-        """Handle new prices and check for arbitrage"""
+        """Record new prices; bursts for the same symbol are coalesced"""
+        self._pending[spot_symbol] = (perp_symbol, spot_price, perp_price)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._debounce, self.flush_pending
+            )
+            
+    def flush_pending(self):
+        """Process the latest prices of every symbol that ticked in the window"""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for spot_symbol, (perp_symbol, spot_price, perp_price) in pending.items():
+            self.process_prices(spot_symbol, perp_symbol, spot_price, perp_price)
+            
+    def process_prices(self, spot_symbol: str, perp_symbol: str,
+                       spot_price: float, perp_price: float):
+        """Check exits and new arbitrage for one symbol"""
         
         # Check existing positions for exit
-        await self.check_exit_conditions(spot_symbol, perp_symbol, spot_price, perp_price)
-        
-        # Calculate spread
-        spread = ((perp_price - spot_price) / spot_price) * 100
+        self.check_exit_conditions(spot_symbol, perp_symbol, spot_price, perp_price)
         
         # Check for new opportunities only if we have capacity
-        if len(self.paper_trader.open_trades) < self.max_open_trades:
+        if self.paper_trader.open_count < self.max_open_trades:
             opportunity = self.arb_detector.check_opportunity(
                 spot_symbol, perp_symbol, spot_price, perp_price
             )
@@ -42,31 +81,55 @@ class ImprovedArbitrageBot:
             if opportunity and self.auto_trade:
                 # Additional filters for better trades
                 if self.should_take_trade(opportunity):
-                    trade = self.paper_trader.execute_trade(opportunity.to_dict())
+                    self.open_trade(opportunity)
                 else:
-                    logger.debug(f"Skipped opportunity: spread {opportunity.spread_percent:.3f}% below quality threshold")
+                    logger.debug(
+                        "Skipped opportunity: spread {:.3f}% below quality threshold",
+                        opportunity.spread_percent
+                    )
         
     def should_take_trade(self, opportunity) -> bool:
         """Apply additional filters for trade quality"""
-        # Only take trades with higher profit potential
-        min_profit = self.config.get('min_profit_usdt', 1.0)
+        # Only take trades with higher profit potential,
+        # and require higher spread during volatile periods
+        return (opportunity.potential_profit_usdt >= self._min_profit
+                and opportunity.spread_percent > self._quality_threshold)
         
-        # Require higher spread during volatile periods
-        quality_spread = opportunity.spread_percent > (self.config['min_spread_percent'] + 0.2)
+    def open_trade(self, opportunity):
+        """Execute a paper trade and index it by symbol"""
+        trade = self.paper_trader.execute_trade(opportunity)
+        if trade:
+            self._index_trade(trade)
+        return trade
         
-        return opportunity.potential_profit_usdt >= min_profit and quality_spread
+    def _index_trade(self, trade: PaperTrade):
+        """Add an open trade to the symbol index, aged from its (UTC) timestamp"""
+        self._trades_by_symbol[trade.spot_symbol][trade.id] = trade
+        try:
+            age = (datetime.utcnow() - datetime.fromisoformat(trade.timestamp)).total_seconds()
+        except (TypeError, ValueError):
+            age = 0.0
+        self._opened_at[trade.id] = monotonic() - max(age, 0.0)
         
-    async def check_exit_conditions(self, spot_symbol: str, perp_symbol: str, 
-                                   spot_price: float, perp_price: float):
-        """Check if any open trades should be closed"""
+    def close_trade(self, trade_id: int, spot_price: float, perp_price: float):
+        """Close a paper trade and drop it from the symbol index"""
+        trade = self.paper_trader.open_trades.get(trade_id)
+        if trade:
+            self._trades_by_symbol[trade.spot_symbol].pop(trade_id, None)
+            self._opened_at.pop(trade_id, None)
+        return self.paper_trader.close_trade(trade_id, spot_price, perp_price)
         
-        for trade_id, trade in list(self.paper_trader.open_trades.items()):
-            # Only check exits for matching symbols
-            if trade.spot_symbol != spot_symbol:
-                continue
-                
-            current_spread = ((perp_price - spot_price) / spot_price) * 100
+    def check_exit_conditions(self, spot_symbol: str, perp_symbol: str, 
+                              spot_price: float, perp_price: float):
+        """Check if any open trades should be closed"""
+        trades = self._trades_by_symbol.get(spot_symbol)
+        if not trades:
+            return
             
+        current_spread = ((perp_price - spot_price) / spot_price) * 100
+        now = monotonic()
+        
+        for trade_id, trade in list(trades.items()):
             # Calculate position P&L
             entry_spread = trade.spread_percent
             spread_change = entry_spread - current_spread
@@ -93,36 +156,41 @@ class ImprovedArbitrageBot:
                 reason = "Take profit"
                 
             # Time-based: Exit if trade is older than 60 seconds
-            trade_age = (asyncio.get_event_loop().time() - trade.timestamp.timestamp()) if hasattr(trade.timestamp, 'timestamp') else 60
+            trade_age = now - self._opened_at.get(trade_id, now)
             if trade_age > 60:
                 should_exit = True
                 reason = "Max time reached"
                 
             if should_exit:
-                logger.info(f"Closing trade #{trade_id}: {reason} | Unrealized P&L: ${unrealized_pnl:.2f}")
-                self.paper_trader.close_trade(trade_id, spot_price, perp_price)
+                logger.info(
+                    "Closing trade #{}: {} | Unrealized P&L: ${:.2f}",
+                    trade_id, reason, unrealized_pnl
+                )
+                self.close_trade(trade_id, spot_price, perp_price)
                 
     async def run(self):
         """Run the bot"""
         try:
             # Initialize price monitor
             await self.price_monitor.initialize()
+            self.arb_detector.warm_up()
             
-            # Log configuration
-            logger.info("=" * 60)
-            logger.info("🚀 IMPROVED ARBITRAGE BOT V2")
-            logger.info("=" * 60)
-            logger.info(f"Mode: {self.config['mode']}")
-            logger.info(f"Max Open Trades: {self.max_open_trades}")
-            logger.info(f"Exit Strategy: {self.exit_strategy}")
-            logger.info(f"Min Profit Filter: ${self.config.get('min_profit_usdt', 1.0)}")
-            logger.info(f"Current Balance: ${self.paper_trader.balance:.2f}")
-            
-            logger.info("=" * 60)
+            # Log configuration (one record for the whole banner)
+            logger.info("\n".join([
+                "=" * 60,
+                "🚀 IMPROVED ARBITRAGE BOT V2",
+                "=" * 60,
+                f"Mode: {self.config['mode']}",
+                f"Max Open Trades: {self.max_open_trades}",
+                f"Exit Strategy: {self.exit_strategy}",
+                f"Min Profit Filter: ${self._min_profit}",
+                f"Current Balance: ${self.paper_trader.balance:.2f}",
+                "=" * 60,
+            ]))
             
             # Define pairs to monitor
             pairs = [
-                {"spot_symbol": "SOLUSDT", "perp_symbol": "SOLPERP"},
+                Pair("SOLUSDT", "SOLPERP"),
             ]
             
             # Start monitoring
@@ -138,27 +206,36 @@ class ImprovedArbitrageBot:
         self.running = False
         await self.price_monitor.stop()
         
+        # Drop ticks still waiting in the debounce window
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending.clear()
+        
         # Close any remaining open trades
         logger.info("Closing remaining open positions...")
         for trade_id in list(self.paper_trader.open_trades.keys()):
             trade = self.paper_trader.open_trades[trade_id]
             # Use last known prices
-            spot_price = self.price_monitor.last_prices.get('binance', {}).get(trade.spot_symbol, {}).get('price', trade.spot_price)
-            perp_price = self.price_monitor.last_prices.get('drift', {}).get(trade.perp_symbol, {}).get('price', trade.perp_price)
-            self.paper_trader.close_trade(trade_id, spot_price, perp_price)
+            spot_price = self.price_monitor.last_spot.get(trade.spot_symbol, trade.spot_price)
+            perp_price = self.price_monitor.last_perp.get(trade.perp_symbol, trade.perp_price)
+            self.close_trade(trade_id, spot_price, perp_price)
+        await self.paper_trader.flush()
         
         # Print final summary
-        logger.info("=" * 60)
-        logger.info("📊 FINAL RESULTS")
-        logger.info("=" * 60)
-        
-        # Trading summary
-        trade_summary = self.paper_trader.get_performance_summary()
-        logger.info(f"Total Trades: {trade_summary['total_trades']}")
-        logger.info(f"Win Rate: {trade_summary['win_rate']:.1f}%")
-        logger.info(f"Total P&L: ${trade_summary['total_profit']:.2f}")
-        logger.info(f"ROI: {trade_summary['roi']:.2f}%")
-        logger.info(f"Final Balance: ${trade_summary['current_balance']:.2f}")
+        loop = asyncio.get_running_loop()
+        trade_summary = await loop.run_in_executor(self._cpu_pool, self.paper_trader.get_performance_summary)
+        self._cpu_pool.shutdown(wait=False)
+        summary = [
+            "=" * 60,
+            "📊 FINAL RESULTS",
+            "=" * 60,
+            f"Total Trades: {trade_summary['total_trades']}",
+            f"Win Rate: {trade_summary['win_rate']:.1f}%",
+            f"Total P&L: ${trade_summary['total_profit']:.2f}",
+            f"ROI: {trade_summary['roi']:.2f}%",
+            f"Final Balance: ${trade_summary['current_balance']:.2f}",
+        ]
         
         # Best/Worst trade
         if self.paper_trader.trades:
@@ -166,10 +243,11 @@ class ImprovedArbitrageBot:
             if closed_trades:
                 best_trade = max(closed_trades, key=lambda t: t.actual_profit)
                 worst_trade = min(closed_trades, key=lambda t: t.actual_profit)
-                logger.info(f"Best Trade: ${best_trade.actual_profit:.2f}")
-                logger.info(f"Worst Trade: ${worst_trade.actual_profit:.2f}")
+                summary.append(f"Best Trade: ${best_trade.actual_profit:.2f}")
+                summary.append(f"Worst Trade: ${worst_trade.actual_profit:.2f}")
         
-        logger.info("=" * 60)
+        summary.append("=" * 60)
+        logger.info("\n".join(summary))
 
 async def main():
     """Entry point"""
@@ -189,6 +267,13 @@ async def main():
     await bot.run()
 
 if __name__ == "__main__":
+    # Use libuv-based event loop when available (not supported on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+        
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
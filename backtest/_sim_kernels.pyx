@@ -0,0 +1,17 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled order simulation kernels.
+
+Typed versions of the slippage and fee formulas used by OrderSimulator.
+Build in place with: cythonize -i backtest/_sim_kernels.pyx
+"""
+
+
+cpdef double slippage(double size, double vol, double base, double r) noexcept nogil:
+    """Base slippage + size impact + volatility impact, scaled by r."""
+    return (base + size * 1e-4 + vol * 0.5) * r
+
+
+cpdef double fee(double size, double rate) noexcept nogil:
+    """Fee for an order of the given size at a fractional rate."""
+    return size * rate
@@ -4,15 +4,73 @@ Historical Data Loader
 Loads and manages historical market data for backtesting.
 """
 
-from typing import Dict, List, Optional, Iterator
+from typing import Dict, List, Optional, Iterator, Tuple
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
+import asyncio
+import functools
+import aiohttp
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 
 from core.logger import get_logger
 
 
+# OHLCV columns stored on disk (ts is epoch milliseconds)
+OHLCV_COLUMNS = ["ts", "open", "high", "low", "close", "volume"]
+
+BINANCE_KLINES_URL = "https://api.binance.com/api/v3/klines"
+BINANCE_KLINES_LIMIT = 1000
+
+# Bar length per timeframe in milliseconds
+TIMEFRAME_MS = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+
+@functools.lru_cache(maxsize=16)
+def _load_cached(
+    path: str,
+    mtime_ns: int,
+    start_iso: str,
+    end_iso: str
+) -> Tuple[np.ndarray, ...]:
+    """
+    Read a parquet OHLCV file and slice it to a date range.
+    
+    Results are shared between callers (and across grid-search trials), so
+    the returned arrays are read-only. mtime_ns is part of the key so a
+    re-downloaded file is picked up.
+    
+    Returns:
+        (ts, open, high, low, close, volume) arrays, ts as datetime64[ns]
+    """
+    table = pq.read_table(path, columns=OHLCV_COLUMNS, memory_map=True)
+    columns = [table.column(name).to_numpy() for name in OHLCV_COLUMNS]
+    columns[0] = columns[0].astype("datetime64[ms]").astype("datetime64[ns]")
+    
+    if not np.all(columns[0][1:] >= columns[0][:-1]):
+        order = np.argsort(columns[0], kind="stable")
+        columns = [col[order] for col in columns]
+        
+    lo = np.searchsorted(columns[0], np.datetime64(start_iso, "ns"), side="left")
+    hi = np.searchsorted(columns[0], np.datetime64(end_iso, "ns"), side="right")
+    
+    result = []
+    for col in columns:
+        view = col[lo:hi]
+        view.flags.writeable = False
+        result.append(view)
+    return tuple(result)
+
+
 class DataLoader:
     """
     Loads historical data from various sources.
@@ -34,7 +92,6 @@ class DataLoader:
         self.config = config
         self.logger = get_logger(__name__)
         self.data_dir = Path("data")
-        self.cache = {}
         
     async def load_data(
         self,
@@ -53,66 +110,187 @@ class DataLoader:
             timeframe: Data timeframe
             
         Returns:
-            DataFrame with OHLCV data
+            DataFrame with OHLCV data indexed by timestamp
         """
-        # TODO: Implement data loading
-        # - Check cache first
-        # - Load from file or API
-        # - Validate data
-        # - Apply any preprocessing
-        
         self.logger.info(f"Loading data for {symbol} from {start_date} to {end_date}")
         
-        # Placeholder - return empty DataFrame
-        return pd.DataFrame()
+        parquet_path = self.data_dir / f"{symbol}_{timeframe}.parquet"
+        csv_path = self.data_dir / f"{symbol}_{timeframe}.csv"
+        
+        if not parquet_path.exists():
+            if not csv_path.exists():
+                self.logger.warning(f"No data file found for {symbol} ({timeframe})")
+                return pd.DataFrame()
+            # Convert to parquet so all loads go through the columnar reader
+            df = pd.read_csv(csv_path, usecols=OHLCV_COLUMNS)
+            df.to_parquet(parquet_path, engine="pyarrow", index=False)
+            self.logger.info(f"Cached {csv_path.name} as {parquet_path.name}")
+            
+        ts, *values = _load_cached(
+            str(parquet_path),
+            parquet_path.stat().st_mtime_ns,
+            pd.Timestamp(start_date).isoformat(),
+            pd.Timestamp(end_date).isoformat()
+        )
+        df = pd.DataFrame(
+            dict(zip(OHLCV_COLUMNS[1:], values)),
+            index=pd.DatetimeIndex(ts, name="ts"),
+            copy=False
+        )
+        if not df.empty and not self.validate_data(df):
+            self.logger.warning(f"Data for {symbol} ({timeframe}) failed validation")
+        return df
     
     async def download_data(
         self,
         symbol: str,
         exchange: str,
         start_date: datetime,
-        end_date: datetime
+        end_date: datetime,
+        timeframe: str = "1m"
     ) -> bool:
         """
         Download historical data from exchange.
         
+        The range is split into chunks of one klines request each and all
+        chunks are fetched concurrently over a shared session.
+        
         Args:
             symbol: Trading symbol
             exchange: Exchange name
             start_date: Start date
             end_date: End date
+            timeframe: Data timeframe
             
         Returns:
             Success boolean
         """
-        # TODO: Implement data download
-        # - Connect to exchange API
-        # - Download in chunks
-        # - Save to file
+        if exchange != "binance":
+            self.logger.warning(f"Download not supported for exchange: {exchange}")
+            return False
+        if timeframe not in TIMEFRAME_MS:
+            self.logger.warning(f"Unsupported timeframe: {timeframe}")
+            return False
+            
+        start_ms = int(pd.Timestamp(start_date).value // 1_000_000)
+        end_ms = int(pd.Timestamp(end_date).value // 1_000_000)
+        step = TIMEFRAME_MS[timeframe] * BINANCE_KLINES_LIMIT
+        ranges = [
+            (s, min(s + step, end_ms) - 1)
+            for s in range(start_ms, end_ms, step)
+        ]
+        
+        self.logger.info(f"Downloading {symbol} {timeframe} in {len(ranges)} chunks")
+        
+        # Cap per-host connections to stay inside Binance rate limits
+        connector = aiohttp.TCPConnector(limit_per_host=8)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [
+                self._fetch_chunk(session, symbol, timeframe, s, e)
+                for s, e in ranges
+            ]
+            chunks = await asyncio.gather(*tasks, return_exceptions=True)
+            
+        frames = []
+        for (s, e), chunk in zip(ranges, chunks):
+            if isinstance(chunk, Exception):
+                self.logger.error(f"Failed to download {symbol} chunk {s}-{e}: {chunk}")
+                return False
+            frames.append(chunk)
+            
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=OHLCV_COLUMNS)
+        df = df.drop_duplicates(subset="ts").sort_values("ts")
+        
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        path = self.data_dir / f"{symbol}_{timeframe}.parquet"
+        df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+        
+        self.logger.info(f"Saved {len(df)} bars to {path}")
+        return True
+    
+    async def _fetch_chunk(
+        self,
+        session: aiohttp.ClientSession,
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int
+    ) -> pd.DataFrame:
+        """
+        Fetch one klines request worth of bars.
         
-        return False
+        Args:
+            session: Shared HTTP session
+            symbol: Trading symbol
+            timeframe: Data timeframe
+            start_ms: Chunk start (epoch ms)
+            end_ms: Chunk end (epoch ms, inclusive)
+            
+        Returns:
+            DataFrame with OHLCV_COLUMNS
+        """
+        params = {
+            "symbol": symbol,
+            "interval": timeframe,
+            "startTime": start_ms,
+            "endTime": end_ms,
+            "limit": BINANCE_KLINES_LIMIT,
+        }
+        async with session.get(BINANCE_KLINES_URL, params=params) as response:
+            response.raise_for_status()
+            rows = await response.json()
+            
+        # Klines rows: [open_time, open, high, low, close, volume, ...]
+        df = pd.DataFrame([row[:6] for row in rows], columns=OHLCV_COLUMNS)
+        df["ts"] = df["ts"].astype("int64")
+        df[OHLCV_COLUMNS[1:]] = df[OHLCV_COLUMNS[1:]].astype("float64")
+        return df
     
     async def load_spread_data(
         self,
         spot_symbol: str,
         perp_symbol: str,
         start_date: datetime,
-        end_date: datetime
+        end_date: datetime,
+        timeframe: str = "1m",
+        tolerance: str = "500ms"
     ) -> pd.DataFrame:
         """
         Load synchronized spread data for backtesting.
         
+        Spot and perp bars rarely share exact timestamps, so each spot bar is
+        matched to the nearest perp bar within the tolerance.
+        
         Args:
             spot_symbol: Spot market symbol
             perp_symbol: Perpetual market symbol
             start_date: Start date
             end_date: End date
+            timeframe: Data timeframe
+            tolerance: Maximum spot/perp timestamp gap
             
         Returns:
-            DataFrame with spread data
+            DataFrame with *_s (spot), *_p (perp) and spread_pct columns
         """
-        # TODO: Load and align spot/perp data
-        return pd.DataFrame()
+        spot = await self.load_data(spot_symbol, start_date, end_date, timeframe)
+        perp = await self.load_data(perp_symbol, start_date, end_date, timeframe)
+        if spot.empty or perp.empty:
+            return pd.DataFrame()
+            
+        df = pd.merge_asof(
+            spot.sort_index(),
+            perp.sort_index(),
+            left_index=True,
+            right_index=True,
+            tolerance=pd.Timedelta(tolerance),
+            direction="nearest",
+            suffixes=("_s", "_p")
+        )
+        df = df.dropna(subset=["close_p"])
+        
+        # Spread computed once for the whole series
+        df["spread_pct"] = (df["close_p"] - df["close_s"]) / df["close_s"] * 100.0
+        return df.astype("float64")
     
     def validate_data(self, df: pd.DataFrame) -> bool:
         """
@@ -124,9 +302,14 @@ class DataLoader:
         Returns:
             True if valid
         """
-        # TODO: Implement validation
-        # - Check for missing values
-        # - Verify time continuity
-        # - Check price sanity
-        
+        prices = df[["open", "high", "low", "close"]]
+        if prices.isna().to_numpy().any():
+            self.logger.warning("Missing price values")
+            return False
+        if not df.index.is_monotonic_increasing or df.index.has_duplicates:
+            self.logger.warning("Timestamps are not strictly increasing")
+            return False
+        if (prices.to_numpy() <= 0.0).any() or (df["high"] < df["low"]).any():
+            self.logger.warning("Non-positive prices or high below low")
+            return False
         return True
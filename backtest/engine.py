@@ -4,15 +4,38 @@ Backtesting Engine
 Main backtesting orchestrator that simulates trading strategies on historical data.
 """
 
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
 from decimal import Decimal
 from dataclasses import dataclass
 
+import numpy as np
+import pandas as pd
+
 from core.logger import get_logger
 from strategy.arbitrage import ArbitrageEngine
 from backtest.simulation import OrderSimulator
 from backtest.metrics import BacktestMetrics
+from backtest.data_loader import DataLoader, TIMEFRAME_MS
+from utils.jit import njit
+
+# Exit rules, mirroring ImprovedArbitrageBot.check_exit_conditions
+EXIT_SPREAD_PCT = 0.1
+STOP_LOSS_USD = -2.0
+MAX_HOLD_NS = 60 * 1_000_000_000
+
+MS_PER_YEAR = 365 * 86_400_000
+
+# Columnar trade log filled by run_kernel
+TRADE_DTYPE = np.dtype([
+    ("entry_ts", "i8"),
+    ("exit_ts", "i8"),
+    ("entry_spread", "f4"),
+    ("exit_spread", "f4"),
+    ("pnl", "f4"),
+    ("size", "f4"),
+    ("fee", "f4"),
+])
 
 
 @dataclass
@@ -23,16 +46,176 @@ class BacktestConfig:
     initial_capital: Decimal
     timeframe: str  # 1m, 5m, etc
     data_source: str  # csv, api
+    spot_symbol: str = "SOLUSDT"
+    perp_symbol: str = "SOL-PERP"
+
+
+def _equity_pairs(ts: np.ndarray, values: np.ndarray) -> List[Tuple[datetime, Decimal]]:
+    """Expand equity columns into (timestamp, equity) pairs."""
+    return [
+        (pd.Timestamp(t).to_pydatetime(), Decimal(f"{value:.6f}"))
+        for t, value in zip(ts, values)
+    ]
+
+
+def _trade_dicts(trades: np.ndarray) -> List[Dict]:
+    """Expand a TRADE_DTYPE log into per-trade dicts."""
+    return [
+        {
+            "entry_time": pd.Timestamp(int(t["entry_ts"])).to_pydatetime(),
+            "exit_time": pd.Timestamp(int(t["exit_ts"])).to_pydatetime(),
+            "entry_spread": float(t["entry_spread"]),
+            "exit_spread": float(t["exit_spread"]),
+            "pnl": Decimal(f"{t['pnl']:.6f}"),
+            "size": Decimal(f"{t['size']:.2f}"),
+            "fee": Decimal(f"{t['fee']:.6f}")
+        }
+        for t in trades
+    ]
 
 
 @dataclass
 class BacktestResult:
-    """Results from a backtest run"""
+    """Results from a backtest run
+    
+    Trades and equity stay columnar (one row per trade / bar); the list forms
+    are built only when equity_curve or trade_records() is used.
+    """
     config: BacktestConfig
     metrics: Dict
-    trades: List[Dict]
-    equity_curve: List[Tuple[datetime, Decimal]]
+    trades: np.ndarray  # TRADE_DTYPE
+    equity_ts: np.ndarray  # datetime64[ns]
+    equity_values: np.ndarray  # float64
     summary: str
+    
+    @property
+    def equity_curve(self) -> List[Tuple[datetime, Decimal]]:
+        """Equity curve as (timestamp, equity) pairs, built on demand."""
+        return _equity_pairs(self.equity_ts, self.equity_values)
+        
+    def trade_records(self) -> List[Dict]:
+        """Trades as per-trade dicts, built on demand."""
+        return _trade_dicts(self.trades)
+
+
+@njit(cache=True)
+def run_kernel(
+    spread_pct: np.ndarray,
+    ts_ns: np.ndarray,
+    entries: np.ndarray,
+    exits: np.ndarray,
+    trade_size: float,
+    fee_bps: int,
+    max_open: int,
+    initial_capital: float,
+    trades: np.ndarray,
+    equity: np.ndarray
+) -> int:
+    """
+    Simulate entries and exits over a whole spread series.
+    
+    Only bars with an open position or an entry signal are visited; flat
+    stretches between them are filled with the cash balance in one go.
+    
+    Args:
+        spread_pct: Perp/spot spread per bar in percent
+        ts_ns: Bar timestamps in epoch nanoseconds
+        entries: Bars whose spread clears the entry threshold
+        exits: Bars whose spread is at or below the exit target
+        trade_size: Position size in USD
+        fee_bps: Round-trip fees in basis points
+        max_open: Maximum concurrent positions
+        initial_capital: Starting capital
+        trades: Pre-allocated TRADE_DTYPE array (len(spread_pct) + max_open)
+        equity: Pre-allocated float64 array receiving equity per bar
+        
+    Returns:
+        Number of trades written
+    """
+    n = spread_pct.shape[0]
+    fee = trade_size * fee_bps / 10_000.0
+    entry_idx = np.flatnonzero(entries)
+    next_entry = 0
+    
+    # Open positions live in fixed slots; -1 marks a free slot
+    pos_idx = np.full(max_open, -1, np.int64)
+    pos_spread = np.zeros(max_open)
+    n_open = 0
+    
+    n_trades = 0
+    cash = initial_capital
+    
+    i = 0
+    while i < n:
+        if n_open == 0:
+            # Flat: skip straight to the next entry signal
+            while next_entry < entry_idx.shape[0] and entry_idx[next_entry] < i:
+                next_entry += 1
+            if next_entry == entry_idx.shape[0]:
+                equity[i:] = cash
+                break
+            j = entry_idx[next_entry]
+            equity[i:j] = cash
+            i = j
+            
+        spread = spread_pct[i]
+        open_value = 0.0
+        
+        for k in range(max_open):
+            j = pos_idx[k]
+            if j < 0:
+                continue
+            pnl = (pos_spread[k] - spread) / 100.0 * trade_size - fee
+            age = ts_ns[i] - ts_ns[j]
+            if (exits[i] or pnl < STOP_LOSS_USD
+                    or (pnl > 0.0 and spread < pos_spread[k] * 0.5)
+                    or age > MAX_HOLD_NS):
+                rec = trades[n_trades]
+                rec["entry_ts"] = ts_ns[j]
+                rec["exit_ts"] = ts_ns[i]
+                rec["entry_spread"] = pos_spread[k]
+                rec["exit_spread"] = spread
+                rec["pnl"] = pnl
+                rec["size"] = trade_size
+                rec["fee"] = fee
+                n_trades += 1
+                cash += trade_size + pnl
+                pos_idx[k] = -1
+                n_open -= 1
+            else:
+                open_value += trade_size + pnl
+                
+        if entries[i] and n_open < max_open and cash >= trade_size:
+            for k in range(max_open):
+                if pos_idx[k] < 0:
+                    pos_idx[k] = i
+                    pos_spread[k] = spread
+                    n_open += 1
+                    cash -= trade_size
+                    open_value += trade_size - fee
+                    break
+                    
+        equity[i] = cash + open_value
+        i += 1
+        
+    # Close anything still open at the last bar, as the bots do on stop
+    if n > 0:
+        for k in range(max_open):
+            j = pos_idx[k]
+            if j < 0:
+                continue
+            spread = spread_pct[n - 1]
+            rec = trades[n_trades]
+            rec["entry_ts"] = ts_ns[j]
+            rec["exit_ts"] = ts_ns[n - 1]
+            rec["entry_spread"] = pos_spread[k]
+            rec["exit_spread"] = spread
+            rec["pnl"] = (pos_spread[k] - spread) / 100.0 * trade_size - fee
+            rec["size"] = trade_size
+            rec["fee"] = fee
+            n_trades += 1
+            
+    return n_trades
 
 
 class BacktestEngine:
@@ -60,12 +243,25 @@ class BacktestEngine:
         self.arbitrage_engine = None
         self.order_simulator = None
         self.metrics_calculator = None
+        self.data_loader = None
         
         # State
+        self.backtest_config: Optional[BacktestConfig] = None
+        self.metrics: Dict = {}
         self.current_time = None
         self.current_capital = Decimal("0")
-        self.trades = []
-        self.equity_curve = []
+        self._capital_f = 0.0
+        self._fee_bps = np.int16(0)
+        self.trades = np.empty(0, dtype=TRADE_DTYPE)
+        
+        # Equity curve as parallel columns, one entry per bar
+        self._equity_ts = np.empty(0, dtype="datetime64[ns]")
+        self._equity_val = np.empty(0, dtype=np.float64)
+        
+    @property
+    def equity_curve(self) -> List[Tuple[datetime, Decimal]]:
+        """Equity curve as (timestamp, equity) pairs, built on demand."""
+        return _equity_pairs(self._equity_ts, self._equity_val)
         
     async def initialize(self, backtest_config: BacktestConfig) -> None:
         """
@@ -74,14 +270,21 @@ class BacktestEngine:
         Args:
             backtest_config: Backtest parameters
         """
-        # TODO: Initialize components
-        # - Create arbitrage engine
-        # - Setup order simulator
-        # - Initialize metrics
-        
         self.logger.info(f"Initializing backtest from {backtest_config.start_date} to {backtest_config.end_date}")
+        self.backtest_config = backtest_config
         self.current_capital = backtest_config.initial_capital
         
+        # Float/int copies for the hot path; Decimal is only used when reporting
+        self._capital_f = float(backtest_config.initial_capital)
+        self.trades = np.empty(0, dtype=TRADE_DTYPE)
+        
+        self.order_simulator = OrderSimulator(self.config)
+        self.metrics_calculator = BacktestMetrics()
+        self.data_loader = DataLoader(self.config)
+        
+        fees = self.order_simulator.binance_fee + self.order_simulator.drift_fee
+        self._fee_bps = np.int16(round(fees * 10_000))
+        
     async def run(self) -> BacktestResult:
         """
         Run the backtest simulation.
@@ -89,30 +292,76 @@ class BacktestEngine:
         Returns:
             Backtest results
         """
-        # TODO: Implement backtest loop
-        # - Load historical data
-        # - Iterate through time periods
-        # - Check for opportunities
-        # - Simulate executions
-        # - Track performance
-        
         self.logger.info("Starting backtest simulation...")
+        bt = self.backtest_config
+        
+        data = await self.data_loader.load_spread_data(
+            bt.spot_symbol, bt.perp_symbol, bt.start_date, bt.end_date, bt.timeframe
+        )
+        if data.empty:
+            self.logger.warning("No historical data for backtest period")
+            return BacktestResult(
+                config=bt,
+                metrics={},
+                trades=np.empty(0, dtype=TRADE_DTYPE),
+                equity_ts=np.empty(0, dtype="datetime64[ns]"),
+                equity_values=np.empty(0, dtype=np.float64),
+                summary="No data"
+            )
+            
+        # Entry/exit signals are vectorized; the compiled kernel only walks
+        # bars where a position is open or an entry fires
+        spread = data["spread_pct"].to_numpy(np.float64)
+        entry_threshold = self.config.spread_threshold * 100.0 + int(self._fee_bps) / 100.0
+        entries = spread > entry_threshold
+        exits = spread <= EXIT_SPREAD_PCT
+        
+        n_bars = len(data)
+        trades = np.empty(n_bars + self.config.max_open_positions, dtype=TRADE_DTYPE)
+        self._equity_ts = data.index.values.astype("datetime64[ns]")
+        self._equity_val = np.empty(n_bars, dtype=np.float64)
+        n_trades = run_kernel(
+            spread,
+            self._equity_ts.view(np.int64),
+            entries,
+            exits,
+            float(self.config.trade_size_usdc),
+            int(self._fee_bps),
+            self.config.max_open_positions,
+            self._capital_f,
+            trades,
+            self._equity_val
+        )
+        self.trades = trades[:n_trades]
+        
+        self.current_time = pd.Timestamp(self._equity_ts[-1]).to_pydatetime()
+        self.current_capital = Decimal(f"{self._equity_val[-1]:.6f}")
+        
+        # Annualize per bar of the backtest timeframe (unknown timeframes as 1m)
+        periods_per_year = MS_PER_YEAR // TIMEFRAME_MS.get(bt.timeframe, TIMEFRAME_MS["1m"])
+        self.metrics = self.metrics_calculator.calculate_all_metrics(
+            self.trades, self._equity_val, bt.initial_capital, periods_per_year=periods_per_year
+        )
+        self.logger.info(f"Backtest complete: {len(self.trades)} trades over {n_bars} bars")
         
-        # Placeholder result
         return BacktestResult(
-            config=BacktestConfig(
-                start_date=datetime.now() - timedelta(days=30),
-                end_date=datetime.now(),
-                initial_capital=Decimal("1000"),
-                timeframe="1m",
-                data_source="csv"
-            ),
-            metrics={},
-            trades=[],
-            equity_curve=[],
-            summary="Backtest not implemented"
+            config=bt,
+            metrics=self.metrics,
+            trades=self.trades,
+            equity_ts=self._equity_ts,
+            equity_values=self._equity_val,
+            summary=await self.generate_report()
         )
     
+    def trade_records(self) -> List[Dict]:
+        """
+        Expand the columnar trade log into per-trade dicts.
+        
+        Returns:
+            List of trade records
+        """
+        return _trade_dicts(self.trades)
+    
     async def process_tick(self, timestamp: datetime, data: Dict) -> None:
         """
         Process a single time tick in the backtest.
@@ -135,5 +384,6 @@ class BacktestEngine:
         Returns:
             Formatted report string
         """
-        # TODO: Generate comprehensive report
-        return "Backtest Report"
+        if not self.metrics:
+            return "Backtest Report"
+        return self.metrics_calculator.generate_report(self.metrics)
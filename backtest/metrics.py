@@ -4,10 +4,11 @@ Backtest Metrics Calculator
 Calculates comprehensive performance metrics for backtest results.
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Sequence, Union
 from datetime import datetime
 from decimal import Decimal
-# # import numpy as np  # TODO: Add when needed  # TODO: Add when needed
+import math
+import numpy as np
 
 from core.logger import get_logger
 
@@ -29,41 +30,110 @@ class BacktestMetrics:
         
     def calculate_all_metrics(
         self,
-        trades: List[Dict],
-        equity_curve: List[Tuple[datetime, Decimal]],
-        initial_capital: Decimal
+        trades: np.ndarray,
+        equity_curve: Union[np.ndarray, List[Tuple[datetime, Decimal]]],
+        initial_capital: Decimal,
+        periods_per_year: int = 525600
     ) -> Dict:
         """
         Calculate all backtest metrics.
         
         Args:
-            trades: List of trade records
-            equity_curve: Equity over time
+            trades: Columnar trade log (engine.TRADE_DTYPE structured array)
+            equity_curve: Equity values array, or (timestamp, equity) pairs
             initial_capital: Starting capital
+            periods_per_year: Equity samples per year (default: 1m bars)
             
         Returns:
             Dictionary of metrics
         """
-        # TODO: Calculate comprehensive metrics
+        # Work on a float64 equity array; Decimal only for reported values
+        equity = self._equity_values(equity_curve)
+        capital = float(initial_capital)
+        
+        total_return = 0.0
+        annualized_return = 0.0
+        sharpe_ratio = 0.0
+        sortino_ratio = 0.0
+        if len(equity) > 0:
+            total_return = (equity[-1] - capital) / capital * 100.0
+        if len(equity) > 1:
+            returns = np.diff(equity) / equity[:-1]
+            sharpe_ratio = self.calculate_sharpe_ratio(returns, periods_per_year=periods_per_year)
+            sortino_ratio = self.calculate_sortino_ratio(returns, periods_per_year=periods_per_year)
+            annualized_return = self._annualized_return(
+                equity[-1] / capital, (len(equity) - 1) / periods_per_year
+            )
+        max_drawdown = 0.0
+        if len(equity) > 0:
+            max_drawdown, _, _ = self._max_drawdown(equity)
+        
+        trade_stats = self._trade_stats(trades)
         
         metrics = {
-            "total_return": self.calculate_total_return(equity_curve, initial_capital),
-            "annualized_return": Decimal("0"),
-            "sharpe_ratio": 0.0,
-            "sortino_ratio": 0.0,
-            "max_drawdown": Decimal("0"),
-            "win_rate": 0.0,
-            "profit_factor": 0.0,
+            "total_return": self._to_decimal(total_return),
+            "annualized_return": self._to_decimal(annualized_return),
+            "sharpe_ratio": sharpe_ratio,
+            "sortino_ratio": sortino_ratio,
+            "max_drawdown": self._to_decimal(max_drawdown),
             "total_trades": len(trades),
-            "avg_trade_profit": Decimal("0"),
-            "best_trade": Decimal("0"),
-            "worst_trade": Decimal("0"),
-            "avg_hold_time": 0,
-            "total_fees": Decimal("0")
+            **trade_stats
         }
         
         return metrics
     
+    def _trade_stats(self, trades: np.ndarray) -> Dict:
+        """Vectorized trade statistics over the columnar trade log."""
+        if len(trades) == 0:
+            return {
+                "win_rate": 0.0,
+                "profit_factor": 0.0,
+                "avg_trade_profit": Decimal("0"),
+                "best_trade": Decimal("0"),
+                "worst_trade": Decimal("0"),
+                "avg_hold_time": 0,
+                "total_fees": Decimal("0")
+            }
+            
+        pnl = trades["pnl"].astype(np.float64)
+        gross_profit = pnl[pnl > 0].sum()
+        gross_loss = -pnl[pnl < 0].sum()
+        hold_ns = trades["exit_ts"] - trades["entry_ts"]
+        
+        return {
+            "win_rate": float((pnl > 0).mean() * 100.0),
+            "profit_factor": float(gross_profit / gross_loss) if gross_loss > 0 else 0.0,
+            "avg_trade_profit": self._to_decimal(pnl.mean()),
+            "best_trade": self._to_decimal(pnl.max()),
+            "worst_trade": self._to_decimal(pnl.min()),
+            "avg_hold_time": int(hold_ns.mean() // 1_000_000_000),
+            "total_fees": self._to_decimal(trades["fee"].astype(np.float64).sum())
+        }
+    
+    @staticmethod
+    def _equity_values(
+        equity_curve: Union[np.ndarray, List[Tuple[datetime, Decimal]]]
+    ) -> np.ndarray:
+        """Convert an equity curve to a float64 array of equity values."""
+        if isinstance(equity_curve, np.ndarray):
+            return equity_curve.astype(np.float64, copy=False)
+        return np.asarray([float(e) for _, e in equity_curve], dtype=np.float64)
+    
+    @staticmethod
+    def _annualized_return(growth: float, years: float) -> float:
+        """Compound growth over `years` as an annual percentage (inf if it overflows)."""
+        if growth <= 0.0:
+            return -100.0
+        try:
+            return math.expm1(math.log(growth) / years) * 100.0
+        except OverflowError:
+            return math.inf
+    
+    @staticmethod
+    def _to_decimal(value: float) -> Decimal:
+        """Convert a float metric to Decimal for reporting."""
+        return Decimal(f"{value:.6f}")
+    
     def calculate_total_return(
         self,
         equity_curve: List[Tuple[datetime, Decimal]],
@@ -78,21 +148,58 @@ class BacktestMetrics:
     
     def calculate_sharpe_ratio(
         self,
-        returns: List[Decimal],
-        risk_free_rate: Decimal = Decimal("0.02")
+        returns: Sequence[float],
+        risk_free_rate: Decimal = Decimal("0.02"),
+        periods_per_year: int = 525600
     ) -> float:
         """
-        Calculate Sharpe ratio.
+        Calculate annualized Sharpe ratio.
         
         Args:
-            returns: List of period returns
+            returns: Period returns
             risk_free_rate: Annual risk-free rate
+            periods_per_year: Return periods per year (default: 1m bars)
             
         Returns:
             Sharpe ratio
         """
-        # TODO: Implement Sharpe calculation
-        return 0.0
+        r = np.asarray(returns, dtype=np.float64)
+        if r.size < 2:
+            return 0.0
+            
+        std = r.std()
+        if std == 0:
+            return 0.0
+            
+        excess = r.mean() - float(risk_free_rate) / periods_per_year
+        return float(excess / std * np.sqrt(periods_per_year))
+    
+    def calculate_sortino_ratio(
+        self,
+        returns: Sequence[float],
+        risk_free_rate: Decimal = Decimal("0.02"),
+        periods_per_year: int = 525600
+    ) -> float:
+        """
+        Calculate annualized Sortino ratio (downside deviation only).
+        
+        Args:
+            returns: Period returns
+            risk_free_rate: Annual risk-free rate
+            periods_per_year: Return periods per year (default: 1m bars)
+            
+        Returns:
+            Sortino ratio
+        """
+        r = np.asarray(returns, dtype=np.float64)
+        if r.size < 2:
+            return 0.0
+            
+        excess = r - float(risk_free_rate) / periods_per_year
+        downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2))
+        if downside == 0:
+            return 0.0
+        return float(excess.mean() / downside * np.sqrt(periods_per_year))
     
     def calculate_max_drawdown(
         self,
@@ -104,8 +211,21 @@ class BacktestMetrics:
         Returns:
             Tuple of (max_dd_percentage, peak_date, valley_date)
         """
-        # TODO: Implement drawdown calculation
-        return Decimal("0"), datetime.now(), datetime.now()
+        if not equity_curve:
+            return Decimal("0"), datetime.now(), datetime.now()
+            
+        max_dd, peak_idx, valley_idx = self._max_drawdown(self._equity_values(equity_curve))
+        return self._to_decimal(max_dd), equity_curve[peak_idx][0], equity_curve[valley_idx][0]
+    
+    @staticmethod
+    def _max_drawdown(equity: np.ndarray) -> Tuple[float, int, int]:
+        """Return (max_dd_percentage, peak_index, valley_index) for an equity array."""
+        peak = np.maximum.accumulate(equity)
+        drawdown = (equity - peak) / peak
+        
+        valley_idx = int(drawdown.argmin())
+        peak_idx = int(equity[:valley_idx + 1].argmax())
+        return float(-drawdown[valley_idx] * 100.0), peak_idx, valley_idx
     
     def generate_report(self, metrics: Dict) -> str:
         """
@@ -4,14 +4,50 @@ Order Simulation Module
 Simulates realistic order execution for backtesting.
 """
 
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 from decimal import Decimal
 from dataclasses import dataclass
-import random
+import asyncio
+import itertools
+from time import monotonic_ns
+
+import numpy as np
 
 from core.logger import get_logger
 from integrations.base import Order, OrderSide, OrderType, OrderStatus
+from utils.jit import njit
+
+# Shared PCG64 generator for slippage noise
+_RNG = np.random.default_rng()
+
+# Precision of Decimal values handed out on Order objects
+_QUANT = Decimal("1e-8")
+
+
+def _to_decimal(value: float) -> Decimal:
+    """Exact float -> Decimal conversion (no string round-trip), rounded to 8dp."""
+    return Decimal(float(value)).quantize(_QUANT)
+
+
+@njit("float64(float64, float64, float64, float64)", cache=True, fastmath=True)
+def _slippage_kernel(size: float, volatility: float, base: float, random_factor: float) -> float:
+    """Base slippage + size impact + volatility impact, scaled by random_factor."""
+    return (base + size * 1e-4 + volatility * 0.5) * random_factor
+
+
+@njit("float64(float64, float64)", cache=True, fastmath=True)
+def _fee_kernel(size: float, rate: float) -> float:
+    """Fee for an order of the given size at a fractional rate."""
+    return size * rate
+
+
+try:
+    # Cython build of the same kernels (see build.sh); no JIT warm-up
+    from backtest._sim_kernels import slippage as _slippage, fee as _fee
+except ImportError:
+    _slippage = _slippage_kernel
+    _fee = _fee_kernel
 
 
 @dataclass
@@ -23,6 +59,103 @@ class MarketConditions:
     spread: Decimal
 
 
+class OrderBuffer:
+    """
+    Column-oriented store of simulated fills.
+    
+    Columns are pre-allocated and filled through a write cursor; Order
+    objects are only built when code outside the backtest asks for them.
+    """
+    
+    def __init__(self, capacity: int = 1024, id_prefix: str = "sim_"):
+        """
+        Initialize an empty buffer.
+        
+        Args:
+            capacity: Initial number of rows
+            id_prefix: Prefix for materialized order ids
+        """
+        self.id_prefix = id_prefix
+        self.ids = np.empty(capacity, dtype=np.uint64)
+        self.prices = np.empty(capacity, dtype=np.float64)
+        self.qtys = np.empty(capacity, dtype=np.float64)
+        self.fees = np.empty(capacity, dtype=np.float64)
+        self.ts = np.empty(capacity, dtype="datetime64[ns]")
+        self.sides = np.empty(capacity, dtype=np.int8)  # 1 = buy, -1 = sell
+        self.size = 0
+        
+    def __len__(self) -> int:
+        return self.size
+    
+    def _reserve(self, n: int) -> None:
+        """Grow every column (doubling) so n more rows fit."""
+        capacity = len(self.ids)
+        if self.size + n <= capacity:
+            return
+        while capacity < self.size + n:
+            capacity *= 2
+        for name in ("ids", "prices", "qtys", "fees", "ts", "sides"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+            
+    def append(
+        self,
+        ids: np.ndarray,
+        sides: np.ndarray,
+        qtys: np.ndarray,
+        prices: np.ndarray,
+        fees: np.ndarray,
+        ts: np.ndarray
+    ) -> slice:
+        """
+        Write a block of fills at the cursor.
+        
+        Returns:
+            Slice of the rows written
+        """
+        n = len(qtys)
+        self._reserve(n)
+        rows = slice(self.size, self.size + n)
+        self.ids[rows] = ids
+        self.sides[rows] = sides
+        self.qtys[rows] = qtys
+        self.prices[rows] = prices
+        self.fees[rows] = fees
+        self.ts[rows] = ts
+        self.size += n
+        return rows
+    
+    def to_orders(self, symbol: str, rows: slice = slice(None)) -> List[Order]:
+        """
+        Materialize Order objects for a range of rows.
+        
+        Args:
+            symbol: Symbol to stamp on the orders
+            rows: Rows to convert (default: all)
+            
+        Returns:
+            List of filled market orders
+        """
+        orders = []
+        for i in range(*rows.indices(self.size)):
+            quantity = _to_decimal(self.qtys[i])
+            orders.append(Order(
+                id=f"{self.id_prefix}{self.ids[i]}",
+                symbol=symbol,
+                side=OrderSide.BUY if self.sides[i] > 0 else OrderSide.SELL,
+                type=OrderType.MARKET,
+                price=_to_decimal(self.prices[i]),
+                quantity=quantity,
+                filled_quantity=quantity,
+                status=OrderStatus.FILLED,
+                timestamp=self.ts[i].astype("datetime64[us]").item(),
+                fee=_to_decimal(self.fees[i])
+            ))
+        return orders
+
+
 class OrderSimulator:
     """
     Simulates order execution with realistic slippage and fees.
@@ -44,13 +177,22 @@ class OrderSimulator:
         self.config = config
         self.logger = get_logger(__name__)
         
-        # Simulation parameters
-        self.base_slippage = Decimal("0.0005")  # 0.05%
+        # Simulation parameters (plain floats; Decimal only on the Order boundary)
+        self.base_slippage = 0.0005  # 0.05%
         self.latency_ms = 100  # 100ms average latency
         
+        # Sequential order ids, prefixed with a per-simulator monotonic stamp
+        # so ids from separate runs in one process never collide
+        self._id_prefix = f"sim_{monotonic_ns()}_"
+        self._id_counter = itertools.count()
+        
+        # Fills produced by simulate_orders_batch
+        self.fills = OrderBuffer(id_prefix=self._id_prefix)
+        
         # Fee structure
-        self.binance_fee = Decimal("0.001")
-        self.drift_fee = Decimal("0.0005")
+        self.binance_fee = 0.001
+        self.drift_fee = 0.0005
+        self._fee_table = {"Binance": self.binance_fee, "Drift": self.drift_fee}
         
     async def simulate_order(
         self,
@@ -81,36 +223,91 @@ class OrderSimulator:
         # - Simulate partial fills
         # - Add random latency
         
+        size_f = float(size)
+        price_f = float(price)
+        
         # Calculate slippage
-        slippage = self.calculate_slippage(size, market_conditions)
+        slippage = self.calculate_slippage(size_f, market_conditions)
         
         # Adjust price based on side and slippage
         if side == OrderSide.BUY:
-            fill_price = price * (Decimal("1") + slippage)
+            fill_price = price_f * (1.0 + slippage)
         else:
-            fill_price = price * (Decimal("1") - slippage)
+            fill_price = price_f * (1.0 - slippage)
             
         # Calculate fees
-        fee = size * (self.binance_fee if exchange == "Binance" else self.drift_fee)
+        fee = _fee(size_f, self._fee_table.get(exchange, self.drift_fee))
         
+        quantity = _to_decimal(size_f)
         return Order(
-            id=f"sim_{datetime.now().timestamp()}",
+            id=f"{self._id_prefix}{next(self._id_counter)}",
             symbol=symbol,
             side=side,
             type=OrderType.MARKET,
-            price=fill_price,
-            quantity=size,
-            filled_quantity=size,
+            price=_to_decimal(fill_price),
+            quantity=quantity,
+            filled_quantity=quantity,
             status=OrderStatus.FILLED,
             timestamp=market_conditions.timestamp,
-            fee=fee
+            fee=_to_decimal(fee)
+        )
+    
+    def simulate_orders_batch(
+        self,
+        exchanges: Union[str, Sequence[str]],
+        sides: Sequence[OrderSide],
+        sizes: Sequence[float],
+        prices: Sequence[float],
+        volatilities: Sequence[float],
+        timestamps: Sequence,
+        seed: Optional[int] = None
+    ) -> slice:
+        """
+        Simulate many market orders at once.
+        
+        Same model as simulate_order, evaluated over whole arrays. Fills are
+        appended to self.fills.
+        
+        Args:
+            exchanges: Exchange name, or one per order
+            sides: Order sides
+            sizes: Order sizes
+            prices: Market prices
+            volatilities: Volatility per order
+            timestamps: Fill time per order
+            seed: Optional RNG seed for reproducible runs (default: shared generator)
+            
+        Returns:
+            Slice of self.fills holding this batch
+        """
+        rng = _RNG if seed is None else np.random.default_rng(seed)
+        buys = np.asarray(sides, dtype=object) == OrderSide.BUY.value
+        sizes = np.asarray(sizes, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        vols = np.asarray(volatilities, dtype=np.float64)
+        
+        slippage = self.base_slippage + sizes / 10000.0 + vols * 0.5
+        slippage *= rng.uniform(0.8, 1.2, size=len(sizes))
+        
+        signs = np.where(buys, 1.0, -1.0)
+        fill_prices = prices * (1.0 + signs * slippage)
+        fees = sizes * np.where(np.asarray(exchanges) == "Binance", self.binance_fee, self.drift_fee)
+        
+        n = len(sizes)
+        return self.fills.append(
+            ids=np.fromiter(itertools.islice(self._id_counter, n), dtype=np.uint64, count=n),
+            sides=signs.astype(np.int8),
+            qtys=sizes,
+            prices=fill_prices,
+            fees=fees,
+            ts=np.asarray(timestamps, dtype="datetime64[ns]")
         )
     
     def calculate_slippage(
         self,
-        size: Decimal,
+        size: float,
         conditions: MarketConditions
-    ) -> Decimal:
+    ) -> float:
         """
         Calculate realistic slippage based on order size and market conditions.
         
@@ -121,16 +318,13 @@ class OrderSimulator:
         Returns:
             Slippage percentage
         """
-        # Base slippage + size impact + volatility impact
-        size_impact = size / Decimal("10000")  # Larger orders have more slippage
-        volatility_impact = conditions.volatility * Decimal("0.5")
-        
-        total_slippage = self.base_slippage + size_impact + volatility_impact
-        
-        # Add some randomness
-        random_factor = Decimal(str(random.uniform(0.8, 1.2)))
-        
-        return total_slippage * random_factor
+        # Larger orders and volatile markets have more slippage, plus some randomness
+        return _slippage(
+            float(size),
+            float(conditions.volatility),
+            self.base_slippage,
+            _RNG.uniform(0.8, 1.2)
+        )
     
     async def simulate_arbitrage_execution(
         self,
@@ -151,17 +345,16 @@ class OrderSimulator:
         Returns:
             Tuple of (spot_order, perp_order)
         """
-        # TODO: Simulate both legs of arbitrage
-        # Consider correlation in slippage
-        
-        spot_order = await self.simulate_order(
-            "Binance", "SOL/USDC", OrderSide.BUY,
-            size, spot_price, conditions
-        )
-        
-        perp_order = await self.simulate_order(
-            "Drift", "SOL-PERP", OrderSide.SELL,
-            size, perp_price, conditions
+        # Legs are independent, so their (simulated) latencies overlap
+        spot_order, perp_order = await asyncio.gather(
+            self.simulate_order(
+                "Binance", "SOL/USDC", OrderSide.BUY,
+                size, spot_price, conditions
+            ),
+            self.simulate_order(
+                "Drift", "SOL-PERP", OrderSide.SELL,
+                size, perp_price, conditions
+            )
         )
         
         return spot_order, perp_order
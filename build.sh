@@ -7,6 +7,13 @@ set -o errexit
 # Install Python dependencies
 pip install --upgrade pip
 pip install -r requirements.txt
+pip install -e . --no-deps
+
+# Compile Cython kernels in place (optional: the simulator falls back to Python/Numba without them)
+cythonize -i backtest/_sim_kernels.pyx || echo "Cython kernels skipped, using fallback"
+
+# AOT-compile the arbitrage spread kernel with numba.pycc (optional: falls back to JIT without it)
+python -m modules._arb_kernel || echo "AOT spread kernel skipped, using fallback"
 
 # Create necessary directories
 mkdir -p data
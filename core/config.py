@@ -6,10 +6,11 @@ Uses environment variables and provides a centralized config object.
 """
 
 import os
+import functools
 from typing import Optional
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 from dotenv import load_dotenv
 
 
@@ -33,11 +34,11 @@ class BotConfig(BaseModel):
     log_level: str = Field(default="INFO")
     
     # Drift Configuration
-    drift_private_key: Optional[str] = Field(default=None)
+    drift_private_key: Optional[str] = Field(default=None, validate_default=True)
     solana_rpc_url: str = Field(default="https://api.mainnet-beta.solana.com")
     
     # Binance Configuration
-    binance_api_key: Optional[str] = Field(default=None)
+    binance_api_key: Optional[str] = Field(default=None, validate_default=True)
     binance_secret_key: Optional[str] = Field(default=None)
     
     # Trading Parameters
@@ -63,25 +64,29 @@ class BotConfig(BaseModel):
     # Database
     database_url: str = Field(default="sqlite:///data/arb_bot.db")
     
+    # Cache (optional): shared performance-report cache keyed by bot_id
+    redis_url: Optional[str] = Field(default=None)
+    bot_id: str = Field(default="drift-arb-bot")
+    
     # Server
     port: int = Field(default=8080, ge=1024, le=65535)
     
-    class Config:
-        """Pydantic configuration"""
-        env_file = ".env"
-        case_sensitive = False
+    # Unrelated keys (e.g. the rest of the environment) are ignored
+    model_config = ConfigDict(extra="ignore")
     
-    @validator("mode", pre=True)
+    @field_validator("mode", mode="before")
+    @classmethod
     def validate_mode(cls, v):
         """Validate and convert mode to enum"""
         if isinstance(v, str):
             return TradingMode(v.upper())
         return v
     
-    @validator("drift_private_key", "binance_api_key")
-    def validate_required_in_live_mode(cls, v, values):
+    @field_validator("drift_private_key", "binance_api_key")
+    @classmethod
+    def validate_required_in_live_mode(cls, v, info: ValidationInfo):
         """Ensure required credentials are present in LIVE mode"""
-        if values.get("mode") == TradingMode.LIVE and not v:
+        if info.data.get("mode") == TradingMode.LIVE and not v:
             raise ValueError(f"API credentials required for LIVE mode")
         return v
     
@@ -98,10 +103,14 @@ class BotConfig(BaseModel):
         return f"BotConfig(mode={self.mode}, spread_threshold={self.spread_threshold})"
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> BotConfig:
     """
     Load and validate configuration from environment variables.
     
+    The .env file is read and validated once per process; call
+    load_config.cache_clear() to pick up environment changes.
+    
     Returns:
         BotConfig: Validated configuration object
         
@@ -111,28 +120,10 @@ def load_config() -> BotConfig:
     # Load .env file if it exists
     load_dotenv()
     
-    # Create config instance (will validate automatically)
-    config = BotConfig(
-        mode=os.getenv("MODE", "SIMULATION"),
-        log_level=os.getenv("LOG_LEVEL", "INFO"),
-        drift_private_key=os.getenv("DRIFT_PRIVATE_KEY"),
-        solana_rpc_url=os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com"),
-        binance_api_key=os.getenv("BINANCE_API_KEY"),
-        binance_secret_key=os.getenv("BINANCE_SECRET_KEY"),
-        spread_threshold=float(os.getenv("SPREAD_THRESHOLD", "0.003")),
-        trade_size_usdc=float(os.getenv("TRADE_SIZE_USDC", "100")),
-        max_open_positions=int(os.getenv("MAX_OPEN_POSITIONS", "2")),
-        max_drawdown=float(os.getenv("MAX_DRAWDOWN", "0.05")),
-        max_trades_per_day=int(os.getenv("MAX_TRADES_PER_DAY", "50")),
-        cooldown_after_losses=int(os.getenv("COOLDOWN_AFTER_LOSSES", "3")),
-        cooldown_duration_min=int(os.getenv("COOLDOWN_DURATION_MIN", "30")),
-        backtest_timeframe=os.getenv("BACKTEST_TIMEFRAME", "1m"),
-        backtest_data_source=os.getenv("BACKTEST_DATA_SOURCE", "csv"),
-        backtest_start_date=datetime(2023, 1, 1),
-        backtest_end_date=datetime(2024, 6, 1),
-        discord_webhook_url=os.getenv("DISCORD_WEBHOOK_URL"),
-        database_url=os.getenv("DATABASE_URL", "sqlite:///data/arb_bot.db"),
-        port=int(os.getenv("PORT", "8080"))
+    # Validate straight from the environment; env var names map to
+    # lowercased field names (MODE -> mode, SPREAD_THRESHOLD -> spread_threshold)
+    config = BotConfig.model_validate(
+        {key.lower(): value for key, value in os.environ.items()}
     )
     
     return config
@@ -6,14 +6,19 @@ Optimized for both development (Codespaces) and production (Render).
 """
 
 import sys
-import logging
+import functools
 from pathlib import Path
 from datetime import datetime
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 from typing import Optional
 
 from loguru import logger
 
+# Record formats, built once
+CONSOLE_COLOR_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+PLAIN_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+ERROR_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} - {message}\n{exception}"
+TRADE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | TRADE | {message}"
+
 
 class BotLogger:
     """
@@ -55,22 +60,27 @@ class BotLogger:
         log_dir = Path("logs")
         log_dir.mkdir(exist_ok=True)
         
+        # Console and main file sinks write from loguru's background thread
+        # (enqueue=True), so per-tick records never block on stdout/disk IO
+        
         # Console logging (always enabled)
         if mode in ["SIMULATION", "BACKTEST"]:
             # Colorized output for development
             logger.add(
                 sys.stdout,
-                format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+                format=CONSOLE_COLOR_FORMAT,
                 level=log_level,
-                colorize=True
+                colorize=True,
+                enqueue=True
             )
         else:
             # Structured output for production
             logger.add(
                 sys.stdout,
-                format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+                format=PLAIN_FORMAT,
                 level=log_level,
-                colorize=False
+                colorize=False,
+                enqueue=True
             )
         
         # File logging - Main log file (rotated daily)
@@ -79,19 +89,25 @@ class BotLogger:
             rotation="00:00",  # Rotate at midnight
             retention="30 days",  # Keep 30 days of logs
             level=log_level,
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-            compression="zip"  # Compress old logs
+            format=PLAIN_FORMAT,
+            compression="zip",  # Compress old logs
+            enqueue=True
         )
         
+        # Error and trade logs only open their files on the first matching
+        # record, so runs without errors or trades never touch them
+        
         # Error log file (persistent)
         logger.add(
             log_dir / "errors.log",
             level="ERROR",
             rotation="10 MB",  # Rotate when file reaches 10MB
             retention="90 days",
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} - {message}\n{exception}",
-            backtrace=True,
-            diagnose=True
+            format=ERROR_FORMAT,
+            # Extended tracebacks walk frames and repr locals; skip them in LIVE
+            backtrace=mode != "LIVE",
+            diagnose=mode != "LIVE",
+            delay=True
         )
         
         # Trade log file (for audit trail)
@@ -100,8 +116,9 @@ class BotLogger:
             filter=lambda record: "TRADE" in record["extra"],
             rotation="1 month",
             retention="1 year",
-            format="{time:YYYY-MM-DD HH:mm:ss} | TRADE | {message}",
-            serialize=True  # JSON format for trade logs
+            format=TRADE_FORMAT,
+            serialize=True,  # JSON format for trade logs
+            delay=True
         )
         
         self._initialized = True
@@ -162,9 +179,10 @@ def setup_logger(log_level: str = "INFO", mode: str = "SIMULATION") -> BotLogger
     return _bot_logger
 
 
+@functools.lru_cache(maxsize=None)
 def get_logger(name: str = __name__) -> 'logger':
     """
-    Get a logger instance for a module.
+    Get a logger instance for a module (one bound logger per name).
     
     Args:
         name: Module name (usually __name__)
@@ -2,37 +2,63 @@
 Production-ready Drift-Binance Arbitrage Bot
 With integrated performance monitoring and profitability analysis
 """
+import argparse
 import asyncio
+import functools
 import sys
 import os
-from typing import Dict
-from pathlib import Path
-
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from time import monotonic
+from typing import Coroutine, Dict, List, Optional, Set, Tuple
 
 from core.config import get_config
 from core.logger import logger
-from modules.price_monitor import PriceMonitor
+from modules.price_monitor import Pair, PriceMonitor
 from modules.arbitrage import ArbitrageDetector
 from modules.paper_trader import PaperTrader
 from modules.discord_notifier import DiscordNotifier
 from modules.performance_monitor import PerformanceMonitor
+from utils import fastjson
+from utils.jit import njit
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+# Trading pairs to monitor
+_TRADING_PAIRS: Tuple[Pair, ...] = (
+    Pair("SOLUSDT", "SOLPERP"),
+)
+
+@njit(cache=True)
+def _spread_ok(spot: float, perp: float, threshold: float):
+    """Return (spread_percent, spread_percent > threshold)."""
+    d = (perp - spot) / spot * 100.0
+    return d, d > threshold
+
 
 class DriftBinanceArbBot:
     """Main arbitrage bot class with full monitoring"""
     
     def __init__(self):
         self.bot_config = get_config()
-        self.config = self.convert_config()
+        self.config = self.convert_config
         self.price_monitor = PriceMonitor(self.config)
         self.arb_detector = ArbitrageDetector(self.config)
+        
+        # Spread (percent) an opportunity must beat, matching ArbitrageDetector
+        self._threshold = self.arb_detector.min_spread_percent + self.arb_detector.total_fees_percent
+        self._max_open = self.config['max_open_trades']
+        self._min_profit = self.config['min_profit_usdt']
         self.paper_trader = None
         self.discord = None
         self.performance = None
         self.running = True
+        # monotonic() timestamps; -inf so the first event always fires
         self.last_notification_time = {}
-        self.last_performance_report = 0
+        self.last_performance_report = float('-inf')
+        # Strong refs to fire-and-forget tasks so they are not garbage collected mid-flight
+        self._bg_tasks: Set[asyncio.Task] = set()
         
         # Initialize paper trader if in simulation mode
         if self.bot_config.mode in ['SIMULATION', 'PAPER_TRADING']:
@@ -45,9 +71,21 @@ class DriftBinanceArbBot:
         # Initialize performance monitor
         initial_balance = self.paper_trader.initial_balance if self.paper_trader else 10000
         self.performance = PerformanceMonitor(initial_balance)
+        
+        # Optional Redis cache for the hourly report (survives restarts, readable by dashboards)
+        self.redis = None
+        self._report_key = f"perf:{self.bot_config.bot_id}:hourly"
+        if self.bot_config.redis_url:
+            if aioredis is None:
+                logger.warning("REDIS_URL is set but the redis package is not installed - report cache disabled")
+            else:
+                self.redis = aioredis.from_url(self.bot_config.redis_url)
+        # Only the first report after a (re)start may be served from the cache
+        self._report_from_cache = True
             
+    @functools.cached_property
     def convert_config(self) -> Dict:
-        """Convert BotConfig to dict format expected by modules"""
+        """Convert BotConfig to dict format expected by modules (built once)"""
         return {
             'mode': self.bot_config.mode.value,
             'min_spread_percent': self.bot_config.spread_threshold * 100,
@@ -59,29 +97,58 @@ class DriftBinanceArbBot:
             'pairs': self.get_trading_pairs()
         }
         
-    def get_trading_pairs(self) -> list:
+    def get_trading_pairs(self) -> Tuple[Pair, ...]:
         """Get trading pairs configuration"""
-        return [
-            {"spot_symbol": "SOLUSDT", "perp_symbol": "SOLPERP"},
-        ]
+        return _TRADING_PAIRS
         
-    def should_notify(self, event_type: str, cooldown_seconds: int = 60) -> bool:
+    def should_notify(self, event_type: str, cooldown_seconds: int = 60,
+                      now: Optional[float] = None) -> bool:
         """Check if we should send a notification (with cooldown)"""
-        import time
-        current_time = time.time()
-        last_time = self.last_notification_time.get(event_type, 0)
+        current_time = monotonic() if now is None else now
+        last_time = self.last_notification_time.get(event_type, float('-inf'))
         
         if current_time - last_time > cooldown_seconds:
             self.last_notification_time[event_type] = current_time
             return True
         return False
         
-    async def send_performance_report(self):
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background, keeping a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+        
+    @staticmethod
+    async def _notify(coros: List[Coroutine]):
+        """Send notifications concurrently; a failed send never affects the others"""
+        await asyncio.gather(*coros, return_exceptions=True)
+        
+    async def get_cached_report(self, refresh: bool = False) -> Dict:
+        """Profitability report, served from Redis for up to an hour when configured"""
+        if self.redis and not refresh:
+            try:
+                cached = await self.redis.get(self._report_key)
+                if cached:
+                    return fastjson.loads(cached)
+            except Exception as e:
+                logger.warning(f"Redis report cache read failed: {e}")
+                
+        report = self.performance.get_profitability_report()
+        
+        if self.redis:
+            try:
+                await self.redis.setex(self._report_key, 3600, fastjson.dumps(report, default=str))
+            except Exception as e:
+                logger.warning(f"Redis report cache write failed: {e}")
+        return report
+        
+    async def send_performance_report(self, refresh: bool = False):
         """Send performance report to Discord"""
         if not self.discord:
             return
             
-        report = self.performance.get_profitability_report()
+        report = await self.get_cached_report(refresh)
         
         # Create Discord embed
         is_profitable = report['summary']['is_profitable']
@@ -109,11 +176,16 @@ class DriftBinanceArbBot:
     async def price_callback(self, spot_symbol: str, perp_symbol: str, 
                            spot_price: float, perp_price: float):
         """Handle price updates with performance tracking"""
+        current_time = monotonic()
         
-        # Check for arbitrage
-        opportunity = self.arb_detector.check_opportunity(
-            spot_symbol, perp_symbol, spot_price, perp_price
-        )
+        # Check for arbitrage: compiled spread test first, the detector only
+        # builds an opportunity when the threshold is cleared
+        _, hit = _spread_ok(spot_price, perp_price, self._threshold)
+        opportunity = None
+        if hit:
+            opportunity = self.arb_detector.check_opportunity(
+                spot_symbol, perp_symbol, spot_price, perp_price
+            )
         
         if opportunity:
             # Record opportunity in performance monitor
@@ -123,64 +195,75 @@ class DriftBinanceArbBot:
             )
             
             logger.success(
-                f"🎯 Arbitrage on {spot_symbol}: "
-                f"Spread {opportunity.spread_percent:.3f}% = "
-                f"${opportunity.potential_profit_usdt:.2f} profit"
+                "🎯 Arbitrage on {}: Spread {:.3f}% = ${:.2f} profit",
+                spot_symbol, opportunity.spread_percent, opportunity.potential_profit_usdt
             )
             
-            # Send Discord notification
-            if self.discord and self.should_notify('opportunity', cooldown_seconds=60):
-                await self.discord.send_opportunity_alert(opportunity.to_dict())
+            # Discord notifications are collected and sent off the tick path
+            pending: List[Coroutine] = []
+            if self.discord and self.should_notify('opportunity', cooldown_seconds=60, now=current_time):
+                pending.append(self.discord.send_opportunity_alert(opportunity.to_dict()))
             
             # Execute paper trade if enabled
-            if self.paper_trader and len(self.paper_trader.open_trades) < self.config['max_open_trades']:
-                if opportunity.potential_profit_usdt >= self.config['min_profit_usdt']:
-                    trade = self.paper_trader.execute_trade(opportunity.to_dict())
-                    
-                    if trade:
-                        # Notify about trade execution
-                        if self.discord:
-                            await self.discord.send_trade_notification(trade.__dict__, "opened")
+            if (self.paper_trader and self.paper_trader.open_count < self._max_open
+                    and opportunity.potential_profit_usdt >= self._min_profit):
+                trade = self.paper_trader.execute_trade(opportunity)
+                
+                if trade:
+                    # Notify about trade execution
+                    if self.discord:
+                        pending.append(self.discord.send_trade_notification(trade.to_dict(), "opened"))
+                        
+            if pending:
+                self._spawn(self._notify(pending))
                             
         # Send periodic performance reports (every hour)
-        import time
-        current_time = time.time()
         if current_time - self.last_performance_report > 3600:  # 1 hour
             self.last_performance_report = current_time
-            self.performance.take_hourly_snapshot()
+            self._spawn(self.hourly_report())
             
-            if self.discord and self.performance.metrics.total_trades > 0:
-                await self.send_performance_report()
+    async def hourly_report(self):
+        """Snapshot metrics (file write on the metrics IO thread) and post the report"""
+        self.performance.take_hourly_snapshot()
+        
+        if self.discord and self.performance.metrics.total_trades > 0:
+            await self.send_performance_report(refresh=not self._report_from_cache)
+            self._report_from_cache = False
                     
     async def run(self):
         """Main bot loop"""
-        logger.info("=" * 60)
-        logger.info("🚀 DRIFT-BINANCE ARBITRAGE BOT")
-        logger.info("=" * 60)
-        logger.info(f"Mode: {self.bot_config.mode}")
-        logger.info(f"Min Spread: {self.bot_config.spread_threshold * 100:.1f}%")
-        logger.info(f"Trade Size: ${self.bot_config.trade_size_usdc}")
-        logger.info(f"Max Positions: {self.bot_config.max_open_positions}")
-        logger.info(f"Monitoring {len(self.config['pairs'])} pairs")
-        logger.info(f"Discord: {'Enabled' if self.discord else 'Disabled'}")
-        logger.info(f"Performance Tracking: Enabled")
+        banner = [
+            "=" * 60,
+            "🚀 DRIFT-BINANCE ARBITRAGE BOT",
+            "=" * 60,
+            f"Mode: {self.bot_config.mode}",
+            f"Min Spread: {self.bot_config.spread_threshold * 100:.1f}%",
+            f"Trade Size: ${self.bot_config.trade_size_usdc}",
+            f"Max Positions: {self.bot_config.max_open_positions}",
+            f"Monitoring {len(self.config['pairs'])} pairs",
+            f"Discord: {'Enabled' if self.discord else 'Disabled'}",
+            "Performance Tracking: Enabled",
+        ]
         
         if self.paper_trader:
-            logger.info(f"Paper Trading Balance: ${self.paper_trader.balance:.2f}")
+            banner.append(f"Paper Trading Balance: ${self.paper_trader.balance:.2f}")
             # Update performance monitor with current balance
             self.performance.update_balance(self.paper_trader.balance)
             
-        logger.info("=" * 60)
-        
         # Show initial profitability status
         report = self.performance.get_profitability_report()
-        logger.info(f"Current Status: {'PROFITABLE' if report['summary']['is_profitable'] else 'UNPROFITABLE'}")
-        logger.info(f"Total P&L: ${report['summary']['total_net_profit']}")
-        logger.info("=" * 60)
+        banner += [
+            "=" * 60,
+            f"Current Status: {'PROFITABLE' if report['summary']['is_profitable'] else 'UNPROFITABLE'}",
+            f"Total P&L: ${report['summary']['total_net_profit']}",
+            "=" * 60,
+        ]
+        logger.info("\n".join(banner))
         
         try:
             # Initialize connections
             await self.price_monitor.initialize()
+            self.arb_detector.warm_up()
             
             # Send startup notification
             if self.discord:
@@ -204,8 +287,13 @@ class DriftBinanceArbBot:
         self.running = False
         await self.price_monitor.stop()
         
+        # Let in-flight notifications finish before the Discord session closes
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+        
         # Update performance metrics with closed trades
         if self.paper_trader:
+            await self.paper_trader.flush()
             for trade in self.paper_trader.trades:
                 if trade.status == "CLOSED" and hasattr(trade, 'actual_profit'):
                     trade_result = {
@@ -216,48 +304,80 @@ class DriftBinanceArbBot:
                     
             # Update final balance
             self.performance.update_balance(self.paper_trader.balance)
+        await self.performance.flush()
         
         # Generate final profitability report
         final_report = self.performance.get_profitability_report()
         
         # Show final stats
-        logger.info("=" * 60)
-        logger.info("📊 FINAL PROFITABILITY REPORT")
-        logger.info("=" * 60)
-        logger.info(f"Bot Status: {'PROFITABLE' if final_report['summary']['is_profitable'] else 'UNPROFITABLE'}")
-        logger.info(f"Total Net Profit: ${final_report['summary']['total_net_profit']}")
-        logger.info(f"ROI: {final_report['summary']['roi_percentage']}%")
-        logger.info(f"Total Runtime: {final_report['summary']['runtime_hours']:.1f} hours")
-        logger.info(f"Profit per Hour: ${final_report['profitability_analysis']['profit_per_hour']}")
-        logger.info(f"Projected Monthly: ${final_report['profitability_analysis']['projected_monthly_profit']}")
-        
-        logger.info("\n📋 RECOMMENDATIONS:")
-        for rec in final_report['recommendations']:
-            logger.info(f"  {rec}")
-            
-        logger.info("=" * 60)
+        summary = [
+            "=" * 60,
+            "📊 FINAL PROFITABILITY REPORT",
+            "=" * 60,
+            f"Bot Status: {'PROFITABLE' if final_report['summary']['is_profitable'] else 'UNPROFITABLE'}",
+            f"Total Net Profit: ${final_report['summary']['total_net_profit']}",
+            f"ROI: {final_report['summary']['roi_percentage']}%",
+            f"Total Runtime: {final_report['summary']['runtime_hours']:.1f} hours",
+            f"Profit per Hour: ${final_report['profitability_analysis']['profit_per_hour']}",
+            f"Projected Monthly: ${final_report['profitability_analysis']['projected_monthly_profit']}",
+            "",
+            "📋 RECOMMENDATIONS:",
+        ]
+        summary += [f"  {rec}" for rec in final_report['recommendations']]
+        summary.append("=" * 60)
+        logger.info("\n".join(summary))
         
         # Send final report to Discord
         if self.discord:
-            await self.send_performance_report()
+            await self.send_performance_report(refresh=True)
             await self.discord.send_message(
                 f"🛑 Bot stopped. Final status: {'PROFITABLE ✅' if final_report['summary']['is_profitable'] else 'UNPROFITABLE ❌'}\n"
                 f"Net P&L: ${final_report['summary']['total_net_profit']}"
             )
             await self.discord.close()
             
+        if self.redis:
+            await self.redis.aclose()
+            
         logger.info("Shutdown complete")
 
 def main():
     """Entry point"""
+    parser = argparse.ArgumentParser(description="Drift-Binance arbitrage bot")
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="profile bot.run() with Scalene (launch with: scalene --off --cpu --memory --profile-all -m core.main --profile)"
+    )
+    args = parser.parse_args()
+    
+    # Use libuv-based event loop when available (not supported on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+        
+    profiler = None
+    if args.profile:
+        try:
+            from scalene import scalene_profiler
+            profiler = scalene_profiler
+        except ImportError:
+            logger.warning("--profile requested but scalene is not installed (pip install .[profile])")
+            
     try:
         bot = DriftBinanceArbBot()
+        if profiler:
+            profiler.start()
         asyncio.run(bot.run())
     except KeyboardInterrupt:
         logger.info("Received shutdown signal")
     except Exception as e:
         logger.error(f"Fatal error: {e}")
         sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,10 @@
 """
 Base Exchange Interface
 
-Abstract base class that defines the common interface for all exchange integrations.
+Structural protocol that defines the common interface for all exchange integrations.
 """
 
-from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Protocol
 from datetime import datetime
 from decimal import Decimal
 from dataclasses import dataclass
@@ -34,14 +33,14 @@ class OrderStatus(str, Enum):
     FAILED = "FAILED"
 
 
-@dataclass
+@dataclass(slots=True)
 class Ticker:
     """Market ticker data"""
     symbol: str
-    bid: Decimal
-    ask: Decimal
-    last: Decimal
-    volume: Decimal
+    bid: float
+    ask: float
+    last: float
+    volume: float
     timestamp: datetime
 
 
@@ -83,36 +82,36 @@ class Trade:
     timestamp: datetime
 
 
-class BaseExchange(ABC):
-    """Abstract base class for exchange integrations."""
+def to_order_decimal(value) -> Decimal:
+    """Promote a float price/quantity to Decimal for order placement."""
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(repr(float(value)))
+
+
+class BaseExchange(Protocol):
+    """Common interface for exchange integrations (structural, no runtime ABC checks)."""
+    
+    name: str
+    config: dict
+    connected: bool
     
-    def __init__(self, name: str, config: dict):
-        """Initialize base exchange."""
-        self.name = name
-        self.config = config
-        self.connected = False
-        
-    @abstractmethod
     async def connect(self) -> bool:
         """Establish connection to the exchange."""
-        pass
+        ...
     
-    @abstractmethod
     async def disconnect(self) -> None:
         """Disconnect from the exchange."""
-        pass
+        ...
     
-    @abstractmethod
     async def get_ticker(self, symbol: str) -> Optional[Ticker]:
         """Get current ticker data for a symbol."""
-        pass
+        ...
     
-    @abstractmethod
     async def get_balance(self, asset: str) -> Optional[Balance]:
         """Get balance for a specific asset."""
-        pass
+        ...
     
-    @abstractmethod
     async def place_order(
         self,
         symbol: str,
@@ -122,4 +121,4 @@ class BaseExchange(ABC):
         price: Optional[Decimal] = None
     ) -> Optional[Order]:
         """Place an order on the exchange."""
-        pass
+        ...
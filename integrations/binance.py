@@ -9,17 +9,19 @@ from datetime import datetime
 from decimal import Decimal
 
 from integrations.base import (
-    BaseExchange, Ticker, Balance, Order,
-    OrderSide, OrderType, OrderStatus
+    Ticker, Balance, Order,
+    OrderSide, OrderType, OrderStatus, to_order_decimal
 )
 
 
-class BinanceExchange(BaseExchange):
+class BinanceExchange:
     """Binance spot market implementation."""
     
     def __init__(self, config: dict):
         """Initialize Binance exchange."""
-        super().__init__("Binance", config)
+        self.name = "Binance"
+        self.config = config
+        self.connected = False
         self.api_key = config.get("binance_api_key")
         self.api_secret = config.get("binance_secret_key")
         self.testnet = config.get("mode") == "TESTNET"
@@ -40,10 +42,10 @@ class BinanceExchange(BaseExchange):
         # TODO: Implement ticker fetching
         return Ticker(
             symbol=symbol,
-            bid=Decimal("100.50"),
-            ask=Decimal("100.60"),
-            last=Decimal("100.55"),
-            volume=Decimal("1000000"),
+            bid=100.5,
+            ask=100.6,
+            last=100.55,
+            volume=1000000.0,
             timestamp=datetime.now()
         )
     
@@ -67,6 +69,9 @@ class BinanceExchange(BaseExchange):
     ) -> Optional[Order]:
         """Place an order on Binance."""
         # TODO: Implement order placement
+        quantity = to_order_decimal(quantity)
+        if price is not None:
+            price = to_order_decimal(price)
         return Order(
             id="123456",
             symbol=symbol,
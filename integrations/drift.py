@@ -9,17 +9,19 @@ from datetime import datetime
 from decimal import Decimal
 
 from integrations.base import (
-    BaseExchange, Ticker, Balance, Order,
-    OrderSide, OrderType, OrderStatus
+    Ticker, Balance, Order,
+    OrderSide, OrderType, OrderStatus, to_order_decimal
 )
 
 
-class DriftExchange(BaseExchange):
+class DriftExchange:
     """Drift Protocol perpetual futures implementation."""
     
     def __init__(self, config: dict):
         """Initialize Drift exchange."""
-        super().__init__("Drift", config)
+        self.name = "Drift"
+        self.config = config
+        self.connected = False
         self.private_key = config.get("drift_private_key")
         self.rpc_url = config.get("solana_rpc_url")
         
@@ -39,10 +41,10 @@ class DriftExchange(BaseExchange):
         # TODO: Implement ticker fetching
         return Ticker(
             symbol=symbol,
-            bid=Decimal("100.45"),
-            ask=Decimal("100.55"),
-            last=Decimal("100.50"),
-            volume=Decimal("5000000"),
+            bid=100.45,
+            ask=100.55,
+            last=100.50,
+            volume=5000000.0,
             timestamp=datetime.now()
         )
     
@@ -66,6 +68,9 @@ class DriftExchange(BaseExchange):
     ) -> Optional[Order]:
         """Place a perpetual futures order."""
         # TODO: Implement order placement
+        quantity = to_order_decimal(quantity)
+        if price is not None:
+            price = to_order_decimal(price)
         return Order(
             id="drift_123456",
             symbol=symbol,
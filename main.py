@@ -176,5 +176,12 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Use libuv-based event loop when available (not supported on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+        
     # Run the bot
     asyncio.run(main())
@@ -0,0 +1,71 @@
+"""
+Spread/profit kernels for ArbitrageDetector
+
+Build the ahead-of-time extension with ``python -m modules._arb_kernel``; the
+compiled ``_arb_kernel`` module then shadows this file on import. Without it
+the kernel below is used through numba.njit (or plain Python).
+"""
+import os
+
+import numpy as np
+
+from utils.jit import njit, NUMBA_AVAILABLE
+
+
+def _eval_spread(spot, perp, min_spread, total_fees, trade_size):
+    """Return (spread_percent, profit_usdt, is_hit) for one price pair."""
+    spread = (perp - spot) / spot * 100.0
+    if spread > min_spread + total_fees:
+        net = spread - total_fees
+        if net > 0.0:
+            return spread, net / 100.0 * trade_size, True
+    return spread, 0.0, False
+
+
+eval_spread = njit(cache=True, fastmath=True)(_eval_spread)
+
+
+def _scan_spreads(spot, perp, min_spread, total_fees, trade_size, spread_out, profit_out):
+    """Fill spread_out/profit_out for every pair in one pass; profit_out > 0 marks hits.
+    
+    Returns the number of hits.
+    """
+    threshold = min_spread + total_fees
+    hits = 0
+    for i in range(spot.shape[0]):
+        spread = (perp[i] - spot[i]) / spot[i] * 100.0
+        spread_out[i] = spread
+        net = spread - total_fees
+        if spread > threshold and net > 0.0:
+            profit_out[i] = net / 100.0 * trade_size
+            hits += 1
+        else:
+            profit_out[i] = 0.0
+    return hits
+
+
+def _scan_spreads_numpy(spot, perp, min_spread, total_fees, trade_size, spread_out, profit_out):
+    """Vectorized stand-in for _scan_spreads when numba is not installed."""
+    np.subtract(perp, spot, out=spread_out)
+    np.divide(spread_out, spot, out=spread_out)
+    np.multiply(spread_out, 100.0, out=spread_out)
+    np.subtract(spread_out, total_fees, out=profit_out)
+    np.multiply(profit_out, trade_size / 100.0, out=profit_out)
+    profit_out[(spread_out <= min_spread + total_fees) | (profit_out <= 0.0)] = 0.0
+    return int(np.count_nonzero(profit_out))
+
+
+if NUMBA_AVAILABLE:
+    scan_spreads = njit(cache=True, fastmath=True)(_scan_spreads)
+else:
+    scan_spreads = _scan_spreads_numpy
+
+
+if __name__ == "__main__":
+    from numba.pycc import CC
+
+    cc = CC("_arb_kernel")
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export("eval_spread", "Tuple((f8, f8, b1))(f8, f8, f8, f8, f8)")(_eval_spread)
+    cc.export("scan_spreads", "i8(f8[:], f8[:], f8, f8, f8, f8[:], f8[:])")(_scan_spreads)
+    cc.compile()
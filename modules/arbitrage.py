@@ -1,15 +1,25 @@
 """
 Arbitrage detection and opportunity tracking
 """
-from typing import Dict, Optional, List
-from datetime import datetime
+from typing import Deque, Dict, Optional, List, Sequence, Tuple
+from collections import deque
+from itertools import islice
+from datetime import datetime, timezone
+from time import time_ns
 from loguru import logger
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+import numpy as np
+from modules._arb_kernel import eval_spread as _eval_spread, scan_spreads as _scan_spreads
 
-@dataclass
+
+def _iso_from_ns(ns: int) -> str:
+    """Format an epoch-nanosecond timestamp the way datetime.utcnow().isoformat() did"""
+    return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+@dataclass(slots=True)
 class ArbitrageOpportunity:
     """Represents an arbitrage opportunity"""
-    timestamp: str
+    timestamp_ns: int
     spot_symbol: str
     perp_symbol: str
     spot_price: float
@@ -18,8 +28,37 @@ class ArbitrageOpportunity:
     potential_profit_usdt: float
     trade_size_usdt: float
     
+    def _reset(self, timestamp_ns: int, spot_symbol: str, perp_symbol: str,
+               spot_price: float, perp_price: float, spread_percent: float,
+               potential_profit_usdt: float, trade_size_usdt: float) -> "ArbitrageOpportunity":
+        """Overwrite every field in place (used when recycling pooled instances)"""
+        self.timestamp_ns = timestamp_ns
+        self.spot_symbol = spot_symbol
+        self.perp_symbol = perp_symbol
+        self.spot_price = spot_price
+        self.perp_price = perp_price
+        self.spread_percent = spread_percent
+        self.potential_profit_usdt = potential_profit_usdt
+        self.trade_size_usdt = trade_size_usdt
+        return self
+    
+    @property
+    def timestamp(self) -> str:
+        """UTC ISO timestamp, formatted on demand"""
+        return _iso_from_ns(self.timestamp_ns)
+    
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # Flat fields: direct attribute access instead of the recursive asdict()
+        return {
+            'timestamp': self.timestamp,
+            'spot_symbol': self.spot_symbol,
+            'perp_symbol': self.perp_symbol,
+            'spot_price': self.spot_price,
+            'perp_price': self.perp_price,
+            'spread_percent': self.spread_percent,
+            'potential_profit_usdt': self.potential_profit_usdt,
+            'trade_size_usdt': self.trade_size_usdt
+        }
 
 class ArbitrageDetector:
     """Detects and tracks arbitrage opportunities"""
@@ -34,9 +73,31 @@ class ArbitrageDetector:
         self.drift_fee_percent = 0.05   # 0.05% taker fee
         self.total_fees_percent = self.binance_fee_percent + self.drift_fee_percent
         
-        # Track opportunities
-        self.opportunities: List[ArbitrageOpportunity] = []
+        # Per-tick constants, computed once
+        self._min_spread = float(self.min_spread_percent)
+        self._fees = float(self.total_fees_percent)
+        self._trade_size = float(self.trade_size_usdt)
+        self._spread_threshold = self._min_spread + self._fees
+        
+        # Track opportunities: recent ones in a bounded window, lifetime stats as running totals
+        self.opportunities: Deque[ArbitrageOpportunity] = deque(maxlen=config.get('opportunity_history', 1000))
         self.total_opportunities = 0
+        self._sum_profits = 0.0
+        self._sum_spread = 0.0
+        self._best_opp: Optional[ArbitrageOpportunity] = None
+        # Instances evicted from the window, reused instead of allocating new ones
+        self._pool: List[ArbitrageOpportunity] = []
+        
+        # Scratch buffers for batch spread evaluation (resized to the pair count)
+        self._spread_buf = np.empty(0, dtype=np.float64)
+        self._profit_buf = np.empty(0, dtype=np.float64)
+        
+    def warm_up(self):
+        """Compile the spread kernels now rather than on the first live tick (no-op for the AOT build)"""
+        _eval_spread(100.0, 100.5, self._min_spread, self._fees, self._trade_size)
+        warm = np.full(8, 100.0)
+        _scan_spreads(warm, warm * 1.005, self._min_spread, self._fees, self._trade_size,
+                      np.empty(8), np.empty(8))
         
     def calculate_spread(self, spot_price: float, perp_price: float) -> float:
         """Calculate spread percentage"""
@@ -61,42 +122,103 @@ class ArbitrageDetector:
     ) -> Optional[ArbitrageOpportunity]:
         """Check if current prices present an arbitrage opportunity"""
         
-        # Calculate spread
-        spread_percent = self.calculate_spread(spot_price, perp_price)
+        # Perp at or below spot can never clear a positive threshold: skip the kernel call
+        if perp_price <= spot_price:
+            return None
+        
+        # Spread, profit after fees and threshold check (including fees) in one compiled call
+        spread_percent, potential_profit, is_hit = _eval_spread(
+            float(spot_price), float(perp_price),
+            self._min_spread, self._fees, self._trade_size
+        )
         
-        # Check if spread exceeds minimum threshold (including fees)
-        if spread_percent > (self.min_spread_percent + self.total_fees_percent):
-            # Calculate potential profit
-            potential_profit = self.calculate_profit(spread_percent, self.trade_size_usdt)
+        if is_hit:
+            return self._record_opportunity(
+                spot_symbol, perp_symbol, spot_price, perp_price,
+                spread_percent, potential_profit
+            )
             
-            if potential_profit > 0:
-                opportunity = ArbitrageOpportunity(
-                    timestamp=datetime.utcnow().isoformat(),
-                    spot_symbol=spot_symbol,
-                    perp_symbol=perp_symbol,
-                    spot_price=spot_price,
-                    perp_price=perp_price,
-                    spread_percent=spread_percent,
-                    potential_profit_usdt=potential_profit,
-                    trade_size_usdt=self.trade_size_usdt
-                )
-                
-                self.opportunities.append(opportunity)
-                self.total_opportunities += 1
-                
-                logger.success(
-                    f"🎯 ARBITRAGE OPPORTUNITY DETECTED! "
-                    f"Spread: {spread_percent:.3f}% | "
-                    f"Profit: ${potential_profit:.2f}"
-                )
-                
-                return opportunity
-                
         return None
         
+    def check_opportunities_batch(
+        self,
+        spot_prices: np.ndarray,
+        perp_prices: np.ndarray,
+        symbols: Sequence[Tuple[str, str]]
+    ) -> List[ArbitrageOpportunity]:
+        """Check many pairs at once; opportunities are only built for hits"""
+        spot_prices = np.ascontiguousarray(spot_prices, dtype=np.float64)
+        perp_prices = np.ascontiguousarray(perp_prices, dtype=np.float64)
+        n = spot_prices.shape[0]
+        if self._spread_buf.shape[0] != n:
+            self._spread_buf = np.empty(n, dtype=np.float64)
+            self._profit_buf = np.empty(n, dtype=np.float64)
+        spread, profit = self._spread_buf, self._profit_buf
+        
+        # Spread, threshold and profit for every pair in one compiled pass
+        if not _scan_spreads(spot_prices, perp_prices, self._min_spread, self._fees,
+                             self._trade_size, spread, profit):
+            return []
+        
+        opportunities = []
+        for i in np.flatnonzero(profit):
+            spot_symbol, perp_symbol = symbols[i]
+            opportunities.append(self._record_opportunity(
+                spot_symbol, perp_symbol,
+                float(spot_prices[i]), float(perp_prices[i]),
+                float(spread[i]), float(profit[i]),
+                in_batch=len(opportunities)
+            ))
+        return opportunities
+        
+    def _record_opportunity(
+        self,
+        spot_symbol: str,
+        perp_symbol: str,
+        spot_price: float,
+        perp_price: float,
+        spread_percent: float,
+        potential_profit: float,
+        in_batch: int = 0
+    ) -> ArbitrageOpportunity:
+        """Build and track a profitable opportunity
+        
+        in_batch is how many opportunities the current batch has already returned.
+        """
+        fields = (
+            time_ns(), spot_symbol, perp_symbol, spot_price, perp_price,
+            spread_percent, potential_profit, self.trade_size_usdt
+        )
+        if self._pool:
+            opportunity = self._pool.pop()._reset(*fields)
+        else:
+            opportunity = ArbitrageOpportunity(*fields)
+        
+        # Callers copy what they need on the same tick, so an instance leaving the
+        # window can be recycled unless it is still referenced as the best one, or
+        # was created in this batch (history shorter than the batch) and is still
+        # in the list being returned
+        history = self.opportunities
+        evicted = history[0] if len(history) == history.maxlen else None
+        history.append(opportunity)
+        if evicted is not None and evicted is not self._best_opp and in_batch < history.maxlen:
+            self._pool.append(evicted)
+        self.total_opportunities += 1
+        self._sum_profits += potential_profit
+        self._sum_spread += spread_percent
+        if self._best_opp is None or potential_profit > self._best_opp.potential_profit_usdt:
+            self._best_opp = opportunity
+        
+        logger.success(
+            "🎯 ARBITRAGE OPPORTUNITY DETECTED! Spread: {:.3f}% | Profit: ${:.2f}",
+            spread_percent, potential_profit
+        )
+        
+        return opportunity
+        
     def get_summary(self) -> Dict:
         """Get summary of detected opportunities"""
-        if not self.opportunities:
+        if not self.total_opportunities:
             return {
                 'total_opportunities': 0,
                 'potential_profits': 0,
@@ -104,14 +226,12 @@ class ArbitrageDetector:
                 'best_opportunity': None
             }
             
-        total_profits = sum(opp.potential_profit_usdt for opp in self.opportunities)
-        avg_spread = sum(opp.spread_percent for opp in self.opportunities) / len(self.opportunities)
-        best_opp = max(self.opportunities, key=lambda x: x.potential_profit_usdt)
+        recent = islice(self.opportunities, max(len(self.opportunities) - 5, 0), None)
         
         return {
             'total_opportunities': self.total_opportunities,
-            'potential_profits': total_profits,
-            'average_spread': avg_spread,
-            'best_opportunity': best_opp.to_dict() if best_opp else None,
-            'recent_opportunities': [opp.to_dict() for opp in self.opportunities[-5:]]
+            'potential_profits': self._sum_profits,
+            'average_spread': self._sum_spread / self.total_opportunities,
+            'best_opportunity': self._best_opp.to_dict() if self._best_opp else None,
+            'recent_opportunities': [opp.to_dict() for opp in recent]
         }
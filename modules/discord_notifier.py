@@ -1,12 +1,63 @@
 """
 Discord webhook notifications for the arbitrage bot
 """
+import asyncio
+import random
 import aiohttp
-import json
+from time import monotonic
 from typing import Dict, Optional
 from datetime import datetime
 from loguru import logger
 
+from utils import fastjson
+from utils.rate_limit import TokenBucket
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_utcnow = datetime.utcnow
+
+# Constant embed parts, built once and shared by every notification
+_FOOTER = {"text": "Drift-Binance Arbitrage Bot"}
+STARTUP_SKELETON = {
+    "title": "🚀 Arbitrage Bot Started",
+    "description": "Bot is now monitoring for arbitrage opportunities",
+    "color": 0x00ff00
+}
+OPPORTUNITY_SKELETON = {"title": "🎯 Arbitrage Opportunity Detected!", "color": 0xffa500}  # Orange
+TRADE_OPENED_SKELETON = {"title": "📈 Trade Opened", "color": 0x00ff00}  # Green
+TRADE_CLOSED_SKELETON = {"title": "📉 Trade Closed"}
+SUMMARY_SKELETON = {
+    "title": "📊 Performance Summary",
+    "description": "Current trading session statistics",
+    "color": 0x0099ff  # Blue
+}
+
+# Discord accepts up to 10 embeds per webhook call; bursts within this window share one POST
+MAX_EMBEDS_PER_POST = 10
+BATCH_WINDOW_SECONDS = 0.05
+_NOTHING = object()
+
+# Embed field layouts (name/inline fixed); sends only fill in the values
+def _inline_fields(*names) -> tuple:
+    return tuple({"name": name, "inline": True} for name in names)
+
+STARTUP_FIELDS = _inline_fields("Mode", "Min Spread", "Trade Size")
+OPPORTUNITY_FIELDS = _inline_fields("Pair", "Spread", "Profit")
+TRADE_FIELDS = _inline_fields("Trade ID", "Size", "P&L")
+SUMMARY_FIELDS = _inline_fields("Total Trades", "Win Rate", "Total P&L", "ROI", "Current Balance")
+
+
+def _fill(templates: tuple, *values) -> list:
+    """Copy the field templates, setting each value in order"""
+    return [{**template, "value": value} for template, value in zip(templates, values)]
+
+# Identical opportunity/trade alerts within this window are sent once
+DEDUP_TTL_SECONDS = 10.0
+DEDUP_MAX_KEYS = 1024
+
+# Discord's per-webhook limit: 5 requests per 2 seconds
+WEBHOOK_RATE = 5
+WEBHOOK_PER_SECONDS = 2.0
+
 class DiscordNotifier:
     """Handles Discord webhook notifications"""
     
@@ -14,6 +65,14 @@ class DiscordNotifier:
         self.webhook_url = webhook_url
         self.enabled = bool(webhook_url)
         self.session = None
+        self._connector = None
+        self._init_lock = asyncio.Lock()
+        # Sends are queued and posted by one background worker, started on first use
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._worker: Optional[asyncio.Task] = None
+        self._bucket = TokenBucket(rate=WEBHOOK_RATE, per=WEBHOOK_PER_SECONDS)
+        # Alert key -> monotonic expiry (insertion ordered, so oldest first)
+        self._recent_alerts: Dict[tuple, float] = {}
         
         if self.enabled:
             logger.info("Discord notifications enabled")
@@ -21,154 +80,247 @@ class DiscordNotifier:
             logger.warning("Discord webhook URL not configured - notifications disabled")
     
     async def initialize(self):
-        """Initialize aiohttp session"""
-        if self.enabled and not self.session:
-            self.session = aiohttp.ClientSession()
+        """Initialize aiohttp session (idempotent, safe under concurrent first sends)"""
+        if not self.enabled or self.session:
+            return
+        async with self._init_lock:
+            if self.session:
+                return
+            # Every post goes to the same webhook host: keep its TCP+TLS connection warm
+            self._connector = aiohttp.TCPConnector(
+                limit=10,
+                limit_per_host=10,
+                keepalive_timeout=75,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=self._connector,
+                timeout=aiohttp.ClientTimeout(total=5)
+            )
     
     async def send_message(self, content: str, username: str = "Arbitrage Bot") -> bool:
-        """Send a simple text message to Discord"""
+        """Queue a simple text message for Discord"""
         if not self.enabled:
             return False
             
-        try:
-            if not self.session:
-                await self.initialize()
-                
-            payload = {
-                "content": content,
-                "username": username
-            }
-            
-            async with self.session.post(self.webhook_url, json=payload) as response:
-                if response.status == 204:
-                    logger.debug("Discord message sent successfully")
-                    return True
-                else:
-                    logger.error(f"Discord webhook failed: {response.status}")
-                    text = await response.text()
-                    logger.error(f"Response: {text}")
-                    return False
-                    
-        except Exception as e:
-            logger.error(f"Error sending Discord message: {e}")
-            return False
+        payload = {
+            "content": content,
+            "username": username
+        }
+        return self._enqueue(payload)
     
     async def send_embed(self, title: str, description: str, color: int = 0x00ff00, 
                         fields: Optional[list] = None, username: str = "Arbitrage Bot") -> bool:
-        """Send an embedded message to Discord"""
+        """Queue an embedded message for Discord"""
+        return self._queue_embed(
+            {"title": title, "description": description, "color": color},
+            fields, username=username
+        )
+    
+    def _queue_embed(self, skeleton: Dict, fields: Optional[list] = None,
+                     username: str = "Arbitrage Bot", **dynamic) -> bool:
+        """Queue an embed built from a constant skeleton plus the per-call parts"""
         if not self.enabled:
             return False
             
-        try:
-            if not self.session:
-                await self.initialize()
-                
-            embed = {
-                "title": title,
-                "description": description,
-                "color": color,
-                "timestamp": datetime.utcnow().isoformat(),
-                "footer": {
-                    "text": "Drift-Binance Arbitrage Bot"
-                }
-            }
-            
-            if fields:
-                embed["fields"] = fields
-                
-            payload = {
-                "username": username,
-                "embeds": [embed]
-            }
+        embed = {**skeleton, **dynamic, "timestamp": _utcnow().isoformat(), "footer": _FOOTER}
+        if fields:
+            embed["fields"] = fields
             
-            async with self.session.post(self.webhook_url, json=payload) as response:
-                if response.status == 204:
-                    logger.debug("Discord embed sent successfully")
-                    return True
-                else:
-                    logger.error(f"Discord webhook failed: {response.status}")
-                    return False
-                    
-        except Exception as e:
-            logger.error(f"Error sending Discord embed: {e}")
+        payload = {
+            "username": username,
+            "embeds": [embed]
+        }
+        return self._enqueue(payload)
+    
+    def _is_duplicate(self, key: tuple) -> bool:
+        """True if the same alert went out within DEDUP_TTL_SECONDS; otherwise remember it"""
+        now = monotonic()
+        expiry = self._recent_alerts.get(key)
+        if expiry is not None and expiry > now:
+            return True
+        if len(self._recent_alerts) >= DEDUP_MAX_KEYS:
+            self._recent_alerts = {k: v for k, v in self._recent_alerts.items() if v > now}
+            while len(self._recent_alerts) >= DEDUP_MAX_KEYS:
+                del self._recent_alerts[next(iter(self._recent_alerts))]
+        self._recent_alerts[key] = now + DEDUP_TTL_SECONDS
+        return False
+    
+    def _enqueue(self, payload: Dict) -> bool:
+        """Hand a payload to the background sender; returns without waiting on HTTP"""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._drain())
+        try:
+            self._queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            logger.warning("Discord queue full - dropping notification")
             return False
     
+    async def _drain(self):
+        """Background worker: post queued payloads until the close() sentinel arrives"""
+        carry = _NOTHING
+        while True:
+            payload = await self._queue.get() if carry is _NOTHING else carry
+            carry = _NOTHING
+            if payload is None:
+                return
+            if "embeds" in payload:
+                payload, carry = await self._batch_embeds(payload)
+            await self._post(payload)
+    
+    async def _batch_embeds(self, first: Dict):
+        """Merge embed payloads queued within the batch window into one POST.
+        
+        Returns the merged payload and the first payload that could not be merged
+        (different username, plain message, sentinel or over the embed limit), if any.
+        """
+        loop = asyncio.get_running_loop()
+        embeds = list(first["embeds"])
+        deadline = loop.time() + BATCH_WINDOW_SECONDS
+        carry = _NOTHING
+        while len(embeds) < MAX_EMBEDS_PER_POST:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                nxt = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if (nxt is None or "embeds" not in nxt or nxt["username"] != first["username"]
+                    or len(embeds) + len(nxt["embeds"]) > MAX_EMBEDS_PER_POST):
+                carry = nxt
+                break
+            embeds.extend(nxt["embeds"])
+        return {"username": first["username"], "embeds": embeds}, carry
+    
+    async def _post(self, payload: Dict, attempts: int = 3) -> bool:
+        """POST one payload within the webhook rate limit, retrying 429s and transient errors"""
+        # Serialize once (orjson when available) and post raw bytes: no per-attempt
+        # re-encoding through aiohttp's json= path
+        body = fastjson.dumps(payload)
+        url = self.webhook_url
+        acquire = self._bucket.acquire
+        delay = 0.5
+        for attempt in range(1, attempts + 1):
+            await acquire()
+            try:
+                if not self.session:
+                    await self.initialize()
+                post = self.session.post
+                    
+                async with post(url, data=body, headers=_JSON_HEADERS) as response:
+                    headers = response.headers
+                    if "X-RateLimit-Remaining" in headers:
+                        self._bucket.sync(
+                            int(headers["X-RateLimit-Remaining"]),
+                            float(headers.get("X-RateLimit-Reset-After", 0))
+                        )
+                        
+                    if response.status == 204:
+                        logger.debug("Discord message sent successfully")
+                        return True
+                    if response.status == 429:
+                        # The bucket holds the next acquire() for Discord's retry_after
+                        hint = await response.json(content_type=None) or {}
+                        retry_after = float(hint.get("retry_after") or headers.get("Retry-After") or delay)
+                        logger.warning(f"Discord rate limited, retrying in {retry_after:.2f}s")
+                        self._bucket.block_for(retry_after)
+                        continue
+                    if response.status < 500:
+                        logger.error(f"Discord webhook failed: {response.status}")
+                        text = await response.text()
+                        logger.error(f"Response: {text}")
+                        return False
+                    logger.warning(f"Discord webhook failed: {response.status} (attempt {attempt}/{attempts})")
+                    if "Retry-After" in headers:
+                        self._bucket.block_for(float(headers["Retry-After"]))
+                    
+            except Exception as e:
+                logger.error(f"Error sending Discord message: {e}")
+                
+            if attempt < attempts:
+                # Exponential backoff with jitter so retries do not line up
+                await asyncio.sleep(delay + random.random() * 0.3)
+                delay *= 2
+        return False
+    
     async def send_startup_notification(self, config: Dict) -> bool:
         """Send bot startup notification"""
-        fields = [
-            {"name": "Mode", "value": config.get('mode', 'Unknown'), "inline": True},
-            {"name": "Min Spread", "value": f"{config.get('min_spread_percent', 0)}%", "inline": True},
-            {"name": "Trade Size", "value": f"${config.get('trade_size_usdt', 0)}", "inline": True}
-        ]
-        
-        return await self.send_embed(
-            title="🚀 Arbitrage Bot Started",
-            description="Bot is now monitoring for arbitrage opportunities",
-            color=0x00ff00,
-            fields=fields
+        fields = _fill(
+            STARTUP_FIELDS,
+            config.get('mode', 'Unknown'),
+            f"{config.get('min_spread_percent', 0)}%",
+            f"${config.get('trade_size_usdt', 0)}"
         )
+        
+        return self._queue_embed(STARTUP_SKELETON, fields)
     
     async def send_opportunity_alert(self, opportunity: Dict) -> bool:
         """Send arbitrage opportunity alert"""
-        fields = [
-            {"name": "Pair", "value": opportunity.get('spot_symbol', 'Unknown'), "inline": True},
-            {"name": "Spread", "value": f"{opportunity.get('spread_percent', 0):.3f}%", "inline": True},
-            {"name": "Profit", "value": f"${opportunity.get('potential_profit_usdt', 0):.2f}", "inline": True}
-        ]
+        # Same pair at the same spread (to the basis point) re-triggers as prices wiggle
+        key = ('opportunity', opportunity.get('spot_symbol'), round(opportunity.get('spread_percent', 0) * 100))
+        if self._is_duplicate(key):
+            return False
+            
+        fields = _fill(
+            OPPORTUNITY_FIELDS,
+            opportunity.get('spot_symbol', 'Unknown'),
+            f"{opportunity.get('spread_percent', 0):.3f}%",
+            f"${opportunity.get('potential_profit_usdt', 0):.2f}"
+        )
         
-        return await self.send_embed(
-            title="🎯 Arbitrage Opportunity Detected!",
-            description=f"Profitable spread found on {opportunity.get('spot_symbol', 'Unknown')}",
-            color=0xffa500,  # Orange
-            fields=fields
+        return self._queue_embed(
+            OPPORTUNITY_SKELETON, fields,
+            description=f"Profitable spread found on {opportunity.get('spot_symbol', 'Unknown')}"
         )
     
     async def send_trade_notification(self, trade: Dict, action: str = "opened") -> bool:
         """Send trade execution notification"""
+        if self._is_duplicate(('trade', trade.get('id'), action)):
+            return False
+            
         if action == "opened":
-            title = "📈 Trade Opened"
-            color = 0x00ff00  # Green
+            skeleton = TRADE_OPENED_SKELETON
+            color = skeleton["color"]
         else:
-            title = "📉 Trade Closed"
+            skeleton = TRADE_CLOSED_SKELETON
             color = 0xff0000 if trade.get('actual_profit', 0) < 0 else 0x00ff00
             
-        fields = [
-            {"name": "Trade ID", "value": f"#{trade.get('id', 'Unknown')}", "inline": True},
-            {"name": "Size", "value": f"${trade.get('trade_size_usdt', 0)}", "inline": True}
-        ]
-        
+        values = [f"#{trade.get('id', 'Unknown')}", f"${trade.get('trade_size_usdt', 0)}"]
         if action == "closed":
-            fields.append({
-                "name": "P&L", 
-                "value": f"${trade.get('actual_profit', 0):.2f}", 
-                "inline": True
-            })
+            values.append(f"${trade.get('actual_profit', 0):.2f}")
+        fields = _fill(TRADE_FIELDS, *values)
             
-        return await self.send_embed(
-            title=title,
+        return self._queue_embed(
+            skeleton, fields,
             description=f"Trade {action} for {trade.get('spot_symbol', 'Unknown')}",
-            color=color,
-            fields=fields
+            color=color
         )
     
     async def send_summary(self, stats: Dict) -> bool:
         """Send performance summary"""
-        fields = [
-            {"name": "Total Trades", "value": str(stats.get('total_trades', 0)), "inline": True},
-            {"name": "Win Rate", "value": f"{stats.get('win_rate', 0):.1f}%", "inline": True},
-            {"name": "Total P&L", "value": f"${stats.get('total_profit', 0):.2f}", "inline": True},
-            {"name": "ROI", "value": f"{stats.get('roi', 0):.2f}%", "inline": True},
-            {"name": "Current Balance", "value": f"${stats.get('current_balance', 0):.2f}", "inline": True}
-        ]
-        
-        return await self.send_embed(
-            title="📊 Performance Summary",
-            description="Current trading session statistics",
-            color=0x0099ff,  # Blue
-            fields=fields
+        fields = _fill(
+            SUMMARY_FIELDS,
+            str(stats.get('total_trades', 0)),
+            f"{stats.get('win_rate', 0):.1f}%",
+            f"${stats.get('total_profit', 0):.2f}",
+            f"{stats.get('roi', 0):.2f}%",
+            f"${stats.get('current_balance', 0):.2f}"
         )
+        
+        return self._queue_embed(SUMMARY_SKELETON, fields)
     
     async def close(self):
-        """Close aiohttp session"""
+        """Flush queued notifications, then close aiohttp session and its connector"""
+        if self._worker:
+            await self._queue.put(None)
+            await self._worker
+            self._worker = None
         if self.session:
             await self.session.close()
+            self.session = None
+        if self._connector:
+            await self._connector.close()
+            self._connector = None
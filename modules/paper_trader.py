@@ -1,14 +1,20 @@
 """
 Paper trading simulator for tracking virtual trades
 """
-import json
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime
 from loguru import logger
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from modules.arbitrage import ArbitrageOpportunity
+from utils import fastjson
 
-@dataclass
+# Trade events queued within this window are written in one background flush
+SAVE_DEBOUNCE_SECONDS = 1.0
+
+@dataclass(slots=True)
 class PaperTrade:
     """Represents a paper trade"""
     id: int
@@ -26,6 +32,11 @@ class PaperTrade:
     actual_profit: Optional[float] = None
     close_timestamp: Optional[str] = None
     
+    def to_dict(self) -> Dict:
+        return {f: getattr(self, f) for f in _PAPER_TRADE_FIELDS}
+
+_PAPER_TRADE_FIELDS = tuple(f.name for f in fields(PaperTrade))
+
 class PaperTrader:
     """Simulates trade execution and tracks performance"""
     
@@ -35,47 +46,148 @@ class PaperTrader:
         self.balance = self.initial_balance
         self.trades: List[PaperTrade] = []
         self.open_trades: Dict[int, PaperTrade] = {}
+        self.open_count = 0  # len(open_trades), maintained on open/close
         self.trade_counter = 0
+        # Running aggregates over closed trades for O(1) summaries
+        self._closed_count = 0
+        self._total_profit = 0.0
+        self._winning_count = 0
         
-        # Load existing trades if any
-        self.trades_file = 'data/paper_trades.json'
+        # Trade events are appended as JSON lines (latest line per id wins);
+        # balance and counter live in a small state file
+        self.events_file = 'data/paper_trades.jsonl'
+        self.state_file = 'data/paper_state.json'
+        self.legacy_trades_file = 'data/paper_trades.json'
+        
+        # Pending event lines, flushed off the event loop on a single IO thread
+        # (one worker keeps appends in order)
+        self._pending_events: List[bytes] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="paper-io")
         self.load_trades()
         
     def load_trades(self):
-        """Load trades from file"""
+        """Load trades by replaying the event log (or the legacy snapshot file)"""
         try:
-            if os.path.exists(self.trades_file):
-                with open(self.trades_file, 'r') as f:
-                    data = json.load(f)
-                    self.balance = data.get('balance', self.initial_balance)
-                    self.trade_counter = data.get('trade_counter', 0)
-                    # Convert trades back to PaperTrade objects
-                    self.trades = [PaperTrade(**trade) for trade in data.get('trades', [])]
-                    logger.info(f"Loaded {len(self.trades)} existing trades. Balance: ${self.balance:.2f}")
+            if not os.path.exists(self.events_file):
+                if os.path.exists(self.legacy_trades_file):
+                    self._migrate_legacy()
+                    self._index_open_trades()
+                return
+                
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'rb') as f:
+                    state = fastjson.loads(f.read())
+                self.balance = state.get('balance', self.initial_balance)
+                self.trade_counter = state.get('trade_counter', 0)
+                
+            latest: Dict[int, PaperTrade] = {}
+            with open(self.events_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        trade = PaperTrade(**fastjson.loads(line))
+                        latest[trade.id] = trade
+                        
+            self.trades = list(latest.values())
+            self._index_open_trades()
+            logger.info(f"Loaded {len(self.trades)} existing trades. Balance: ${self.balance:.2f}")
         except Exception as e:
             logger.error(f"Error loading trades: {e}")
             
-    def save_trades(self):
-        """Save trades to file"""
+    def _index_open_trades(self):
+        """Rebuild open_trades/open_count and the closed-trade aggregates from the loaded trades"""
+        self.open_trades = {t.id: t for t in self.trades if t.status == "OPEN"}
+        self.open_count = len(self.open_trades)
+        self._closed_count = self._winning_count = 0
+        self._total_profit = 0.0
+        for t in self.trades:
+            if t.status == "CLOSED":
+                self._record_close(t.actual_profit)
+                
+    def _record_close(self, actual_profit: Optional[float]):
+        self._closed_count += 1
+        if actual_profit:
+            self._total_profit += actual_profit
+            if actual_profit > 0:
+                self._winning_count += 1
+        
+    def _migrate_legacy(self):
+        """Import the old single-file snapshot and rewrite it as event log + state"""
+        with open(self.legacy_trades_file, 'rb') as f:
+            data = fastjson.loads(f.read())
+        self.balance = data.get('balance', self.initial_balance)
+        self.trade_counter = data.get('trade_counter', 0)
+        # Convert trades back to PaperTrade objects
+        self.trades = [PaperTrade(**trade) for trade in data.get('trades', [])]
+        
+        os.makedirs('data', exist_ok=True)
+        with open(self.events_file, 'wb') as f:
+            for trade in self.trades:
+                f.write(fastjson.dumps(trade) + b"\n")
+        self.save_state()
+        logger.info(f"Loaded {len(self.trades)} existing trades. Balance: ${self.balance:.2f}")
+        
+    def _state(self) -> Dict:
+        return {
+            'balance': self.balance,
+            'trade_counter': self.trade_counter,
+            'last_updated': datetime.utcnow().isoformat()
+        }
+        
+    def _write(self, lines: List[bytes], state: Dict):
+        """Append event lines and replace the state file (runs on the IO thread)"""
         try:
             os.makedirs('data', exist_ok=True)
-            data = {
-                'balance': self.balance,
-                'trade_counter': self.trade_counter,
-                'trades': [asdict(trade) for trade in self.trades],
-                'last_updated': datetime.utcnow().isoformat()
-            }
-            with open(self.trades_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            if lines:
+                with open(self.events_file, 'ab') as f:
+                    f.write(b"".join(lines))
+            tmp = self.state_file + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(fastjson.dumps(state))
+            os.replace(tmp, self.state_file)
         except Exception as e:
             logger.error(f"Error saving trades: {e}")
             
-    def execute_trade(self, opportunity: Dict) -> Optional[PaperTrade]:
+    def save_state(self):
+        """Write balance and trade counter"""
+        self._write([], self._state())
+        
+    def _take_pending(self):
+        lines, self._pending_events = self._pending_events, []
+        return lines, self._state()
+        
+    def save_trades(self, trade: PaperTrade):
+        """Queue one trade event; inside an event loop writes are debounced to the IO thread"""
+        # Dataclasses serialize directly, no asdict() copy
+        self._pending_events.append(fastjson.dumps(trade) + b"\n")
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, backtests): write straight away
+            self._write(*self._take_pending())
+            return
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(SAVE_DEBOUNCE_SECONDS, self._flush_later, loop)
+            
+    def _flush_later(self, loop: asyncio.AbstractEventLoop):
+        self._flush_handle = None
+        loop.run_in_executor(self._io_pool, self._write, *self._take_pending())
+        
+    async def flush(self):
+        """Write anything still pending and wait for it (call on shutdown)"""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        loop = asyncio.get_running_loop()
+        # Queued behind any in-flight flush on the single IO thread
+        await loop.run_in_executor(self._io_pool, self._write, *self._take_pending())
+            
+    def execute_trade(self, opportunity: ArbitrageOpportunity) -> Optional[PaperTrade]:
         """Execute a paper trade based on opportunity"""
         
         # Check if we have enough balance
-        if self.balance < opportunity['trade_size_usdt']:
-            logger.warning(f"Insufficient balance: ${self.balance:.2f} < ${opportunity['trade_size_usdt']}")
+        if self.balance < opportunity.trade_size_usdt:
+            logger.warning(f"Insufficient balance: ${self.balance:.2f} < ${opportunity.trade_size_usdt}")
             return None
             
         # Create trade
@@ -83,13 +195,13 @@ class PaperTrader:
         trade = PaperTrade(
             id=self.trade_counter,
             timestamp=datetime.utcnow().isoformat(),
-            spot_symbol=opportunity['spot_symbol'],
-            perp_symbol=opportunity['perp_symbol'],
-            spot_price=opportunity['spot_price'],
-            perp_price=opportunity['perp_price'],
-            trade_size_usdt=opportunity['trade_size_usdt'],
-            spread_percent=opportunity['spread_percent'],
-            expected_profit=opportunity['potential_profit_usdt']
+            spot_symbol=opportunity.spot_symbol,
+            perp_symbol=opportunity.perp_symbol,
+            spot_price=opportunity.spot_price,
+            perp_price=opportunity.perp_price,
+            trade_size_usdt=opportunity.trade_size_usdt,
+            spread_percent=opportunity.spread_percent,
+            expected_profit=opportunity.potential_profit_usdt
         )
         
         # Deduct from balance (simulating capital in use)
@@ -98,6 +210,7 @@ class PaperTrader:
         # Add to trades
         self.trades.append(trade)
         self.open_trades[trade.id] = trade
+        self.open_count += 1
         
         logger.info(
             f"📝 PAPER TRADE #{trade.id} EXECUTED | "
@@ -106,7 +219,7 @@ class PaperTrader:
             f"Balance: ${self.balance:.2f}"
         )
         
-        self.save_trades()
+        self.save_trades(trade)
         return trade
         
     def close_trade(self, trade_id: int, current_spot: float, current_perp: float) -> Optional[float]:
@@ -142,6 +255,8 @@ class PaperTrader:
         
         # Remove from open trades
         del self.open_trades[trade_id]
+        self.open_count -= 1
+        self._record_close(actual_profit)
         
         # Log result
         emoji = "✅" if actual_profit > 0 else "❌"
@@ -152,14 +267,14 @@ class PaperTrader:
             f"Balance: ${self.balance:.2f}"
         )
         
-        self.save_trades()
+        self.save_trades(trade)
         return actual_profit
         
     def get_performance_summary(self) -> Dict:
         """Get trading performance summary"""
-        closed_trades = [t for t in self.trades if t.status == "CLOSED"]
+        closed = self._closed_count
         
-        if not closed_trades:
+        if not closed:
             return {
                 'total_trades': len(self.trades),
                 'closed_trades': 0,
@@ -170,16 +285,12 @@ class PaperTrader:
                 'current_balance': self.balance
             }
             
-        # Calculate metrics
-        total_profit = sum(t.actual_profit for t in closed_trades if t.actual_profit)
-        winning_trades = [t for t in closed_trades if t.actual_profit and t.actual_profit > 0]
-        
         return {
             'total_trades': len(self.trades),
-            'closed_trades': len(closed_trades),
+            'closed_trades': closed,
             'open_trades': len(self.open_trades),
-            'total_profit': total_profit,
-            'win_rate': len(winning_trades) / len(closed_trades) * 100 if closed_trades else 0,
+            'total_profit': self._total_profit,
+            'win_rate': self._winning_count / closed * 100,
             'roi': (self.balance - self.initial_balance) / self.initial_balance * 100,
             'current_balance': self.balance,
             'initial_balance': self.initial_balance
@@ -1,12 +1,20 @@
 """
 Real-time performance monitoring and profitability analysis
 """
-import json
+import asyncio
 import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+import numpy as np
 from loguru import logger
+from utils import fastjson
+
+# At most one metrics file write per this interval while the event loop is running
+SAVE_DEBOUNCE_SECONDS = 1.0
 
 @dataclass
 class PerformanceMetrics:
@@ -79,9 +87,27 @@ class PerformanceMonitor:
         self.metrics = PerformanceMetrics()
         self.start_time = datetime.utcnow()
         self.metrics_file = 'data/performance_metrics.json'
-        self.hourly_snapshots = []
-        self.balance_history = [initial_balance]
+        self.hourly_snapshots = deque(maxlen=168)  # 1 week of hourly snapshots
+        # Balance history in a preallocated buffer (doubled when full)
+        self._bh = np.empty(16384, dtype=np.float64)
+        self._bh[0] = initial_balance
+        self._n = 1
+        self._current_balance = float(initial_balance)
+        # Welford running mean/variance of per-update returns
+        self._ret_count = 0
+        self._ret_mean = 0.0
+        self._ret_m2 = 0.0
         self.peak_balance = initial_balance
+        # Running gross wins/losses for the profit factor
+        self._gross_wins = 0.0
+        self._gross_losses = 0.0
+        
+        # Debounced persistence: record_trade marks the metrics dirty, a lazily
+        # started flusher writes them on a single IO thread
+        self._dirty = False
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metrics-io")
+        self._write_lock = threading.Lock()
         
         # Load existing metrics
         self.load_metrics()
@@ -90,32 +116,85 @@ class PerformanceMonitor:
         """Load historical metrics from file"""
         try:
             if os.path.exists(self.metrics_file):
-                with open(self.metrics_file, 'r') as f:
-                    data = json.load(f)
+                with open(self.metrics_file, 'rb') as f:
+                    data = fastjson.loads(f.read())
                     # Restore key metrics
                     if 'metrics' in data:
                         m = data['metrics']
                         self.metrics.total_opportunities = m.get('trading', {}).get('total_opportunities', 0)
                         self.metrics.total_trades = m.get('trading', {}).get('total_trades', 0)
                         # ... restore other metrics
+                    self.hourly_snapshots.extend(data.get('hourly_snapshots', []))
                     logger.info("Loaded historical performance metrics")
         except Exception as e:
             logger.error(f"Error loading metrics: {e}")
             
-    def save_metrics(self):
-        """Save metrics to file"""
+    def _metrics_data(self) -> Dict:
+        return {
+            'metrics': self.metrics.to_dict(),
+            'hourly_snapshots': list(self.hourly_snapshots),
+            'last_updated': datetime.utcnow().isoformat()
+        }
+        
+    def _write(self, data: Dict):
         try:
             os.makedirs('data', exist_ok=True)
-            data = {
-                'metrics': self.metrics.to_dict(),
-                'hourly_snapshots': self.hourly_snapshots[-168:],  # Keep 1 week
-                'last_updated': datetime.utcnow().isoformat()
-            }
-            with open(self.metrics_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            payload = fastjson.dumps(data, indent=True)
+            with self._write_lock, open(self.metrics_file, 'wb') as f:
+                f.write(payload)
         except Exception as e:
             logger.error(f"Error saving metrics: {e}")
             
+    def save_metrics(self):
+        """Save metrics to file"""
+        self._dirty = False
+        self._write(self._metrics_data())
+        
+    def mark_dirty(self):
+        """Schedule a save: debounced inside an event loop, immediate otherwise"""
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop in this thread (scripts, executor jobs): write now
+            self.save_metrics()
+            return
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = loop.create_task(self._flusher())
+            
+    async def _flusher(self):
+        """Write dirty metrics at most once per SAVE_DEBOUNCE_SECONDS; exits once clean"""
+        loop = asyncio.get_running_loop()
+        while self._dirty:
+            await asyncio.sleep(SAVE_DEBOUNCE_SECONDS)
+            if self._dirty:
+                self._dirty = False
+                await loop.run_in_executor(self._io_pool, self._write, self._metrics_data())
+                
+    async def flush(self):
+        """Write pending metrics now and stop the flusher (call on shutdown)"""
+        if self._flusher_task and not self._flusher_task.done():
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+        self._flusher_task = None
+        if self._dirty:
+            self._dirty = False
+            loop = asyncio.get_running_loop()
+            # Queued behind any write the flusher already handed to the IO thread
+            await loop.run_in_executor(self._io_pool, self._write, self._metrics_data())
+            
+    @property
+    def balance_history(self) -> np.ndarray:
+        """Balances recorded so far (view into the buffer)"""
+        return self._bh[:self._n]
+        
+    @property
+    def current_balance(self) -> float:
+        return self._current_balance
+        
     def record_opportunity(self, spread: float, potential_profit: float):
         """Record an arbitrage opportunity"""
         self.metrics.total_opportunities += 1
@@ -138,20 +217,36 @@ class PerformanceMonitor:
         if net_profit > 0:
             self.metrics.profitable_trades += 1
             self.metrics.largest_win = max(self.metrics.largest_win, net_profit)
+            self._gross_wins += net_profit
         else:
             self.metrics.losing_trades += 1
             self.metrics.largest_loss = min(self.metrics.largest_loss, net_profit)
+            self._gross_losses -= net_profit
             
         # Update derived metrics
         self.update_derived_metrics()
         self.update_risk_metrics(net_profit)
         
-        # Save after each trade
-        self.save_metrics()
+        # Save after each trade (debounced while the bot is running)
+        self.mark_dirty()
         
     def update_balance(self, new_balance: float):
         """Update current balance and track drawdown"""
-        self.balance_history.append(new_balance)
+        if self._n == self._bh.shape[0]:
+            grown = np.empty(self._n * 2, dtype=np.float64)
+            grown[:self._n] = self._bh
+            self._bh = grown
+        prev = self._current_balance
+        self._bh[self._n] = new_balance
+        self._n += 1
+        self._current_balance = float(new_balance)
+        
+        if prev:
+            r = (new_balance - prev) / prev
+            self._ret_count += 1
+            delta = r - self._ret_mean
+            self._ret_mean += delta / self._ret_count
+            self._ret_m2 += delta * (r - self._ret_mean)
         
         # Update peak balance
         if new_balance > self.peak_balance:
@@ -169,18 +264,15 @@ class PerformanceMonitor:
             self.metrics.win_rate = (self.metrics.profitable_trades / self.metrics.total_trades) * 100
             self.metrics.average_profit_per_trade = self.metrics.total_net_profit / self.metrics.total_trades
             
-        # Profit factor
-        total_wins = self.metrics.profitable_trades * abs(self.metrics.largest_win) if self.metrics.largest_win else 0
-        total_losses = self.metrics.losing_trades * abs(self.metrics.largest_loss) if self.metrics.largest_loss else 0
-        
-        if total_losses > 0:
-            self.metrics.profit_factor = total_wins / total_losses
+        # Profit factor: gross wins over gross losses
+        if self._gross_losses > 0:
+            self.metrics.profit_factor = self._gross_wins / self._gross_losses
         else:
-            self.metrics.profit_factor = total_wins
+            self.metrics.profit_factor = self._gross_wins
             
         # ROI
         if self.initial_balance > 0:
-            current_balance = self.balance_history[-1] if self.balance_history else self.initial_balance
+            current_balance = self.current_balance
             self.metrics.roi_percentage = ((current_balance - self.initial_balance) / self.initial_balance) * 100
             
     def update_time_metrics(self):
@@ -194,31 +286,24 @@ class PerformanceMonitor:
             
     def update_risk_metrics(self, last_profit: float):
         """Update risk metrics including Sharpe ratio"""
-        # Simple Sharpe ratio calculation
-        if len(self.balance_history) > 2:
-            returns = []
-            for i in range(1, len(self.balance_history)):
-                daily_return = (self.balance_history[i] - self.balance_history[i-1]) / self.balance_history[i-1]
-                returns.append(daily_return)
-                
-            if returns:
-                import numpy as np
-                avg_return = np.mean(returns)
-                std_return = np.std(returns)
-                
-                if std_return > 0:
-                    # Annualized Sharpe ratio (assuming 24/7 trading)
-                    self.metrics.sharpe_ratio = (avg_return * 365) / (std_return * np.sqrt(365))
+        # Simple Sharpe ratio from the running return statistics (O(1) per trade)
+        if self._ret_count > 1:
+            avg_return = self._ret_mean
+            std_return = np.sqrt(self._ret_m2 / self._ret_count)  # population std, as np.std
+            
+            if std_return > 0:
+                # Annualized Sharpe ratio (assuming 24/7 trading)
+                self.metrics.sharpe_ratio = float((avg_return * 365) / (std_return * np.sqrt(365)))
                     
     def take_hourly_snapshot(self):
         """Take a snapshot of current metrics"""
         snapshot = {
             'timestamp': datetime.utcnow().isoformat(),
             'metrics': self.metrics.to_dict(),
-            'balance': self.balance_history[-1] if self.balance_history else self.initial_balance
+            'balance': self.current_balance
         }
         self.hourly_snapshots.append(snapshot)
-        self.save_metrics()
+        self.mark_dirty()
         
     def get_profitability_report(self) -> Dict:
         """Generate comprehensive profitability report"""
@@ -3,11 +3,40 @@ Price monitoring for Binance spot and Drift perps
 Professional grade with proper error handling
 """
 import asyncio
+import json
+import random
+import sys
 import aiohttp
-from typing import Dict, Optional, Callable
-from datetime import datetime
+from collections import deque, namedtuple
+from time import monotonic
+from typing import Dict, List, Optional, Callable, Sequence, Tuple, Union
+from urllib.parse import quote
 from loguru import logger
 
+from utils import fastjson
+from utils.rate_limit import AIMDLimiter
+
+# Spot/perp symbol pair to monitor
+Pair = namedtuple("Pair", "spot perp")
+
+BINANCE_TICKER_URL = "https://api.binance.com/api/v3/ticker/price"
+BINANCE_WS_URL = "wss://stream.binance.com:9443/stream?streams="
+
+# bookTicker stream: prices older than this count as stale (REST takes over), and
+# more than WS_MAX_DISCONNECTS drops within WS_DISCONNECT_WINDOW disable the stream
+WS_STALE_SECONDS = 5.0
+WS_MAX_DISCONNECTS = 3
+WS_DISCONNECT_WINDOW = 60.0
+
+# Binance request pacing: pause once the reported 1m weight reaches the threshold,
+# and never send more than the per-minute request limit from this process
+WEIGHT_PAUSE_THRESHOLD = 1000
+REQUESTS_PER_MINUTE = 1200
+MIN_POLL_INTERVAL = 0.2
+
+# Dedicated RNG for the simulated perp premium
+_rng = random.Random()
+
 class PriceMonitor:
     """Monitors prices from Binance spot and Drift perps"""
     
@@ -15,19 +44,53 @@ class PriceMonitor:
         self.config = config
         self.running = False
         self.price_callback = None
-        self.last_prices = {
-            'binance': {},
-            'drift': {}
-        }
+        # Pairs to poll, fixed at start(): (spot, perp) in order plus the symbol lists
+        self._pair_table: List[Tuple[str, str]] = []
+        self._spot_symbols: List[str] = []
+        self._perp_symbols: List[str] = []
+        self._callbacks: List[Callable] = []
+        # Latest price per symbol: Binance spot and Drift perp
+        self.last_spot: Dict[str, float] = {}
+        self.last_perp: Dict[str, float] = {}
         self.session = None
+        self._connector = None
+        self._rand_uniform = _rng.uniform
+        # Cleared while a tick's spot fetch is in flight; the simulated perp waits on it
+        self._spot_ready = asyncio.Event()
+        self._spot_ready.set()
+        
+        # Rate limit tracking from Binance response headers
+        self._used_weight = 0
+        self._pause_until = 0.0
+        self._request_times = deque(maxlen=REQUESTS_PER_MINUTE)
+        # Adaptive cap on concurrent Binance requests
+        self._limiter = AIMDLimiter(initial=4, maximum=32)
+        
+        # Push feed: bookTicker WebSocket keeps last_spot current between ticks
+        self.use_websocket = config.get('use_websocket', True)
+        self._ws_task: Optional[asyncio.Task] = None
+        self._ws_last_msg = 0.0
         
     async def initialize(self):
         """Initialize connections"""
         try:
             logger.info("Price monitor initializing...")
             
-            # Create aiohttp session for API calls
-            self.session = aiohttp.ClientSession()
+            # One long-lived session for all API calls: keep-alive and the DNS cache
+            # avoid a handshake and lookup per request. Pool size is configurable;
+            # aiohttp already enables TCP_NODELAY on every client socket.
+            self._connector = aiohttp.TCPConnector(
+                limit=self.config.get('http_pool_size', 32),
+                limit_per_host=self.config.get('http_pool_size_per_host', 16),
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=self._connector,
+                timeout=aiohttp.ClientTimeout(total=5, connect=2),
+                headers={"Accept": "application/json", "Accept-Encoding": "gzip"}
+            )
             
             # Test Binance connection
             await self.test_binance_connection()
@@ -50,36 +113,142 @@ class PriceMonitor:
             logger.error(f"Binance connection test failed: {e}")
             raise
             
+    def _track_rate_limit(self, response):
+        """Record a request and back off when Binance reports heavy weight usage or a 429"""
+        now = monotonic()
+        self._request_times.append(now)
+        headers = response.headers
+        used = headers.get("X-MBX-USED-WEIGHT-1M")
+        if used is not None:
+            self._used_weight = int(used)
+        if response.status in (418, 429) or self._used_weight >= WEIGHT_PAUSE_THRESHOLD:
+            pause = float(headers.get("Retry-After", "1"))
+            self._pause_until = max(self._pause_until, now + pause)
+            logger.warning(f"Binance rate limit pressure (weight {self._used_weight}), pausing {pause}s")
+            
+    def _next_poll_delay(self, tick_started: float) -> float:
+        """Seconds until the next poll: tick cadence, header-driven pause or local per-minute budget"""
+        now = monotonic()
+        wait = max(MIN_POLL_INTERVAL - (now - tick_started), self._pause_until - now)
+        if len(self._request_times) == REQUESTS_PER_MINUTE:
+            # Oldest of the last REQUESTS_PER_MINUTE requests must leave the 60s window
+            wait = max(wait, self._request_times[0] + 60 - now)
+        return max(0.0, wait)
+        
+    async def _get_json(self, url: str):
+        """GET a Binance endpoint under the concurrency limiter; returns (status, json or None)"""
+        async with self._limiter:
+            started = monotonic()
+            try:
+                async with self.session.get(url) as response:
+                    self._track_rate_limit(response)
+                    status = response.status
+                    # Raw bytes straight into orjson (when installed) instead of response.json()
+                    data = fastjson.loads(await response.read()) if status == 200 else None
+            except asyncio.TimeoutError:
+                self._limiter.record(monotonic() - started, error=True)
+                raise
+            self._limiter.record(monotonic() - started, error=status in (418, 429) or status >= 500)
+            return status, data
+            
     async def get_binance_price(self, symbol: str) -> Optional[float]:
         """Get spot price from Binance using REST API"""
         try:
-            url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}"
+            url = f"{BINANCE_TICKER_URL}?symbol={symbol}"
             
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    price = float(data['price'])
-                    
-                    self.last_prices['binance'][symbol] = {
-                        'price': price,
-                        'timestamp': datetime.utcnow().isoformat()
-                    }
-                    
-                    return price
-                else:
-                    logger.error(f"Binance API error: {response.status}")
-                    return None
+            status, data = await self._get_json(url)
+            if status == 200:
+                price = float(data['price'])
+                
+                self.last_spot[symbol] = price
+                
+                return price
+            else:
+                logger.error(f"Binance API error: {status}")
+                return None
                     
         except Exception as e:
             logger.error(f"Error fetching Binance price for {symbol}: {e}")
             return None
             
+    async def get_binance_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Get spot prices for several symbols from Binance in one request"""
+        try:
+            # symbols=["SOLUSDT","BTCUSDT"] as a URL-encoded JSON array
+            url = f"{BINANCE_TICKER_URL}?symbols={quote(json.dumps(symbols, separators=(',', ':')))}"
+            
+            status, data = await self._get_json(url)
+            if status == 200:
+                prices = {row['symbol']: float(row['price']) for row in data}
+                
+                self.last_spot.update(prices)
+                
+                return prices
+            else:
+                logger.error(f"Binance API error: {status}")
+                return {}
+                    
+        except Exception as e:
+            logger.error(f"Error fetching Binance prices for {symbols}: {e}")
+            return {}
+        finally:
+            # Release waiting perp lookups even if the fetch failed
+            self._spot_ready.set()
+            
+    @property
+    def ws_live(self) -> bool:
+        """True while the bookTicker stream is delivering fresh prices"""
+        return monotonic() - self._ws_last_msg < WS_STALE_SECONDS
+        
+    async def _ws_loop(self, symbols: List[str]):
+        """Keep last_spot updated from Binance's combined bookTicker stream"""
+        url = BINANCE_WS_URL + "/".join(f"{symbol.lower()}@bookTicker" for symbol in symbols)
+        disconnects = deque(maxlen=WS_MAX_DISCONNECTS + 1)
+        last_spot = self.last_spot
+        loads = fastjson.loads
+        
+        while self.running:
+            try:
+                async with self.session.ws_connect(url, heartbeat=20) as ws:
+                    logger.info("Binance bookTicker stream connected")
+                    async for msg in ws:
+                        if msg.type is not aiohttp.WSMsgType.TEXT:
+                            break
+                        data = loads(msg.data)['data']
+                        # Mid of best bid/ask, the closest match to the REST ticker price
+                        last_spot[data['s']] = (float(data['b']) + float(data['a'])) * 0.5
+                        self._ws_last_msg = monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Binance stream error: {e}")
+                
+            self._ws_last_msg = 0.0
+            if not self.running:
+                break
+                
+            now = monotonic()
+            disconnects.append(now)
+            if len(disconnects) > WS_MAX_DISCONNECTS and now - disconnects[0] < WS_DISCONNECT_WINDOW:
+                logger.warning("Binance stream unstable, falling back to REST polling")
+                return
+            await asyncio.sleep(1)
+            
+    async def _get_spot_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Spot prices for this tick: from the live stream, else one REST batch call"""
+        if self.ws_live:
+            self._spot_ready.set()
+            return self.last_spot
+        return await self.get_binance_prices(symbols)
+        
     async def get_drift_price(self, symbol: str) -> Optional[float]:
         """Get perp price from Drift (simulated for now)"""
         try:
             # Map Drift symbol to Binance symbol for simulation
             base_symbol = symbol.replace('PERP', 'USDT')
-            spot_price = self.last_prices['binance'].get(base_symbol, {}).get('price')
+            # The simulated premium applies to this tick's spot, so wait for it
+            await self._spot_ready.wait()
+            spot_price = self.last_spot.get(base_symbol)
             
             if not spot_price:
                 # Get fresh spot price if not cached
@@ -87,15 +256,10 @@ class PriceMonitor:
             
             if spot_price:
                 # Simulate realistic perp premium (0.05% to 0.3%)
-                import random
-                premium = 1 + (random.uniform(0.0005, 0.003))
+                premium = 1.0005 + self._rand_uniform(0.0, 0.0025)
                 perp_price = spot_price * premium
                 
-                self.last_prices['drift'][symbol] = {
-                    'price': perp_price,
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'simulated': True
-                }
+                self.last_perp[symbol] = perp_price
                 
                 return perp_price
                 
@@ -104,52 +268,75 @@ class PriceMonitor:
             
         return None
         
-    async def monitor_pair(self, spot_symbol: str, perp_symbol: str):
-        """Monitor a trading pair for arbitrage"""
+    async def _fetch_tick(self) -> Tuple[Dict[str, float], List[Optional[float]]]:
+        """Fetch this tick's spot prices and every perp price concurrently"""
+        # Spot and perp lookups overlap; a real Drift fetch runs alongside the
+        # Binance round trip instead of following it. The getters handle their own
+        # errors, so one failing symbol never affects the rest.
+        self._spot_ready.clear()
+        spot_prices, *perp_prices = await asyncio.gather(
+            self._get_spot_prices(self._spot_symbols),
+            *(self.get_drift_price(perp) for perp in self._perp_symbols)
+        )
+        return spot_prices, perp_prices
+        
+    async def monitor_all(self):
+        """Monitor all pairs: streamed spot prices when live, else one batched REST request per tick"""
+        pairs = self._pair_table
+        callbacks = self._callbacks
         while self.running:
+            tick_started = monotonic()
             try:
-                # Get spot price first
-                spot_price = await self.get_binance_price(spot_symbol)
-                
-                # Then get perp price (which uses cached spot for simulation)
-                perp_price = await self.get_drift_price(perp_symbol)
+                spot_prices, perp_prices = await self._fetch_tick()
                 
-                if spot_price and perp_price and self.price_callback:
-                    await self.price_callback(
-                        spot_symbol=spot_symbol,
-                        perp_symbol=perp_symbol,
-                        spot_price=spot_price,
-                        perp_price=perp_price
-                    )
-                    
-                # Rate limit: 2 second intervals (Binance allows 1200 requests/min)
-                await asyncio.sleep(2)
+                for (spot_symbol, perp_symbol), callback, perp_price in zip(pairs, callbacks, perp_prices):
+                    spot_price = spot_prices.get(spot_symbol)
+                    if not spot_price:
+                        continue
+                        
+                    if perp_price and callback:
+                        await callback(
+                            spot_symbol=spot_symbol,
+                            perp_symbol=perp_symbol,
+                            spot_price=spot_price,
+                            perp_price=perp_price
+                        )
+                        
+                # Poll as fast as Binance's reported weight and the local budget allow
+                await asyncio.sleep(self._next_poll_delay(tick_started))
                 
             except Exception as e:
                 logger.error(f"Error in monitor loop: {e}")
                 await asyncio.sleep(10)  # Back off on error
                 
-    async def start(self, pairs: list, callback: Callable):
-        """Start monitoring multiple pairs"""
-        self.price_callback = callback
+    async def start(self, pairs: Sequence[Pair], callback: Union[Callable, Sequence[Callable]]):
+        """Start monitoring multiple pairs
+        
+        `callback` is either one coroutine function shared by all pairs or a
+        sequence with one (e.g. specialized) callback per pair, in pair order.
+        """
+        if callable(callback):
+            self.price_callback = callback
+            self._callbacks = [callback] * len(pairs)
+        else:
+            self.price_callback = None
+            self._callbacks = list(callback)
+            if len(self._callbacks) != len(pairs):
+                raise ValueError("Need exactly one callback per pair")
         self.running = True
         
-        # Create monitoring tasks for each pair
-        tasks = []
-        for pair_config in pairs:
-            task = asyncio.create_task(
-                self.monitor_pair(
-                    pair_config['spot_symbol'],
-                    pair_config['perp_symbol']
-                )
-            )
-            tasks.append(task)
+        # Interned so per-tick dict lookups compare symbols by identity
+        self._pair_table = [(sys.intern(spot), sys.intern(perp)) for spot, perp in pairs]
+        self._spot_symbols = list(dict.fromkeys(spot for spot, _ in self._pair_table))
+        self._perp_symbols = [perp for _, perp in self._pair_table]
+        
+        if self.use_websocket:
+            self._ws_task = asyncio.create_task(self._ws_loop(self._spot_symbols))
             
         logger.info(f"Started monitoring {len(pairs)} pairs")
         
         try:
-            # Wait for all tasks
-            await asyncio.gather(*tasks)
+            await self.monitor_all()
         except asyncio.CancelledError:
             logger.info("Monitor tasks cancelled")
             
@@ -157,8 +344,18 @@ class PriceMonitor:
         """Stop monitoring"""
         self.running = False
         
+        if self._ws_task:
+            self._ws_task.cancel()
+            try:
+                await self._ws_task
+            except asyncio.CancelledError:
+                pass
+            self._ws_task = None
+        
         # Close aiohttp session
         if self.session:
             await self.session.close()
+        if self._connector:
+            await self._connector.close()
             
         logger.info("Price monitor stopped")
@@ -4,23 +4,34 @@ Arbitrage Strategy Module
 Core arbitrage detection and opportunity analysis for Drift-Binance spreads.
 """
 
-from typing import Optional, Dict, List, Tuple
+from typing import Deque, Optional, Dict, Tuple
+from collections import deque
 from datetime import datetime
-from decimal import Decimal
+from decimal import Context, Decimal, ROUND_HALF_EVEN, localcontext
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
 from core.logger import get_logger
 from integrations.base import Ticker
 
 
+# Decimal context for settlement math: market prices carry at most 8 decimal
+# digits, so 12 significant digits is ample and cheaper than the default 28
+_CTX = Context(prec=12, rounding=ROUND_HALF_EVEN)
+
+# Most recent opportunities kept in memory
+HISTORY_LIMIT = 10_000
+
+
 class ArbitrageType(str, Enum):
     """Type of arbitrage opportunity"""
     SPOT_PERP = "SPOT_PERP"  # Buy spot, sell perp
     PERP_SPOT = "PERP_SPOT"  # Buy perp, sell spot
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ArbitrageOpportunity:
     """Represents an arbitrage opportunity between exchanges"""
     id: str
@@ -64,9 +75,19 @@ class ArbitrageEngine:
         self.binance_fee = Decimal("0.001")  # 0.1%
         self.drift_fee = Decimal("0.0005")   # 0.05%
         
+        # Constants folded once instead of rebuilt per call
+        self._hundred = Decimal("100")
+        self._total_fee = self.binance_fee + self.drift_fee
+        self._total_fee_f = float(self._total_fee)
+        self._trade_size_f = float(self.trade_size)
+        
+        # Float copies for the batch scan, in percent like calculate_spread_percentage
+        self._min_spread_f = float(self.min_spread) * 100.0
+        self._fee_pct_f = self._total_fee_f * 100.0
+        
         # Opportunity tracking
         self.active_opportunities: Dict[str, ArbitrageOpportunity] = {}
-        self.opportunity_history: List[ArbitrageOpportunity] = []
+        self.opportunity_history: Deque[ArbitrageOpportunity] = deque(maxlen=HISTORY_LIMIT)
         
     async def analyze_spread(
         self,
@@ -89,7 +110,7 @@ class ArbitrageEngine:
         # - Check minimum thresholds
         # - Estimate profit
         
-        self.logger.debug(f"Analyzing spread for {spot_ticker.symbol}")
+        self.logger.debug("Analyzing spread for {}", spot_ticker.symbol)
         return None
     
     async def calculate_optimal_size(
@@ -140,7 +161,29 @@ class ArbitrageEngine:
         perp_price: Decimal
     ) -> Decimal:
         """Calculate spread percentage between two prices."""
-        return ((perp_price - spot_price) / spot_price) * Decimal("100")
+        with localcontext(_CTX):
+            return ((perp_price - spot_price) / spot_price) * self._hundred
+    
+    def scan_batch(
+        self,
+        spot_arr: np.ndarray,
+        perp_arr: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Screen many spot/perp price pairs at once in float64.
+        
+        Args:
+            spot_arr: Spot prices, one per symbol
+            perp_arr: Perp prices aligned with spot_arr
+            
+        Returns:
+            Tuple of (indices above the minimum spread, their net spread percentages)
+        """
+        spot_arr = np.asarray(spot_arr, dtype=np.float64)
+        perp_arr = np.asarray(perp_arr, dtype=np.float64)
+        net = (perp_arr - spot_arr) / spot_arr * 100.0 - self._fee_pct_f
+        hits = np.flatnonzero(net > self._min_spread_f)
+        return hits, net[hits]
     
     def calculate_profit_after_fees(
         self,
@@ -148,6 +191,7 @@ class ArbitrageEngine:
         size: Decimal
     ) -> Decimal:
         """Calculate expected profit after fees."""
-        gross_profit = spread * size
-        total_fees = size * (self.binance_fee + self.drift_fee)
-        return gross_profit - total_fees
+        with localcontext(_CTX):
+            gross_profit = spread * size
+            total_fees = size * self._total_fee
+            return gross_profit - total_fees
@@ -4,7 +4,8 @@ Order Execution Module
 Handles the execution of arbitrage trades across exchanges with safety checks.
 """
 
-from typing import Optional, Dict, Tuple, List
+from typing import Deque, Optional, Dict, Tuple
+from collections import deque
 from datetime import datetime
 from decimal import Decimal
 from dataclasses import dataclass
@@ -15,6 +16,10 @@ from integrations.base import Order, OrderSide, OrderType
 from strategy.arbitrage import ArbitrageOpportunity
 
 
+# Most recent execution results kept in memory
+HISTORY_LIMIT = 10_000
+
+
 class ExecutionStatus(str, Enum):
     """Execution status enumeration"""
     PENDING = "PENDING"
@@ -25,7 +30,7 @@ class ExecutionStatus(str, Enum):
     CANCELLED = "CANCELLED"
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of an arbitrage execution"""
     opportunity_id: str
@@ -69,7 +74,7 @@ class OrderExecutor:
         
         # Tracking
         self.active_executions: Dict[str, ExecutionResult] = {}
-        self.execution_history: List[ExecutionResult] = []
+        self.execution_history: Deque[ExecutionResult] = deque(maxlen=HISTORY_LIMIT)
         
     async def execute_arbitrage(
         self,
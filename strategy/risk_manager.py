@@ -6,6 +6,7 @@ Implements risk controls and position limits for the arbitrage strategy.
 
 from typing import Dict, Optional, Tuple, List
 from datetime import datetime, timedelta
+from time import monotonic
 from decimal import Decimal
 from dataclasses import dataclass
 from enum import Enum
@@ -21,7 +22,7 @@ class RiskLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskStatus:
     """Current risk status"""
     level: RiskLevel
@@ -55,19 +56,61 @@ class RiskManager:
         self.config = config
         self.logger = get_logger(__name__)
         
-        # Risk parameters
-        self.max_drawdown = Decimal(str(config.max_drawdown))
+        # Risk parameters (float for runtime checks; Decimal only when reported)
+        self._max_drawdown = float(config.max_drawdown)
         self.max_trades_per_day = config.max_trades_per_day
         self.cooldown_after_losses = config.cooldown_after_losses
         self.cooldown_duration = timedelta(minutes=config.cooldown_duration_min)
-        self.max_position_size = Decimal(str(config.trade_size_usdc)) * 3
+        self._max_position_size = float(config.trade_size_usdc) * 3
+        # Daily-loss ladder for get_risk_status
+        self._dd_crit = self._max_drawdown * 0.8
+        self._dd_high = self._max_drawdown * 0.5
         
         # Tracking
         self.daily_trades = 0
-        self.daily_loss = Decimal("0")
+        self._daily_loss = 0.0
         self.consecutive_losses = 0
-        self.cooldown_until: Optional[datetime] = None
-        self.open_positions: Dict[str, Decimal] = {}
+        self.cooldown_until: Optional[datetime] = None  # Wall-clock copy for reporting
+        self._cooldown_until_mono = 0.0
+        self.open_positions: Dict[str, float] = {}
+        self._exposure_total = 0.0
+        # Re-sum open_positions against the running total on every change (debug only)
+        self._check_exposure = config.log_level.upper() == "DEBUG"
+        
+    @property
+    def max_drawdown(self) -> Decimal:
+        return Decimal(repr(self._max_drawdown))
+        
+    @property
+    def max_position_size(self) -> Decimal:
+        return Decimal(repr(self._max_position_size))
+        
+    @property
+    def daily_loss(self) -> Decimal:
+        return Decimal(repr(self._daily_loss))
+        
+    def add_position(self, position_id: str, size: Decimal) -> None:
+        """Track an open position's size in the exposure total."""
+        size = float(size)
+        self._exposure_total += size - self.open_positions.get(position_id, 0.0)
+        self.open_positions[position_id] = size
+        if self._check_exposure:
+            self._rebuild_exposure()
+            
+    def close_position(self, position_id: str) -> None:
+        """Remove a closed position from the exposure total."""
+        self._exposure_total -= self.open_positions.pop(position_id, 0.0)
+        if not self.open_positions:
+            self._exposure_total = 0.0  # Drop accumulated rounding drift
+        if self._check_exposure:
+            self._rebuild_exposure()
+            
+    def _rebuild_exposure(self) -> None:
+        """Recompute the exposure total from scratch, logging any drift."""
+        total = sum(self.open_positions.values(), 0.0)
+        if abs(total - self._exposure_total) > 1e-6:
+            self.logger.warning(f"Exposure total drifted: {self._exposure_total} != {total}")
+        self._exposure_total = total
         
     async def check_trade_allowed(
         self,
@@ -83,8 +126,9 @@ class RiskManager:
             Tuple of (allowed, reason)
         """
         # Check cooldown
-        if self.cooldown_until and datetime.now() < self.cooldown_until:
-            remaining = (self.cooldown_until - datetime.now()).seconds // 60
+        now = monotonic()
+        if now < self._cooldown_until_mono:
+            remaining = int(self._cooldown_until_mono - now) // 60
             return False, f"In cooldown for {remaining} more minutes"
         
         # Check daily trade limit
@@ -92,12 +136,12 @@ class RiskManager:
             return False, f"Daily trade limit reached ({self.max_trades_per_day})"
         
         # Check drawdown limit
-        if abs(self.daily_loss) >= self.max_drawdown:
-            return False, f"Daily loss limit reached ({self.max_drawdown:.1%})"
+        if abs(self._daily_loss) >= self._max_drawdown:
+            return False, f"Daily loss limit reached ({self._max_drawdown:.1%})"
         
         # Check position size
-        total_exposure = sum(self.open_positions.values()) + size
-        if total_exposure > self.max_position_size:
+        total_exposure = self._exposure_total + float(size)
+        if total_exposure > self._max_position_size:
             return False, f"Position size limit exceeded"
         
         return True, "Trade allowed"
@@ -114,12 +158,14 @@ class RiskManager:
             profit: Trade profit/loss
             size: Trade size
         """
+        profit = float(profit)
         self.daily_trades += 1
-        self.daily_loss += profit
+        self._daily_loss += profit
         
         if profit < 0:
             self.consecutive_losses += 1
             if self.consecutive_losses >= self.cooldown_after_losses:
+                self._cooldown_until_mono = monotonic() + self.cooldown_duration.total_seconds()
                 self.cooldown_until = datetime.now() + self.cooldown_duration
                 self.logger.warning(f"Entering cooldown until {self.cooldown_until}")
         else:
@@ -133,9 +179,10 @@ class RiskManager:
             Current risk status
         """
         # Determine risk level
-        if abs(self.daily_loss) > self.max_drawdown * Decimal("0.8"):
+        abs_loss = abs(self._daily_loss)
+        if abs_loss > self._dd_crit:
             level = RiskLevel.CRITICAL
-        elif abs(self.daily_loss) > self.max_drawdown * Decimal("0.5"):
+        elif abs_loss > self._dd_high:
             level = RiskLevel.HIGH
         elif self.consecutive_losses >= 2:
             level = RiskLevel.MEDIUM
@@ -146,15 +193,15 @@ class RiskManager:
         warnings = []
         if self.daily_trades > self.max_trades_per_day * 0.8:
             warnings.append(f"Approaching daily trade limit")
-        if abs(self.daily_loss) > self.max_drawdown * Decimal("0.5"):
-            warnings.append(f"High daily loss: {self.daily_loss}")
+        if abs_loss > self._dd_high:
+            warnings.append(f"High daily loss: {self._daily_loss}")
             
         return RiskStatus(
             level=level,
             daily_loss=self.daily_loss,
-            open_exposure=sum(self.open_positions.values()),
+            open_exposure=Decimal(repr(self._exposure_total)),
             consecutive_losses=self.consecutive_losses,
-            is_trading_allowed=self.cooldown_until is None,
+            is_trading_allowed=monotonic() >= self._cooldown_until_mono,
             cooldown_until=self.cooldown_until,
             warnings=warnings
         )
@@ -163,5 +210,5 @@ class RiskManager:
         """Reset daily tracking (call at start of trading day)."""
         self.logger.info("Resetting daily risk limits")
         self.daily_trades = 0
-        self.daily_loss = Decimal("0")
+        self._daily_loss = 0.0
         self.consecutive_losses = 0
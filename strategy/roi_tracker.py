@@ -4,15 +4,25 @@ ROI Tracking Module
 Tracks performance metrics and calculates returns for the arbitrage strategy.
 """
 
-from typing import Dict, List, Optional
+from typing import Deque, Dict, Optional
+from collections import deque
 from datetime import datetime, timedelta
 from decimal import Decimal
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from core.logger import get_logger
 
 
-@dataclass
+# Trades kept for metrics (ring buffer); older ones only count towards running totals
+TRADE_BUFFER_SIZE = 100_000
+
+# Lookback per metrics period
+PERIODS = {"daily": timedelta(days=1), "weekly": timedelta(weeks=1), "monthly": timedelta(days=30)}
+
+
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Performance metrics for a time period"""
     period_start: datetime
@@ -30,7 +40,7 @@ class PerformanceMetrics:
     average_profit: Decimal = Decimal("0")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradeRecord:
     """Record of a completed trade"""
     id: str
@@ -67,16 +77,22 @@ class ROITracker:
         self.config = config
         self.logger = get_logger(__name__)
         self.initial_capital = initial_capital
-        self.current_capital = initial_capital
+        # Capital tracked as float; Decimal snapshots only for ROI/reporting
+        self._initial_capital_f = float(initial_capital)
+        self.current_capital = float(initial_capital)
         
-        # Trade history
-        self.trades: List[TradeRecord] = []
+        # Trade history: bounded audit trail plus column buffers for metric kernels
+        self.trades: Deque[TradeRecord] = deque(maxlen=TRADE_BUFFER_SIZE)
+        self._profits = np.zeros(TRADE_BUFFER_SIZE, dtype=np.float64)
+        self._fees = np.zeros(TRADE_BUFFER_SIZE, dtype=np.float64)
+        self._ts = np.zeros(TRADE_BUFFER_SIZE, dtype=np.int64)
+        self._n = 0
         self.daily_metrics: Dict[datetime, PerformanceMetrics] = {}
         
         # Running metrics
-        self.total_profit = Decimal("0")
-        self.peak_capital = initial_capital
-        self.valley_capital = initial_capital
+        self.total_profit = 0.0
+        self.peak_capital = float(initial_capital)
+        self.valley_capital = float(initial_capital)
         
     async def record_trade(self, trade: TradeRecord) -> None:
         """
@@ -85,13 +101,16 @@ class ROITracker:
         Args:
             trade: Trade record to add
         """
-        # TODO: Implement trade recording
-        # - Add to history
-        # - Update capital
-        # - Calculate metrics
+        net_profit = float(trade.net_profit)
+        i = self._n % TRADE_BUFFER_SIZE
+        self._profits[i] = net_profit
+        self._fees[i] = float(trade.fees)
+        self._ts[i] = int(trade.timestamp.timestamp())
+        self._n += 1
         
         self.trades.append(trade)
-        self.current_capital += trade.net_profit
+        self.total_profit += net_profit
+        self.current_capital += net_profit
         self.logger.info(f"Trade recorded: {trade.id}, P&L: {trade.net_profit}")
     
     async def calculate_metrics(
@@ -107,27 +126,52 @@ class ROITracker:
         Returns:
             Performance metrics
         """
-        # TODO: Implement metrics calculation
-        # - Filter trades by period
-        # - Calculate all metrics
-        # - Store results
+        period_end = datetime.now()
+        period_start = period_end - PERIODS.get(period, PERIODS["daily"])
+        
+        n = min(self._n, TRADE_BUFFER_SIZE)
+        in_period = self._ts[:n] >= int(period_start.timestamp())
+        profits = self._profits[:n][in_period]
+        fees = self._fees[:n][in_period]
+        
+        metrics = PerformanceMetrics(period_start=period_start, period_end=period_end)
+        total = profits.shape[0]
+        if not total:
+            return metrics
+            
+        net = float(profits.sum())
+        total_fees = float(fees.sum())
+        wins = int(np.count_nonzero(profits > 0))
+        std = float(profits.std())
+        
+        metrics.total_trades = total
+        metrics.winning_trades = wins
+        metrics.losing_trades = int(np.count_nonzero(profits < 0))
+        metrics.gross_profit = Decimal(repr(net + total_fees))
+        metrics.total_fees = Decimal(repr(total_fees))
+        metrics.net_profit = Decimal(repr(net))
+        metrics.roi_percentage = Decimal(repr(net / self._initial_capital_f * 100.0))
+        # Per-trade Sharpe scaled to the period's trade count
+        metrics.sharpe_ratio = float(profits.mean() / std * np.sqrt(total)) if std > 0 else 0.0
+        metrics.max_drawdown = self.get_max_drawdown()
+        metrics.win_rate = wins / total
+        metrics.average_profit = Decimal(repr(net / total))
         
-        return PerformanceMetrics(
-            period_start=datetime.now(),
-            period_end=datetime.now()
-        )
+        if period == "daily":
+            self.daily_metrics[period_end.replace(hour=0, minute=0, second=0, microsecond=0)] = metrics
+        return metrics
     
     def get_current_roi(self) -> Decimal:
         """Calculate current ROI percentage."""
-        return ((self.current_capital - self.initial_capital) / 
-                self.initial_capital * Decimal("100"))
+        roi = (self.current_capital - self._initial_capital_f) / self._initial_capital_f * 100.0
+        return Decimal(repr(roi))
     
     def get_max_drawdown(self) -> Decimal:
         """Calculate maximum drawdown percentage."""
-        if self.peak_capital == Decimal("0"):
+        if self.peak_capital == 0.0:
             return Decimal("0")
-        return ((self.peak_capital - self.valley_capital) / 
-                self.peak_capital * Decimal("100"))
+        drawdown = (self.peak_capital - self.valley_capital) / self.peak_capital * 100.0
+        return Decimal(repr(drawdown))
     
     async def generate_report(self) -> Dict:
         """
@@ -142,8 +186,8 @@ class ROITracker:
         # - Risk metrics
         
         return {
-            "current_capital": self.current_capital,
+            "current_capital": Decimal(repr(self.current_capital)),
             "total_roi": self.get_current_roi(),
-            "total_trades": len(self.trades),
+            "total_trades": self._n,
             "max_drawdown": self.get_max_drawdown()
         }
@@ -1,7 +1,7 @@
 import asyncio
 import json
 from typing import Dict
-from modules.price_monitor import PriceMonitor
+from modules.price_monitor import Pair, PriceMonitor
 from modules.arbitrage import ArbitrageDetector
 from core.logger import logger
 
@@ -13,37 +13,46 @@ class ArbBot:
         self.price_monitor = PriceMonitor(config)
         self.arb_detector = ArbitrageDetector(config)
         self.running = True
+        # Binance 0.10% + Drift 0.05% round-trip fees, in percent
+        self._fee_threshold = 0.15
         
-    async def price_callback(self, spot_symbol: str, perp_symbol: str, 
-                           spot_price: float, perp_price: float):
-        """Handle new prices and check for arbitrage"""
+    def make_price_callback(self, spot_symbol: str, perp_symbol: str):
+        """Build a price callback for one pair with its thresholds baked in"""
+        fee = self._fee_threshold
+        log_hit = logger.info
+        log_tick = logger.opt(lazy=True).debug
+        check_opportunity = self.arb_detector.check_opportunity
         
-        # Calculate spread for logging
-        spread = ((perp_price - spot_price) / spot_price) * 100
-        
-        # Log current prices (with emoji indicators)
-        emoji = "🟢" if spread > 0.15 else "🔴"
-        logger.info(
-            f"{emoji} {spot_symbol}: ${spot_price:.2f} | "
-            f"{perp_symbol}: ${perp_price:.2f} | "
-            f"Spread: {spread:.3f}% | "
-            f"Net after fees: {spread - 0.15:.3f}%"
-        )
-        
-        # Check for arbitrage opportunity
-        opportunity = self.arb_detector.check_opportunity(
-            spot_symbol, perp_symbol, spot_price, perp_price
-        )
-        
-        if opportunity:
-            # Log opportunity details
-            logger.success(f"💰 PROFIT OPPORTUNITY: ${opportunity.potential_profit_usdt:.2f} on ${opportunity.trade_size_usdt} trade")
+        async def price_callback(spot_symbol: str, perp_symbol: str,
+                                 spot_price: float, perp_price: float):
+            """Handle new prices and check for arbitrage"""
+            spread = (perp_price - spot_price) / spot_price * 100.0
+            
+            # Full price line only when the spread clears fees; otherwise a lazy
+            # debug record that is never formatted at INFO
+            if spread > fee:
+                log_hit(
+                    "🟢 {}: ${:.2f} | {}: ${:.2f} | Spread: {:.3f}% | Net after fees: {:.3f}%",
+                    spot_symbol, spot_price, perp_symbol, perp_price, spread, spread - fee
+                )
+            else:
+                log_tick("🔴 {} spread {:.3f}%", lambda: spot_symbol, lambda: spread)
+                
+            # Check for arbitrage opportunity
+            opportunity = check_opportunity(spot_symbol, perp_symbol, spot_price, perp_price)
+            
+            if opportunity:
+                # Log opportunity details
+                logger.success(f"💰 PROFIT OPPORTUNITY: ${opportunity.potential_profit_usdt:.2f} on ${opportunity.trade_size_usdt} trade")
+                
+        return price_callback
             
     async def run(self):
         """Run the bot"""
         try:
             # Initialize price monitor
             await self.price_monitor.initialize()
+            self.arb_detector.warm_up()
             
             # Log configuration
             logger.info("=" * 50)
@@ -53,20 +62,22 @@ class ArbBot:
             logger.info(f"Trade Size: ${self.config['trade_size_usdt']}")
             logger.info(f"Binance Fee: 0.10%")
             logger.info(f"Drift Fee: 0.05%")
-            logger.info(f"Total Fees: 0.15%")
-            logger.info(f"Required Spread for Profit: >{self.config['min_spread_percent'] + 0.15}%")
+            logger.info(f"Total Fees: {self._fee_threshold:.2f}%")
+            logger.info(f"Required Spread for Profit: >{self.config['min_spread_percent'] + self._fee_threshold}%")
             logger.info("=" * 50)
             
             # Define pairs to monitor
             pairs = [
-                {"spot_symbol": "SOLUSDT", "perp_symbol": "SOLPERP"},
+                Pair("SOLUSDT", "SOLPERP"),
                 # Add more pairs here if needed
-                # {"spot_symbol": "BTCUSDT", "perp_symbol": "BTCPERP"},
-                # {"spot_symbol": "ETHUSDT", "perp_symbol": "ETHPERP"},
+                # Pair("BTCUSDT", "BTCPERP"),
+                # Pair("ETHUSDT", "ETHPERP"),
             ]
             
             # Start monitoring
-            await self.price_monitor.start(pairs, self.price_callback)
+            # One specialized callback per pair, in pair order
+            callbacks = [self.make_price_callback(spot, perp) for spot, perp in pairs]
+            await self.price_monitor.start(pairs, callbacks)
             
         except KeyboardInterrupt:
             logger.info("Shutting down bot...")
@@ -0,0 +1,32 @@
+"""Tests for modules.arbitrage."""
+
+import numpy as np
+
+from modules.arbitrage import ArbitrageDetector
+
+
+def test_batch_larger_than_history_returns_distinct_opportunities():
+    detector = ArbitrageDetector({"min_spread_percent": 0.1, "opportunity_history": 2})
+    n = 6
+    symbols = [(f"S{i}USDT", f"S{i}PERP") for i in range(n)]
+    spot = np.full(n, 100.0)
+    perp = 100.5 + np.arange(n) * 0.1
+
+    # Fill the history so evictions (and recycling) start with the batch
+    detector.check_opportunity("WARMUSDT", "WARMPERP", 100.0, 100.5)
+    detector.check_opportunity("WARMUSDT", "WARMPERP", 100.0, 100.5)
+    opportunities = detector.check_opportunities_batch(spot, perp, symbols)
+
+    assert len({id(o) for o in opportunities}) == n
+    assert [o.spot_symbol for o in opportunities] == [s for s, _ in symbols]
+    assert [o.perp_price for o in opportunities] == list(perp)
+    assert len(detector.opportunities) == 2
+
+
+def test_evicted_opportunities_are_recycled_across_batches():
+    detector = ArbitrageDetector({"min_spread_percent": 0.1, "opportunity_history": 2})
+    first = [detector.check_opportunity("AUSDT", "APERP", 100.0, 100.5 + i * 0.1) for i in range(3)]
+    # The oldest left the window and was not the best; the next one reuses it
+    following = detector.check_opportunity("AUSDT", "APERP", 100.0, 100.6)
+    assert following is first[0]
+    assert following.perp_price == 100.6
@@ -0,0 +1,164 @@
+"""Tests for backtest.engine."""
+
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import (
+    EXIT_SPREAD_PCT,
+    MAX_HOLD_NS,
+    TRADE_DTYPE,
+    BacktestConfig,
+    BacktestEngine,
+    run_kernel,
+)
+from backtest.metrics import BacktestMetrics
+from core.config import BotConfig
+
+SECOND_NS = 1_000_000_000
+TRADE_SIZE = 100.0
+FEE_BPS = 15
+FEE = TRADE_SIZE * FEE_BPS / 10_000.0
+CAPITAL = 1000.0
+ENTRY_THRESHOLD = 0.45
+
+
+def simulate(spread, ts_ns=None, max_open=1, capital=CAPITAL):
+    """Run the kernel with the engine's signal rules; returns (trades, equity)."""
+    spread = np.asarray(spread, dtype=np.float64)
+    if ts_ns is None:
+        ts_ns = np.arange(spread.shape[0], dtype=np.int64) * SECOND_NS
+    trades = np.empty(spread.shape[0] + max_open, dtype=TRADE_DTYPE)
+    equity = np.empty(spread.shape[0], dtype=np.float64)
+    n = run_kernel(
+        spread, np.asarray(ts_ns, dtype=np.int64),
+        spread > ENTRY_THRESHOLD, spread <= EXIT_SPREAD_PCT,
+        TRADE_SIZE, FEE_BPS, max_open, capital, trades, equity
+    )
+    return trades[:n], equity
+
+
+def test_no_entry_signal_keeps_equity_flat():
+    trades, equity = simulate([0.2, 0.3, 0.2, 0.1])
+    assert len(trades) == 0
+    assert np.all(equity == CAPITAL)
+
+
+def test_entry_then_exit_at_target_spread():
+    trades, equity = simulate([0.2, 0.5, 0.4, 0.05, 0.2])
+    assert len(trades) == 1
+    trade = trades[0]
+    expected_pnl = (0.5 - 0.05) / 100.0 * TRADE_SIZE - FEE
+    assert trade["entry_ts"] == 1 * SECOND_NS
+    assert trade["exit_ts"] == 3 * SECOND_NS
+    assert trade["pnl"] == pytest.approx(expected_pnl, abs=1e-5)
+    assert trade["fee"] == pytest.approx(FEE)
+
+    # Entry bar carries the position net of fees; equity settles after the exit
+    assert equity[0] == CAPITAL
+    assert equity[1] == pytest.approx(CAPITAL - FEE)
+    assert equity[3] == pytest.approx(CAPITAL + expected_pnl)
+    assert equity[4] == pytest.approx(CAPITAL + expected_pnl)
+
+
+def test_stop_loss_closes_widening_spread():
+    trades, _ = simulate([0.5, 1.0, 3.0, 0.3])
+    assert len(trades) == 2
+    assert trades[0]["exit_ts"] == 2 * SECOND_NS
+    assert trades[0]["pnl"] < -2.0
+    # The stopped-out bar still clears the entry threshold and re-enters
+    assert trades[1]["entry_ts"] == 2 * SECOND_NS
+
+
+def test_max_hold_time_closes_position():
+    hold_s = MAX_HOLD_NS // SECOND_NS
+    ts = np.array([0, 30, hold_s + 1, hold_s + 2], dtype=np.int64) * SECOND_NS
+    trades, _ = simulate([0.5, 0.4, 0.4, 0.4], ts_ns=ts)
+    assert len(trades) == 1
+    assert trades[0]["exit_ts"] == ts[2]
+
+
+def test_open_positions_capped_and_closed_at_last_bar():
+    trades, _ = simulate([0.5] * 5, max_open=2)
+    # Entries fire every bar, but only two positions can be open; both are
+    # still open at the end and are closed on the last bar
+    assert len(trades) == 2
+    assert list(trades["entry_ts"]) == [0, 1 * SECOND_NS]
+    assert np.all(trades["exit_ts"] == 4 * SECOND_NS)
+
+
+def test_insufficient_capital_skips_entries():
+    trades, equity = simulate([0.5, 0.5, 0.05], capital=TRADE_SIZE / 2)
+    assert len(trades) == 0
+    assert np.all(equity == TRADE_SIZE / 2)
+
+
+def run_engine(monkeypatch, timeframe="1m"):
+    """Run BacktestEngine over a small fixed spread series; returns (engine, result)."""
+    index = pd.date_range("2024-01-01", periods=6, freq="1min")
+    data = pd.DataFrame({"spread_pct": [0.2, 0.5, 0.4, 0.05, 0.5, 0.3]}, index=index)
+
+    engine = BacktestEngine(BotConfig(spread_threshold=0.003, trade_size_usdc=TRADE_SIZE))
+    bt = BacktestConfig(
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 1, 2),
+        initial_capital=Decimal(str(CAPITAL)),
+        timeframe=timeframe,
+        data_source="csv",
+    )
+    asyncio.run(engine.initialize(bt))
+
+    async def load_spread_data(*args, **kwargs):
+        return data
+    monkeypatch.setattr(engine.data_loader, "load_spread_data", load_spread_data)
+    return engine, asyncio.run(engine.run())
+
+
+@pytest.mark.parametrize("timeframe, periods_per_year", [("1m", 525_600), ("5m", 105_120), ("1h", 8_760)])
+def test_sharpe_annualized_per_timeframe(monkeypatch, timeframe, periods_per_year):
+    engine, _ = run_engine(monkeypatch, timeframe)
+    equity = engine._equity_val
+    expected = engine.metrics_calculator.calculate_sharpe_ratio(
+        np.diff(equity) / equity[:-1], periods_per_year=periods_per_year
+    )
+    assert expected != 0.0
+    assert float(engine.metrics["sharpe_ratio"]) == pytest.approx(expected)
+
+
+def test_result_keeps_columnar_trades_and_equity(monkeypatch):
+    engine, result = run_engine(monkeypatch)
+
+    assert result.trades.dtype == TRADE_DTYPE
+    assert len(result.trades) == 2
+    assert result.equity_values.dtype == np.float64
+    assert len(result.equity_ts) == len(result.equity_values) == 6
+
+    # List forms are built on demand from the same columns
+    curve = result.equity_curve
+    assert curve[0] == (datetime(2024, 1, 1), Decimal("1000.000000"))
+    assert [float(v) for _, v in curve] == pytest.approx(list(result.equity_values))
+    records = result.trade_records()
+    assert records == engine.trade_records()
+    assert records[0]["entry_time"] == datetime(2024, 1, 1, 0, 1)
+
+
+def test_annualized_return_and_sortino():
+    metrics = BacktestMetrics()
+    # 10% over half a year of daily bars compounds to 21% a year
+    equity = np.linspace(1000.0, 1100.0, 183)
+    result = metrics.calculate_all_metrics(
+        np.empty(0, dtype=TRADE_DTYPE), equity, Decimal("1000"), periods_per_year=365
+    )
+    assert float(result["annualized_return"]) == pytest.approx(21.0, abs=0.1)
+    # No losing periods: no downside deviation
+    assert result["sortino_ratio"] == 0.0
+
+    returns = np.array([0.01, -0.02, 0.015, -0.005, 0.01])
+    sortino = metrics.calculate_sortino_ratio(returns, risk_free_rate=Decimal("0"), periods_per_year=1)
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+    assert sortino == pytest.approx(returns.mean() / downside)
+    assert sortino > metrics.calculate_sharpe_ratio(returns, risk_free_rate=Decimal("0"), periods_per_year=1)
@@ -0,0 +1,44 @@
+"""Tests for core.config."""
+
+import pytest
+from pydantic import ValidationError
+
+from core import config as config_module
+from core.config import BotConfig, TradingMode, load_config
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    """Empty environment with .env loading disabled."""
+    for key in list(config_module.os.environ):
+        monkeypatch.delenv(key)
+    monkeypatch.setattr(config_module, "load_dotenv", lambda: None)
+    load_config.cache_clear()
+    yield monkeypatch
+    load_config.cache_clear()
+
+
+def test_live_mode_without_credentials_is_rejected(clean_env):
+    clean_env.setenv("MODE", "LIVE")
+    with pytest.raises(ValidationError):
+        load_config()
+
+
+def test_live_mode_missing_one_credential_is_rejected():
+    with pytest.raises(ValidationError):
+        BotConfig.model_validate({"mode": "LIVE", "drift_private_key": "key"})
+
+
+def test_live_mode_with_credentials_loads(clean_env):
+    clean_env.setenv("MODE", "live")
+    clean_env.setenv("DRIFT_PRIVATE_KEY", "drift")
+    clean_env.setenv("BINANCE_API_KEY", "binance")
+    config = load_config()
+    assert config.mode == TradingMode.LIVE
+    assert config.drift_private_key == "drift"
+
+
+def test_simulation_mode_needs_no_credentials(clean_env):
+    config = load_config()
+    assert config.mode == TradingMode.SIMULATION
+    assert config.drift_private_key is None
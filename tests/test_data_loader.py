@@ -0,0 +1,39 @@
+"""Tests for backtest.data_loader."""
+
+import numpy as np
+import pandas as pd
+
+from backtest.data_loader import DataLoader
+
+
+def bars(**overrides) -> pd.DataFrame:
+    index = pd.date_range("2024-01-01", periods=4, freq="1min", name="ts")
+    df = pd.DataFrame({
+        "open": [100.0, 101.0, 102.0, 101.5],
+        "high": [101.0, 102.0, 103.0, 102.0],
+        "low": [99.5, 100.5, 101.5, 101.0],
+        "close": [101.0, 102.0, 101.5, 101.8],
+        "volume": [10.0, 12.0, 9.0, 11.0],
+    }, index=index)
+    for column, values in overrides.items():
+        df[column] = values
+    return df
+
+
+def test_validate_data_accepts_clean_bars():
+    assert DataLoader({}).validate_data(bars())
+
+
+def test_validate_data_rejects_missing_prices():
+    assert not DataLoader({}).validate_data(bars(close=[101.0, np.nan, 101.5, 101.8]))
+
+
+def test_validate_data_rejects_unordered_timestamps():
+    df = bars()
+    assert not DataLoader({}).validate_data(df.iloc[[0, 2, 1, 3]])
+    assert not DataLoader({}).validate_data(df.iloc[[0, 1, 1, 3]])
+
+
+def test_validate_data_rejects_insane_prices():
+    assert not DataLoader({}).validate_data(bars(open=[100.0, 0.0, 102.0, 101.5]))
+    assert not DataLoader({}).validate_data(bars(low=[99.5, 103.0, 101.5, 101.0]))
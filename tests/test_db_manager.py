@@ -0,0 +1,125 @@
+"""Tests for utils.db_manager."""
+
+import asyncio
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from utils.db_manager import DatabaseManager
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Run each test in an empty working directory (DatabaseManager uses ./data)."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "data"
+
+
+def open_db(config=None) -> DatabaseManager:
+    return DatabaseManager(config or {})
+
+
+def trade(day: int, symbol: str = "SOLUSDT", **extra) -> dict:
+    return {"timestamp": datetime(2024, 1, day, 12).isoformat(), "symbol": symbol, **extra}
+
+
+def test_save_and_load_round_trip(data_dir):
+    db = open_db()
+    saved = [
+        trade(1, profit=1.5),
+        {"timestamp": datetime(2024, 1, 2, 12), "symbol": "BTCUSDT", "profit": Decimal("2.25")},
+    ]
+    for t in saved:
+        assert asyncio.run(db.save_trade(t))
+    loaded = asyncio.run(db.load_trades())
+    db.close()
+
+    assert [t["symbol"] for t in loaded] == ["SOLUSDT", "BTCUSDT"]
+    assert loaded[0] == saved[0]
+    # Decimal and datetime are stored as strings
+    assert loaded[1]["profit"] == "2.25"
+    assert loaded[1]["timestamp"].replace(" ", "T") == "2024-01-02T12:00:00"
+
+
+def test_trades_persist_across_instances(data_dir):
+    db = open_db()
+    asyncio.run(db.save_trade(trade(1)))
+    db.close()
+
+    db = open_db()
+    assert len(asyncio.run(db.load_trades())) == 1
+    db.close()
+
+
+def test_load_trades_filters_by_date_range(data_dir):
+    db = open_db()
+    for day in (4, 1, 3, 2, 5):
+        asyncio.run(db.save_trade(trade(day, symbol=f"D{day}")))
+    # str(datetime) separator is normalized, so it sorts with the ISO timestamps
+    asyncio.run(db.save_trade({"timestamp": "2024-01-03 18:00:00", "symbol": "D3b"}))
+
+    def symbols(**kwargs):
+        return [t["symbol"] for t in asyncio.run(db.load_trades(**kwargs))]
+
+    assert symbols(start_date=datetime(2024, 1, 2), end_date=datetime(2024, 1, 3, 23)) == ["D2", "D3", "D3b"]
+    assert symbols(start_date=datetime(2024, 1, 4)) == ["D4", "D5"]
+    assert symbols(end_date=datetime(2024, 1, 1, 23)) == ["D1"]
+    assert symbols(start_date=datetime(2025, 1, 1)) == []
+    db.close()
+
+
+def test_date_range_query_uses_ts_index(data_dir):
+    db = open_db()
+    plan = db._db.execute(
+        "EXPLAIN QUERY PLAN SELECT payload FROM trades WHERE ts >= ? AND ts <= ? ORDER BY ts, id",
+        ("2024-01-01", "2024-01-02"),
+    ).fetchall()
+    db.close()
+    assert any("idx_trades_ts" in row[-1] for row in plan)
+
+
+def test_batched_trades_are_visible_to_load(data_dir):
+    db = open_db({"trade_batch_size": 100, "trade_flush_ms": 60_000})
+    asyncio.run(db.save_trade(trade(1)))
+    assert db._pending
+    assert len(asyncio.run(db.load_trades())) == 1
+    db.close()
+
+
+def test_migrates_jsonl_log_once(data_dir):
+    data_dir.mkdir()
+    jsonl = data_dir / "trades.jsonl"
+    jsonl.write_text("".join(json.dumps(trade(day)) + "\n" for day in (1, 2)))
+
+    db = open_db()
+    assert len(asyncio.run(db.load_trades())) == 2
+    db.close()
+
+    # Later runs do not import the log again
+    with open(jsonl, "a") as f:
+        f.write(json.dumps(trade(3)) + "\n")
+    db = open_db()
+    assert len(asyncio.run(db.load_trades())) == 2
+    db.close()
+
+
+def test_migrates_legacy_json_array(data_dir):
+    data_dir.mkdir()
+    (data_dir / "trades.json").write_text(json.dumps([trade(1), trade(2, symbol="BTCUSDT")]))
+
+    db = open_db()
+    loaded = asyncio.run(db.load_trades(start_date=datetime(2024, 1, 2)))
+    db.close()
+    assert [t["symbol"] for t in loaded] == ["BTCUSDT"]
+
+
+def test_export_json_writes_all_trades(data_dir):
+    db = open_db()
+    for day in (1, 2):
+        asyncio.run(db.save_trade(trade(day)))
+    path = asyncio.run(db.export_json())
+    db.close()
+    lines = path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [trade(1), trade(2)]
@@ -0,0 +1,71 @@
+"""Tests for core.main."""
+
+import asyncio
+
+import pytest
+
+from core import config as config_module
+from core.config import load_config
+from core.main import DriftBinanceArbBot
+
+
+class RecordingNotifier:
+    """Stand-in for DiscordNotifier that records what would be posted."""
+
+    def __init__(self):
+        self.opportunities = []
+        self.trades = []
+
+    async def send_opportunity_alert(self, opportunity):
+        self.opportunities.append(opportunity)
+        return True
+
+    async def send_trade_notification(self, trade, action="opened"):
+        self.trades.append((trade, action))
+        return True
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    """Simulation-mode bot with a Discord webhook, running in an empty directory."""
+    monkeypatch.chdir(tmp_path)
+    for key in list(config_module.os.environ):
+        monkeypatch.delenv(key)
+    monkeypatch.setattr(config_module, "load_dotenv", lambda: None)
+    monkeypatch.setenv("MODE", "SIMULATION")
+    monkeypatch.setenv("DISCORD_WEBHOOK_URL", "http://127.0.0.1:9/webhook")
+    monkeypatch.setattr(config_module, "_config", None)
+    load_config.cache_clear()
+
+    bot = DriftBinanceArbBot()
+    bot.discord = RecordingNotifier()
+    yield bot
+    load_config.cache_clear()
+
+
+def test_opportunity_trades_and_notifies_discord(bot):
+    async def scenario():
+        await bot.price_callback("SOLUSDT", "SOLPERP", 100.0, 101.0)
+        # Notifications run in the background off the tick path
+        await asyncio.gather(*bot._bg_tasks)
+
+    asyncio.run(scenario())
+
+    assert bot.paper_trader.open_count == 1
+    assert [o["spot_symbol"] for o in bot.discord.opportunities] == ["SOLUSDT"]
+    assert [(t["spot_symbol"], action) for t, action in bot.discord.trades] == [("SOLUSDT", "opened")]
+
+
+def test_failed_notification_does_not_break_the_tick(bot):
+    async def failing(*args, **kwargs):
+        raise RuntimeError("webhook down")
+    bot.discord.send_opportunity_alert = failing
+
+    async def scenario():
+        await bot.price_callback("SOLUSDT", "SOLPERP", 100.0, 101.0)
+        await asyncio.gather(*bot._bg_tasks)
+
+    asyncio.run(scenario())
+
+    assert bot.paper_trader.open_count == 1
+    assert len(bot.discord.trades) == 1
@@ -0,0 +1,123 @@
+"""Tests for utils.rate_limit."""
+
+import asyncio
+from time import monotonic
+
+from utils.rate_limit import AIMDLimiter, TokenBucket
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def timed_acquires(bucket: TokenBucket, count: int) -> float:
+    started = monotonic()
+    for _ in range(count):
+        await bucket.acquire()
+    return monotonic() - started
+
+
+def test_token_bucket_allows_initial_burst():
+    async def scenario():
+        return await timed_acquires(TokenBucket(rate=5, per=1.0), 5)
+    assert run(scenario()) < 0.05
+
+
+def test_token_bucket_waits_for_refill_when_empty():
+    async def scenario():
+        bucket = TokenBucket(rate=10, per=0.5)  # one token per 50ms
+        await timed_acquires(bucket, 10)
+        return await timed_acquires(bucket, 1)
+    assert run(scenario()) >= 0.04
+
+
+def test_token_bucket_block_for_holds_callers():
+    async def scenario():
+        bucket = TokenBucket(rate=100, per=1.0)
+        bucket.block_for(0.1)
+        return await timed_acquires(bucket, 1)
+    assert run(scenario()) >= 0.09
+
+
+def test_token_bucket_sync_caps_tokens_to_server_remaining():
+    async def scenario():
+        bucket = TokenBucket(rate=10, per=1.0)  # one token per 100ms
+        bucket.sync(remaining=2)
+        burst = await timed_acquires(bucket, 2)
+        return burst, await timed_acquires(bucket, 1)
+    burst, third = run(scenario())
+    assert burst < 0.05
+    assert third >= 0.08
+
+
+def test_token_bucket_sync_exhausted_blocks_until_reset():
+    async def scenario():
+        bucket = TokenBucket(rate=100, per=1.0)
+        bucket.sync(remaining=0, reset_after=0.1)
+        return await timed_acquires(bucket, 1)
+    assert run(scenario()) >= 0.09
+
+
+def test_token_bucket_resize_wakes_waiters():
+    async def scenario():
+        bucket = TokenBucket(rate=1, per=10.0)
+        await bucket.acquire()
+        waiter = asyncio.create_task(timed_acquires(bucket, 1))
+        await asyncio.sleep(0.02)
+        await bucket.resize(rate=100, per=0.1)
+        return await asyncio.wait_for(waiter, timeout=1.0)
+    assert run(scenario()) < 0.5
+
+
+def test_aimd_limiter_caps_concurrency():
+    async def scenario():
+        limiter = AIMDLimiter(initial=2)
+        active = peak = 0
+
+        async def call():
+            nonlocal active, peak
+            async with limiter:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        return peak
+    assert run(scenario()) == 2
+
+
+def test_aimd_limiter_halves_on_error_down_to_one():
+    limiter = AIMDLimiter(initial=8)
+    limiter.record(0.1, error=True)
+    assert limiter.limit == 4
+    for _ in range(5):
+        limiter.record(0.1, error=True)
+    assert limiter.limit == 1
+
+
+def test_aimd_limiter_grows_only_when_latency_is_under_target():
+    limiter = AIMDLimiter(initial=4, maximum=5, target_latency=0.25, interval=0.0)
+    limiter.record(0.5)
+    assert limiter.limit == 4
+    limiter = AIMDLimiter(initial=4, maximum=5, target_latency=0.25, interval=0.0)
+    limiter.record(0.1)
+    assert limiter.limit == 5
+    limiter.record(0.1)
+    assert limiter.limit == 5
+
+
+def test_aimd_limiter_skips_growth_for_interval_with_errors():
+    limiter = AIMDLimiter(initial=4, interval=0.0)
+    limiter.record(0.1, error=True)
+    limiter.record(0.1)
+    assert limiter.limit == 2
+    limiter.record(0.1)
+    assert limiter.limit == 3
+
+
+def test_aimd_limiter_grows_at_most_once_per_interval():
+    limiter = AIMDLimiter(initial=4, interval=60.0)
+    for _ in range(10):
+        limiter.record(0.01)
+    assert limiter.limit == 4
@@ -4,11 +4,36 @@ Alert System
 Sends notifications through various channels.
 """
 
+import asyncio
+from collections import OrderedDict
+from time import monotonic
 from typing import Dict, Optional
 from datetime import datetime
 import aiohttp
 
 from core.logger import get_logger
+from utils import fastjson
+
+
+# Alerts waiting for the background sender; the oldest is dropped when full
+ALERT_QUEUE_SIZE = 256
+
+# Alerts arriving within the batch window share one POST, kept under Discord's
+# 2000-character content limit
+BATCH_WINDOW_SECONDS = 0.25
+MAX_BATCH_CHARS = 1900
+
+# Identical alerts within alert_dedupe_ttl seconds are posted once; the most
+# recently sent messages are remembered (LRU)
+DEFAULT_DEDUPE_TTL = 60.0
+DEDUPE_CACHE_SIZE = 256
+
+_NOTHING = object()
+
+# Constant webhook payload scaffolding; only the encoded content varies per POST
+_PAYLOAD_PREFIX = b'{"username":"Arbitrage Bot","content":'
+_PAYLOAD_SUFFIX = b'}'
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class AlertManager:
@@ -26,15 +51,43 @@ class AlertManager:
         self.config = config
         self.logger = get_logger(__name__)
         self.discord_webhook = config.get("discord_webhook_url")
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=ALERT_QUEUE_SIZE)
+        self._worker: Optional[asyncio.Task] = None
+        self.dedupe_ttl = config.get("alert_dedupe_ttl", DEFAULT_DEDUPE_TTL)
+        self._recent: "OrderedDict[str, float]" = OrderedDict()
+        
+    async def start(self) -> None:
+        """Open the shared HTTP session and start the sender (call once at bot startup)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300, keepalive_timeout=75)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._drain())
+            
+    async def close(self) -> None:
+        """Send queued alerts, then close the shared HTTP session (call on shutdown)."""
+        if self._worker is not None:
+            await self._queue.put(None)
+            await self._worker
+            self._worker = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
         
     async def send_trade_alert(
         self,
         trade_info: Dict
     ) -> bool:
         """Send trade execution alert."""
-        message = f"🎯 Trade Executed\n"
-        message += f"Symbol: {trade_info.get('symbol')}\n"
-        message += f"Profit: ${trade_info.get('profit', 0):.2f}"
+        message = (
+            f"🎯 Trade Executed\n"
+            f"Symbol: {trade_info.get('symbol')}\n"
+            f"Profit: ${trade_info.get('profit', 0):.2f}"
+        )
         
         return await self.send_discord(message)
     
@@ -54,10 +107,12 @@ class AlertManager:
         metrics: Dict
     ) -> bool:
         """Send daily performance report."""
-        message = f"📊 Daily Report\n"
-        message += f"ROI: {metrics.get('roi', 0):.2f}%\n"
-        message += f"Trades: {metrics.get('trades', 0)}\n"
-        message += f"Profit: ${metrics.get('profit', 0):.2f}"
+        message = (
+            f"📊 Daily Report\n"
+            f"ROI: {metrics.get('roi', 0):.2f}%\n"
+            f"Trades: {metrics.get('trades', 0)}\n"
+            f"Profit: ${metrics.get('profit', 0):.2f}"
+        )
         
         return await self.send_discord(message)
     
@@ -65,21 +120,77 @@ class AlertManager:
         self,
         message: str
     ) -> bool:
-        """Send message to Discord."""
+        """Queue a message for Discord; returns without waiting on HTTP."""
         if not self.discord_webhook:
             return False
             
+        now = monotonic()
+        last = self._recent.get(message)
+        if last is not None and now - last < self.dedupe_ttl:
+            return True
+        self._recent[message] = now
+        self._recent.move_to_end(message)
+        if len(self._recent) > DEDUPE_CACHE_SIZE:
+            self._recent.popitem(last=False)
+            
+        if self._worker is None:
+            await self.start()
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self._queue.get_nowait()
+            self._queue.put_nowait(message)
+            self.logger.warning("Alert queue full - dropped oldest alert")
+        return True
+        
+    async def _drain(self) -> None:
+        """Background worker: post queued alerts until the close() sentinel arrives."""
+        carry = _NOTHING
+        while True:
+            message = await self._queue.get() if carry is _NOTHING else carry
+            if message is None:
+                return
+            message, carry = await self._batch(message)
+            await self._post(message)
+            
+    async def _batch(self, first: str):
+        """Join alerts queued within the batch window into one message.
+        
+        Returns the joined message and the first alert that did not fit (or the
+        close() sentinel), if any.
+        """
+        loop = asyncio.get_running_loop()
+        batch = [first]
+        length = len(first)
+        deadline = loop.time() + BATCH_WINDOW_SECONDS
+        while True:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                nxt = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if nxt is None or length + 1 + len(nxt) > MAX_BATCH_CHARS:
+                return "\n".join(batch), nxt
+            batch.append(nxt)
+            length += 1 + len(nxt)
+        return "\n".join(batch), _NOTHING
+            
+    async def _post(
+        self,
+        message: str
+    ) -> bool:
+        """POST one message to the Discord webhook."""
         try:
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "content": message,
-                    "username": "Arbitrage Bot"
-                }
-                async with session.post(
-                    self.discord_webhook,
-                    json=payload
-                ) as response:
-                    return response.status == 204
+            # fastjson encodes the string with proper escaping; the rest is constant
+            body = _PAYLOAD_PREFIX + fastjson.dumps(message) + _PAYLOAD_SUFFIX
+            async with self._session.post(
+                self.discord_webhook,
+                data=body,
+                headers=_JSON_HEADERS
+            ) as response:
+                return response.status == 204
         except Exception as e:
             self.logger.error(f"Failed to send Discord alert: {e}")
             return False
@@ -4,20 +4,41 @@ Database Manager
 Handles all database operations for trade history and metrics.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 from decimal import Decimal
-import json
+import sqlite3
 from pathlib import Path
+from time import monotonic
 
 from core.logger import get_logger
+from utils import fastjson
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+
+def _pack_trade(trade: Dict) -> bytes:
+    """Encode a trade payload (msgpack when installed, JSON otherwise)."""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(trade, default=str, use_bin_type=True)
+    return fastjson.dumps(trade, default=str)
+
+
+def _unpack_trade(payload: bytes) -> Dict:
+    """Decode a payload in either format; a msgpack map never starts with '{'."""
+    if payload[:1] == b"{":
+        return fastjson.loads(payload)
+    return msgpack.unpackb(payload, raw=False)
 
 
 class DatabaseManager:
     """
-    Simple database manager using JSON files.
-    
-    Can be upgraded to SQLite/PostgreSQL later.
+    Database manager: trades in SQLite (WAL mode), metrics in a JSON file.
     """
     
     def __init__(self, config: dict):
@@ -27,53 +48,149 @@ class DatabaseManager:
         self.data_dir = Path("data")
         self.data_dir.mkdir(exist_ok=True)
         
-        # File paths
-        self.trades_file = self.data_dir / "trades.json"
+        # File paths; the JSON Lines / JSON trade logs are only read for migration
+        self.trades_db = self.data_dir / "trades.sqlite"
+        self.trades_file = self.data_dir / "trades.jsonl"
+        self.legacy_trades_file = self.data_dir / "trades.json"
         self.metrics_file = self.data_dir / "metrics.json"
         
+        # Autocommit connection; batches are wrapped in explicit transactions
+        self._db = sqlite3.connect(self.trades_db, isolation_level=None)
+        self._db.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "CREATE TABLE IF NOT EXISTS trades("
+            "id INTEGER PRIMARY KEY, ts TEXT, symbol TEXT, payload BLOB);"
+            "CREATE INDEX IF NOT EXISTS idx_trades_ts ON trades(ts);"
+        )
+        
+        # Group commit: one transaction per trade_batch_size rows or trade_flush_ms,
+        # whichever comes first (defaults keep one commit per trade)
+        self.batch_size = max(1, config.get("trade_batch_size", 1))
+        self.flush_interval = config.get("trade_flush_ms", 0) / 1000.0
+        self._pending: List[Tuple[Optional[str], Optional[str], bytes]] = []
+        self._last_flush = monotonic()
+        self._migrate_legacy_trades()
+        
+        # Most recent metrics entry; read from disk at most once (cold start)
+        self._latest_metric: Optional[Dict] = None
+        self._latest_loaded = False
+        
+    @staticmethod
+    def _trade_row(trade: Dict) -> Tuple[Optional[str], Optional[str], bytes]:
+        """Build the (ts, symbol, payload) row for a trade.
+        
+        ts is ISO 8601 with a "T" separator (str(datetime) uses a space) so that
+        string order in the index matches time order.
+        """
+        ts = trade.get('timestamp')
+        if ts is not None:
+            ts = ts.isoformat() if isinstance(ts, datetime) else str(ts).replace(' ', 'T', 1)
+        return ts, trade.get('symbol'), _pack_trade(trade)
+        
+    def _migrate_legacy_trades(self) -> None:
+        """Import trades.jsonl (or a pre-JSONL trades.json array) into an empty database once."""
+        if self._db.execute("SELECT 1 FROM trades LIMIT 1").fetchone():
+            return
+        source = next(
+            (p for p in (self.trades_file, self.legacy_trades_file) if p.exists()), None
+        )
+        if source is None:
+            return
+        try:
+            with open(source, 'rb') as f:
+                if source == self.trades_file:
+                    trades = [fastjson.loads(line) for line in f if line.strip()]
+                else:
+                    trades = fastjson.loads(f.read())
+            self._insert(self._trade_row(trade) for trade in trades)
+            self.logger.info(f"Migrated {len(trades)} trades from {source} to {self.trades_db}")
+        except Exception as e:
+            self.logger.error(f"Failed to migrate {source}: {e}")
+            
+    def _insert(self, rows) -> None:
+        """Insert trade rows in a single transaction."""
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT INTO trades(ts, symbol, payload) VALUES (?, ?, ?)", rows
+            )
+        
     async def save_trade(self, trade: Dict) -> bool:
-        """Save trade record."""
+        """Insert one trade record (indexed, O(log N) regardless of history size)."""
         try:
-            trades = await self.load_trades()
-            trades.append(trade)
+            self._pending.append(self._trade_row(trade))
             
-            with open(self.trades_file, 'w') as f:
-                json.dump(trades, f, indent=2, default=str)
+            if (len(self._pending) >= self.batch_size
+                    or monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_pending()
                 
             return True
         except Exception as e:
             self.logger.error(f"Failed to save trade: {e}")
             return False
+            
+    def _flush_pending(self) -> None:
+        """Commit all buffered trade rows in one transaction."""
+        self._last_flush = monotonic()
+        if not self._pending:
+            return
+        self._insert(self._pending)
+        self._pending.clear()
+        
+    async def flush(self) -> None:
+        """Write out buffered trades now (call on shutdown)."""
+        self._flush_pending()
+            
+    def close(self) -> None:
+        """Flush buffered trades and close the database."""
+        self._flush_pending()
+        self._db.close()
     
     async def load_trades(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> List[Dict]:
-        """Load trade records."""
-        if not self.trades_file.exists():
-            return []
-            
+        """Load trade records (date ranges are served from the ts index)."""
         try:
-            with open(self.trades_file, 'r') as f:
-                trades = json.load(f)
-                
-            # Filter by date if provided
-            if start_date or end_date:
-                filtered = []
-                for trade in trades:
-                    trade_time = datetime.fromisoformat(trade['timestamp'])
-                    if start_date and trade_time < start_date:
-                        continue
-                    if end_date and trade_time > end_date:
-                        continue
-                    filtered.append(trade)
-                return filtered
-                
-            return trades
+            # Buffered trades must be committed before querying
+            self._flush_pending()
+            return list(self._iter_trades(start_date, end_date))
         except Exception as e:
             self.logger.error(f"Failed to load trades: {e}")
             return []
+            
+    def _iter_trades(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[Dict]:
+        """Stream trade records, decoding one row at a time."""
+        if not (start_date or end_date):
+            cursor = self._db.execute("SELECT payload FROM trades ORDER BY id")
+        else:
+            where, params = [], []
+            if start_date:
+                where.append("ts >= ?")
+                params.append(start_date.isoformat())
+            if end_date:
+                where.append("ts <= ?")
+                params.append(end_date.isoformat())
+            cursor = self._db.execute(
+                f"SELECT payload FROM trades WHERE {' AND '.join(where)} ORDER BY ts, id",
+                params,
+            )
+        for (payload,) in cursor:
+            yield _unpack_trade(payload)
+    
+    async def export_json(self, path: Optional[Path] = None) -> Path:
+        """Dump all trades to a JSON Lines file for inspection (default data/trades_export.jsonl)."""
+        self._flush_pending()
+        path = Path(path) if path else self.data_dir / "trades_export.jsonl"
+        with open(path, 'wb') as f:
+            f.writelines(fastjson.dumps(trade, default=str) + b"\n" for trade in self._iter_trades())
+        return path
     
     async def save_metrics(
         self,
@@ -85,14 +202,16 @@ class DatabaseManager:
             
             all_metrics = []
             if self.metrics_file.exists():
-                with open(self.metrics_file, 'r') as f:
-                    all_metrics = json.load(f)
+                with open(self.metrics_file, 'rb') as f:
+                    all_metrics = fastjson.loads(f.read())
                     
             all_metrics.append(metrics)
             
-            with open(self.metrics_file, 'w') as f:
-                json.dump(all_metrics, f, indent=2, default=str)
+            with open(self.metrics_file, 'wb') as f:
+                f.write(fastjson.dumps(all_metrics, default=str))
                 
+            self._latest_metric = metrics
+            self._latest_loaded = True
             return True
         except Exception as e:
             self.logger.error(f"Failed to save metrics: {e}")
@@ -100,14 +219,18 @@ class DatabaseManager:
     
     async def get_latest_metrics(self) -> Optional[Dict]:
         """Get most recent metrics."""
+        if self._latest_loaded:
+            return self._latest_metric
         if not self.metrics_file.exists():
             return None
             
         try:
-            with open(self.metrics_file, 'r') as f:
-                all_metrics = json.load(f)
+            with open(self.metrics_file, 'rb') as f:
+                all_metrics = fastjson.loads(f.read())
                 
-            return all_metrics[-1] if all_metrics else None
+            self._latest_metric = all_metrics[-1] if all_metrics else None
+            self._latest_loaded = True
+            return self._latest_metric
         except Exception as e:
             self.logger.error(f"Failed to load metrics: {e}")
             return None
@@ -0,0 +1,42 @@
+"""
+JSON Helpers
+
+orjson-backed dumps/loads (bytes in, bytes out) with a stdlib json fallback.
+Dataclasses serialize natively in both paths.
+"""
+
+import dataclasses
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj):
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj, indent: bool = False, default=None) -> bytes:
+    """Serialize to UTF-8 JSON bytes (2-space indent when requested).
+    
+    `default` converts otherwise unsupported objects (e.g. str for Decimal).
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, default=default or _default).encode()
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+__all__ = ['dumps', 'loads', 'ORJSON_AVAILABLE']
@@ -4,8 +4,19 @@ Mathematical Utilities
 Common calculations for arbitrage trading.
 """
 
+import math
 from decimal import Decimal, ROUND_DOWN
-from typing import Tuple, Optional
+from typing import Callable, Tuple, Optional
+
+import numpy as np
+
+
+# Decimal constants, parsed once
+_HUNDRED = Decimal("100")
+_TWO = Decimal("2")
+_STEP = Decimal("0.01")
+_ZERO = Decimal("0")
+_DEFAULT_MIN_PROFIT = Decimal("0.001")
 
 
 def calculate_spread_percentage(
@@ -14,15 +25,19 @@ def calculate_spread_percentage(
 ) -> Decimal:
     """Calculate percentage spread between two prices."""
     if price1 == 0:
-        return Decimal("0")
-    return ((price2 - price1) / price1) * Decimal("100")
+        return _ZERO
+    return ((price2 - price1) / price1) * _HUNDRED
 
 
 def round_size(
     size: Decimal,
-    step: Decimal = Decimal("0.01")
+    step: Decimal = _STEP
 ) -> Decimal:
     """Round size to valid step."""
+    # Power-of-ten steps (0.01, 0.1, 1, ...) are a single quantize; other steps
+    # such as 0.05 are not valid quantize exemplars
+    if step is _STEP or step.as_tuple().digits == (1,):
+        return size.quantize(step, rounding=ROUND_DOWN)
     return (size // step) * step
 
 
@@ -41,7 +56,83 @@ def calculate_profit_after_fees(
 def is_profitable_spread(
     spread_pct: Decimal,
     fee_rate: Decimal,
-    min_profit: Decimal = Decimal("0.001")
+    min_profit: Decimal = _DEFAULT_MIN_PROFIT
 ) -> bool:
     """Check if spread is profitable after fees."""
-    return spread_pct > (fee_rate * Decimal("2") + min_profit)
+    return spread_pct > (fee_rate * _TWO + min_profit)
+
+
+def make_profit_predicate(
+    fee_rate: Decimal,
+    min_profit: Decimal = _DEFAULT_MIN_PROFIT
+) -> Callable[[Decimal], bool]:
+    """Build an is_profitable_spread check with the threshold computed once.
+    
+    Create it when fees are configured and reuse it on every scan tick.
+    """
+    threshold = fee_rate * _TWO + min_profit
+    
+    def _is_profitable(spread_pct: Decimal) -> bool:
+        return spread_pct > threshold
+    return _is_profitable
+
+
+# Float variants for per-tick screening; the Decimal versions above stay the
+# reference for order sizing and settlement
+
+# Absorbs float error when size is an exact multiple of step (0.3 / 0.1 = 2.9999...)
+_STEP_EPSILON = 1e-9
+
+
+def calculate_spread_percentage_f(price1: float, price2: float) -> float:
+    """Calculate percentage spread between two prices (float)."""
+    return 0.0 if price1 == 0.0 else (price2 - price1) / price1 * 100.0
+
+
+def round_size_f(size: float, step: float = 0.01) -> float:
+    """Round size down to a valid step (float)."""
+    return round(math.floor(size / step + _STEP_EPSILON) * step, 12)
+
+
+def calculate_profit_after_fees_f(
+    entry_price: float,
+    exit_price: float,
+    size: float,
+    total_fee_rate: float
+) -> float:
+    """Calculate profit after fees (float)."""
+    return (exit_price - entry_price) * size - size * entry_price * total_fee_rate
+
+
+def is_profitable_spread_f(
+    spread_pct: float,
+    fee_rate: float,
+    min_profit: float = 0.001
+) -> bool:
+    """Check if spread is profitable after fees (float)."""
+    return spread_pct > fee_rate * 2.0 + min_profit
+
+
+# Vectorized screening over many symbols; quotes as aligned float64 arrays (SoA).
+# The live per-tick scan does not chain these: spread, threshold and profit are
+# fused in one pass by modules._arb_kernel.scan_spreads (order sizes are fixed
+# per trade, so there is no per-tick size rounding to fold in)
+
+def spread_pct_vec(price1: np.ndarray, price2: np.ndarray) -> np.ndarray:
+    """Percentage spread for aligned price arrays (0 where price1 is 0)."""
+    price1 = np.asarray(price1, dtype=np.float64)
+    price2 = np.asarray(price2, dtype=np.float64)
+    out = np.subtract(price2, price1)
+    np.divide(out, price1, out=out, where=price1 != 0.0)
+    out[price1 == 0.0] = 0.0
+    out *= 100.0
+    return out
+
+
+def profitable_mask(
+    spread_pct: np.ndarray,
+    fee_rate: float,
+    min_profit: float = 0.001
+) -> np.ndarray:
+    """Boolean mask of spreads that are profitable after fees."""
+    return spread_pct > (fee_rate * 2.0 + min_profit)
@@ -0,0 +1,121 @@
+"""
+Rate Limiting
+
+Asyncio token bucket and adaptive concurrency limit for outbound API calls.
+"""
+
+import asyncio
+from collections import deque
+from time import monotonic
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` calls per `per` seconds.
+    
+    Waiters park on an asyncio.Condition, so resize() and server-side hints
+    (block_for / sync) take effect immediately for everyone waiting.
+    """
+    
+    def __init__(self, rate: int, per: float):
+        self.capacity = float(rate)
+        self.per = per
+        self._tokens = float(rate)
+        self._updated = monotonic()
+        self._blocked_until = 0.0
+        self._cond = asyncio.Condition()
+        
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.capacity / self.per)
+        
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._cond:
+            while True:
+                now = monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = max(
+                    self._blocked_until - now,
+                    (1.0 - self._tokens) * self.per / self.capacity
+                )
+                try:
+                    await asyncio.wait_for(self._cond.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                    
+    async def resize(self, rate: int, per: float) -> None:
+        """Change the limit and wake waiters so they re-evaluate."""
+        async with self._cond:
+            self._refill(monotonic())
+            self.capacity = float(rate)
+            self.per = per
+            self._tokens = min(self._tokens, self.capacity)
+            self._cond.notify_all()
+            
+    def block_for(self, seconds: float) -> None:
+        """Empty the bucket and hold all callers for `seconds` (e.g. a 429 retry_after)."""
+        now = monotonic()
+        self._refill(now)
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        
+    def sync(self, remaining: int, reset_after: float = 0.0) -> None:
+        """Never assume more tokens than the server reports remaining."""
+        self._refill(monotonic())
+        self._tokens = min(self._tokens, float(remaining))
+        if remaining <= 0 and reset_after > 0:
+            self.block_for(reset_after)
+
+
+class AIMDLimiter:
+    """Concurrency limit tuned by additive-increase / multiplicative-decrease.
+    
+    Use as `async with limiter:` around a request and report the outcome with
+    record(). Every `interval` seconds the limit grows by one if the recent mean
+    latency is under `target_latency` with no errors; any error (429/5xx/timeout)
+    halves it at once.
+    """
+    
+    def __init__(self, initial: int = 4, maximum: int = 32, target_latency: float = 0.25,
+                 window: int = 20, interval: float = 5.0):
+        self.limit = initial
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.interval = interval
+        self._active = 0
+        self._latencies = deque(maxlen=window)
+        self._errors = 0
+        self._adjusted = monotonic()
+        self._cond = asyncio.Condition()
+        
+    async def __aenter__(self):
+        async with self._cond:
+            while self._active >= self.limit:
+                await self._cond.wait()
+            self._active += 1
+        return self
+        
+    async def __aexit__(self, *exc):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(self.limit - self._active)
+            
+    def record(self, latency: float, error: bool = False) -> None:
+        """Report one call; shrinks immediately on error, grows at most once per interval."""
+        now = monotonic()
+        if error:
+            self._errors += 1
+            self.limit = max(1, self.limit // 2)
+            self._adjusted = now
+            return
+        self._latencies.append(latency)
+        if now - self._adjusted < self.interval:
+            return
+        if not self._errors and sum(self._latencies) / len(self._latencies) <= self.target_latency:
+            self.limit = min(self.maximum, self.limit + 1)
+        self._errors = 0
+        self._adjusted = now